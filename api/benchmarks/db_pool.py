@@ -0,0 +1,80 @@
+"""
+Connection pool benchmark
+
+Compares the legacy pattern of building a new engine per session against the
+shared pooled engine from shared.database, reporting wall time and the number
+of DBAPI connections actually opened.
+
+Usage:
+    python -m api.benchmarks.db_pool [--iterations N] [--url DB_URL]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from shared.database import dispose_engines, get_engine, get_session_factory
+
+
+def run_unpooled(url: str, iterations: int):
+    """Create a fresh engine and session for every query (pre-pool behaviour)."""
+    connects = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine = create_engine(url)
+
+        @event.listens_for(engine, 'connect')
+        def _count(dbapi_conn, record):
+            nonlocal connects
+            connects += 1
+
+        session = sessionmaker(bind=engine)()
+        session.execute(text("SELECT 1"))
+        session.close()
+        engine.dispose()
+    return time.perf_counter() - start, connects
+
+
+def run_pooled(url: str, iterations: int):
+    """Check sessions out of the shared pooled engine."""
+    connects = 0
+
+    @event.listens_for(get_engine(url), 'connect')
+    def _count(dbapi_conn, record):
+        nonlocal connects
+        connects += 1
+
+    factory = get_session_factory(url)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        session = factory()
+        session.execute(text("SELECT 1"))
+        session.close()
+    elapsed = time.perf_counter() - start
+    dispose_engines()
+    return elapsed, connects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-request database engines")
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--url', type=str, default=None, help='Database URL (default: DB_URL)')
+    args = parser.parse_args()
+
+    from api.src.config import DB_URL
+    url = args.url or DB_URL
+
+    unpooled_time, unpooled_connects = run_unpooled(url, args.iterations)
+    pooled_time, pooled_connects = run_pooled(url, args.iterations)
+
+    print(f"{'mode':<10} {'iterations':>10} {'connects':>10} {'total ms':>10} {'per query ms':>14}")
+    for mode, elapsed, connects in (
+        ('unpooled', unpooled_time, unpooled_connects),
+        ('pooled', pooled_time, pooled_connects),
+    ):
+        print(f"{mode:<10} {args.iterations:>10} {connects:>10} {elapsed * 1000:>10.1f} {elapsed * 1000 / args.iterations:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
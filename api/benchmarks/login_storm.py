@@ -0,0 +1,80 @@
+"""
+Login storm benchmark
+
+Fires a burst of concurrent logins at the app while requesting a games
+endpoint back to back, and reports games latency with bcrypt running inline on
+the event loop versus on the bounded password worker pool. Database and Odds
+API access are stubbed out so only password hashing competes for the loop.
+
+Usage:
+    python -m api.benchmarks.login_storm [--logins N] [--rounds R] [--workers W]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+import bcrypt
+import httpx
+
+from api.src.login import get_current_user
+from api.src.main import app
+from api.src.models.auth import AuthenticatedUser
+from api.src.models.games import GamesResponse
+from api.src.passwords import PasswordHasher
+
+
+class InlineHasher:
+    """Pre-worker-pool behaviour: bcrypt runs directly on the event loop."""
+
+    async def verify(self, password, hashed_password):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+async def run_storm(hasher, user, logins: int):
+    async def login(client):
+        await client.post('/login', data={'username': user.username, 'password': 'password123'})
+
+    with patch('api.src.login.get_password_hasher', return_value=hasher), \
+         patch('api.src.login.get_user_by_username', return_value=user), \
+         patch('api.src.games.games_cache.get', return_value=None), \
+         patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[])), \
+         patch('api.src.games.get_games_cache_ttl', return_value=0):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench') as client:
+            start = time.perf_counter()
+            storm = asyncio.gather(*(login(client) for _ in range(logins)))
+            latencies = []
+            while not storm.done():
+                request_start = time.perf_counter()
+                await client.get('/nba/games?date=2023-08-18')
+                latencies.append(time.perf_counter() - request_start)
+            await storm
+            return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark games latency during a login storm")
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost factor of the stored hash')
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b'password123', bcrypt.gensalt(rounds=args.rounds)).decode('utf-8')
+    user = AuthenticatedUser(username='bench', first_name='Bench', last_name='User',
+                             email='bench@example.com', hashed_password=hashed)
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    print(f"{'mode':<8} {'storm s':>8} {'games reqs':>10} {'p50 ms':>8} {'max ms':>8}")
+    for mode, hasher in (
+        ('inline', InlineHasher()),
+        ('pool', PasswordHasher(workers=args.workers, max_pending=args.logins)),
+    ):
+        duration, latencies = asyncio.run(run_storm(hasher, user, args.logins))
+        p50 = statistics.median(latencies) * 1000 if latencies else float('nan')
+        worst = max(latencies) * 1000 if latencies else float('nan')
+        print(f"{mode:<8} {duration:>8.2f} {len(latencies):>10} {p50:>8.1f} {worst:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
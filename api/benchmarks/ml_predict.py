@@ -0,0 +1,131 @@
+"""
+ML prediction benchmark
+
+Compares the legacy MLModelService.predict path (one-row pandas DataFrame,
+reindex and fillna, predict_proba plus predict, importances re-sorted per
+call) against the float32 numpy path, for a random forest pipeline shaped
+like the production MLB model. Then compares scoring a batch of games with
+one predict call per game against a single predict_many call, for a range
+of batch sizes, and predict_many with the pipeline against its compiled
+arrays (api.src.compiled_model).
+
+Usage:
+    python -m api.benchmarks.ml_predict [--calls N] [--trees N] [--sizes 1 10 100 1000]
+"""
+import argparse
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from unittest.mock import patch
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from api.src.compiled_model import export_compiled_model
+from api.src.ml_config import MLB_REQUIRED_FEATURES
+from api.src.ml_model_service import MLModelService
+
+
+def make_pipeline(trees: int) -> Pipeline:
+    rng = np.random.default_rng(0)
+    X = rng.random((2000, len(MLB_REQUIRED_FEATURES)))
+    y = rng.integers(0, 2, 2000)
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('model', RandomForestClassifier(n_estimators=trees, max_depth=10, random_state=0))
+    ]).fit(X, y)
+
+
+def predict_legacy(service: MLModelService, features):
+    """Pre-numpy behaviour: DataFrame per call, two model passes, importances sorted per call."""
+    import pandas as pd
+    feature_vector = pd.DataFrame([features])[MLB_REQUIRED_FEATURES].fillna(0)
+    model = service._current.model
+    prediction_proba = model.predict_proba(feature_vector)[0]
+    prediction = model.predict(feature_vector)[0]
+    importances = model.named_steps['model'].feature_importances_
+    dict(sorted(dict(zip(MLB_REQUIRED_FEATURES, importances)).items(), key=lambda x: x[1], reverse=True)[:5])
+    return prediction_proba, prediction
+
+
+def time_calls(predict, rows) -> float:
+    """Median microseconds per call, after one warmup call."""
+    predict(rows[0])
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+
+def time_batch(predict, rows, rounds: int) -> float:
+    """Median milliseconds to score every row, after one warmup round."""
+    predict(rows)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        predict(rows)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e3
+
+
+def run(calls: int, trees: int, sizes, rounds: int):
+    # The legacy path passes a DataFrame to a pipeline fitted on arrays
+    warnings.filterwarnings('ignore', message='X has feature names')
+    rng = np.random.default_rng(1)
+    rows = [dict(zip(MLB_REQUIRED_FEATURES, rng.random(len(MLB_REQUIRED_FEATURES)).tolist())) for _ in range(calls)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / 'bench.joblib'
+        pipeline = make_pipeline(trees)
+        joblib.dump(pipeline, model_path)
+        export_compiled_model(pipeline, model_path)
+        with patch('api.src.ml_model_service.get_model_path', return_value=model_path):
+            compiled_service = MLModelService()
+            compiled_service._load_model()
+            with patch('api.src.ml_model_service.ML_COMPILED_MODEL_ENABLED', False):
+                service = MLModelService()
+                service._load_model()
+
+    vector = np.empty(len(MLB_REQUIRED_FEATURES), dtype=np.float32)
+    paths = [
+        ('legacy predict', lambda row: predict_legacy(service, row)),
+        ('predict', service.predict),
+        ('predict_array', lambda row: service.predict_array(service.feature_vector(row, out=vector))),
+    ]
+
+    print(f"{trees} trees, {calls} calls")
+    print(f"{'path':>16} {'median us':>10}")
+    for name, predict in paths:
+        print(f"{name:>16} {time_calls(predict, rows):>10.0f}")
+
+    print()
+    print(f"{'rows':>6} {'per-row ms':>11} {'predict_many ms':>16} {'speedup':>8} {'compiled ms':>12} {'speedup':>8}")
+    # Every batch size is scored with the compiled arrays here, whatever ML_COMPILED_MAX_ROWS is
+    with patch('api.src.ml_model_service.ML_COMPILED_MAX_ROWS', max(sizes)):
+        for size in sizes:
+            batch = [dict(zip(MLB_REQUIRED_FEATURES, rng.random(len(MLB_REQUIRED_FEATURES)).tolist())) for _ in range(size)]
+            per_row = time_batch(lambda rows: [service.predict(row) for row in rows], batch, rounds)
+            batched = time_batch(service.predict_many, batch, rounds)
+            compiled = time_batch(compiled_service.predict_many, batch, rounds)
+            print(f"{size:>6} {per_row:>11.1f} {batched:>16.1f} {per_row / batched:>7.1f}x"
+                  f" {compiled:>12.2f} {batched / compiled:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-call and batched ML prediction latency")
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+    run(args.calls, args.trees, args.sizes, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
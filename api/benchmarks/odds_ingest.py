@@ -0,0 +1,92 @@
+"""
+Odds ingestion benchmark
+
+Compares the legacy per-game ingestion (one session, SELECT and commit per
+game) against the batched upsert used by parse_response_and_store_games, for
+a range of slate sizes on a throwaway SQLite database.
+
+Usage:
+    python -m api.benchmarks.odds_ingest [--sizes 5 15 50] [--rounds N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.src.games import upsert_odds
+from api.src.models.games import Game
+from api.src.models.tables import Odds
+from shared.database import Base
+
+
+def make_slate(size: int):
+    return [
+        Game(id=f'game_{i}', sport='MLB', homeTeam=f'Home {i}', awayTeam=f'Away {i}',
+             time='2023-08-18 20:00', homeOdds='-150', awayOdds='+130')
+        for i in range(size)
+    ]
+
+
+async def ingest_per_game(factory, games):
+    """Pre-batching behaviour: one session, lookup and commit per game."""
+    for game in games:
+        async with factory() as session:
+            existing = (await session.execute(select(Odds).filter_by(id=game.id))).scalars().first()
+            if existing:
+                existing.home_odds = game.homeOdds
+                existing.away_odds = game.awayOdds
+                existing.expires = datetime.now() + timedelta(minutes=72)
+            else:
+                game_time = datetime.strptime(game.time, "%Y-%m-%d %H:%M")
+                session.add(Odds(id=game.id, sport=game.sport, time=game_time, home_odds=game.homeOdds,
+                                 away_odds=game.awayOdds, home_team=game.homeTeam, away_team=game.awayTeam,
+                                 expires=game_time + timedelta(minutes=72)))
+            await session.commit()
+
+
+async def ingest_batched(factory, games):
+    with patch('shared.database.connect_to_async_db', factory):
+        await upsert_odds(games)
+
+
+async def time_ingest(ingest, size: int, rounds: int) -> float:
+    """Average seconds per refresh; the first round inserts, later rounds update."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        games = make_slate(size)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await ingest(factory, games)
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return elapsed / rounds
+
+
+async def run(sizes, rounds):
+    print(f"{'games':>6} {'per-game ms':>12} {'batched ms':>11}")
+    for size in sizes:
+        per_game = await time_ingest(ingest_per_game, size, rounds)
+        batched = await time_ingest(ingest_batched, size, rounds)
+        print(f"{size:>6} {per_game * 1000:>12.1f} {batched * 1000:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-game vs batched odds ingestion")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 15, 50])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+In-process TTL Cache
+
+A small LRU cache whose entries expire after a per-entry TTL, with hit, miss
+and eviction counters. Invalidation bumps a generation counter so a caller
+that computed a value before an invalidation can avoid storing it afterwards.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, default_ttl: float = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Cache name, reported in stats
+            max_entries: Maximum number of entries before the least recently used is evicted
+            default_ttl: TTL in seconds used when set() is not given one
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a live entry, counting a hit or a miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> bool:
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds until the entry expires. Uses default_ttl if not provided.
+            generation: Generation observed before computing the value; the entry is
+                not stored if the cache has been invalidated since
+
+        Returns:
+            True if the entry was stored
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if ttl <= 0 or (generation is not None and generation != self.generation):
+                return False
+
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop entries, all of them or those whose key matches a predicate.
+
+        Args:
+            predicate: Optional function of the key selecting entries to drop
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self.generation += 1
+            if predicate is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with entry count, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
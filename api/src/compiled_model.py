@@ -0,0 +1,481 @@
+"""
+Compiled Tree-Ensemble Inference
+
+sklearn's RandomForestClassifier.predict_proba walks its trees one estimator at
+a time, with Python and joblib dispatch per tree, so scoring a handful of rows
+through a 200-tree forest costs milliseconds. This module flattens a fitted
+pipeline (imputer and scaler parameters, then every tree's node arrays) into
+contiguous numpy arrays and evaluates all trees for a batch together, one
+vectorized step per tree level.
+
+Supported pipelines are those built by train_mlb_model.py: an optional
+SimpleImputer and StandardScaler, possibly nested in a preprocessing Pipeline,
+followed by a binary RandomForestClassifier/ExtraTreesClassifier or a gbtree
+XGBClassifier. The arrays are saved as an .npz next to the joblib file.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+COMPILED_SUFFIX = ".compiled.npz"
+
+# Largest allowed difference from the pipeline's probabilities before a compiled model is rejected
+MATCH_TOLERANCE = 1e-9
+
+FOREST = "forest"
+XGBOOST = "xgboost"
+
+
+def _load_libm_function(name: str):
+    """
+    A float32 function from the C math library as a numpy function, or None if it can't be loaded.
+
+    XGBoost computes its sigmoid and base margin with expf and logf, which
+    aren't always correctly rounded, so neither numpy's float32 functions nor
+    rounded float64 results reproduce them for every input.
+    """
+    try:
+        libm = ctypes.CDLL(ctypes.util.find_library('m') or 'libm.so.6')
+        function = getattr(libm, name)
+    except (OSError, AttributeError):
+        return None
+    function.restype = ctypes.c_float
+    function.argtypes = [ctypes.c_float]
+    return np.frompyfunc(function, 1, 1)
+
+
+_expf = _load_libm_function('expf')
+_logf = _load_libm_function('logf')
+
+
+def _exp32(x: np.ndarray) -> np.ndarray:
+    """float32 exp, as computed by C's expf where available."""
+    if _expf is not None:
+        return _expf(x).astype(np.float32)
+    return np.exp(x.astype(np.float64)).astype(np.float32)
+
+
+def _log32(x: np.ndarray) -> np.ndarray:
+    """float32 log, as computed by C's logf where available."""
+    if _logf is not None:
+        return np.asarray(_logf(x)).astype(np.float32)
+    return np.log(np.asarray(x, dtype=np.float64)).astype(np.float32)
+
+
+def get_compiled_path(model_path: Path) -> Path:
+    """
+    Get the path of a model's compiled arrays, next to its joblib file.
+
+    Args:
+        model_path: Path to the joblib model file
+
+    Returns:
+        Path to the .compiled.npz file
+    """
+    return model_path.with_name(model_path.stem + COMPILED_SUFFIX)
+
+
+class CompiledEnsemble:
+    """
+    A tree-ensemble pipeline as flat numpy arrays, scored for a batch at once.
+
+    Every tree's nodes are concatenated into one set of arrays. Leaves point to
+    themselves, so all trees can be walked together for a fixed number of
+    steps (the deepest tree's depth) without tracking which have finished.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Initialize from arrays produced by compile_pipeline or read from disk.
+
+        Args:
+            arrays: Named arrays, as saved by save()
+        """
+        self.arrays = arrays
+        self.kind = str(arrays['kind'])
+        self.fill = arrays['fill']
+        self.mean = arrays['mean']
+        self.scale = arrays['scale']
+        self.roots = arrays['roots']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.missing_left = arrays['missing_left']
+        self.value = arrays['value']
+        self.max_depth = int(arrays['max_depth'])
+        self.base_margin = arrays['base_margin'].astype(np.float32)
+        self.n_features = len(self.mean)
+        self._impute = not np.isnan(self.fill).all()
+
+        # Walk with compact float32/int32 arrays: one gather per level picks the next node
+        # from (left, right) pairs at children[2 * node + go_right]
+        self._children = np.column_stack([self.left, self.right]).ravel().astype(np.int32)
+        self._feature = self.feature.astype(np.int32)
+        self._roots = self.roots.astype(np.int32)
+        self._missing_right = ~self.missing_left
+        if self.kind == XGBOOST:
+            # XGBoost compares and sums in float32
+            self._threshold = self.threshold.astype(np.float32)
+            self.value = self.value.astype(np.float32)
+        else:
+            # sklearn compares float32 features with float64 thresholds. Rounding each
+            # threshold down to a float32 gives the same x <= threshold for every float32 x
+            threshold = self.threshold.astype(np.float32)
+            self._threshold = np.where(threshold > self.threshold, np.nextafter(threshold, np.float32(-np.inf)), threshold)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def save(self, path: Path):
+        """
+        Write the arrays to an uncompressed .npz file.
+
+        Args:
+            path: Destination, usually get_compiled_path(model_path)
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, **self.arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> 'CompiledEnsemble':
+        """
+        Read arrays written by save(). No pickled objects are loaded.
+
+        Args:
+            path: Path to the .npz file
+
+        Returns:
+            CompiledEnsemble
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def _preprocess(self, X: np.ndarray) -> np.ndarray:
+        """Impute and scale like the pipeline, then cast to float32 as the trees do."""
+        # The pipeline's transformers keep float32 input in float32
+        dtype = np.float32 if np.asarray(X).dtype == np.float32 else np.float64
+        X = np.array(X, dtype=dtype, ndmin=2)
+        if self._impute:
+            missing = np.isnan(X)
+            if missing.any():
+                X[missing] = np.broadcast_to(self.fill, X.shape)[missing]
+        # Same operations, order and dtypes as StandardScaler.transform, so results are bit-identical
+        X -= self.mean.astype(dtype)
+        X /= self.scale.astype(dtype)
+        return X.astype(np.float32)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        Walk every tree for every row.
+
+        Args:
+            X: Preprocessed float32 rows
+
+        Returns:
+            (n_trees, n_rows) array of leaf node indices
+        """
+        node = np.repeat(self._roots[:, np.newaxis], len(X), axis=1)
+        row_offsets = np.arange(len(X), dtype=np.int32) * np.int32(self.n_features)
+        X = X.ravel()
+        has_missing = np.isnan(X).any()
+        # sklearn goes left when x <= threshold, XGBoost when x < threshold
+        go_right = np.greater_equal if self.kind == XGBOOST else np.greater
+        for _ in range(self.max_depth):
+            x = X.take(row_offsets + self._feature.take(node))
+            right = go_right(x, self._threshold.take(node))
+            if has_missing:
+                right = np.where(np.isnan(x), self._missing_right.take(node), right)
+            node = self._children.take(2 * node + right)
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities, matching the pipeline's predict_proba.
+
+        Args:
+            X: (n_rows, n_features) or (n_features,) raw feature values
+
+        Returns:
+            (n_rows, 2) array of [class 0, class 1] probabilities
+        """
+        X = self._preprocess(X)
+        leaf_values = self.value[self._leaves(X)]
+
+        if self.kind == XGBOOST:
+            # XGBoost starts from the base margin and adds each tree in order, in float32
+            margins = np.concatenate([np.broadcast_to(self.base_margin, (1, len(X))), leaf_values])
+            margin = np.add.accumulate(margins, axis=0, dtype=np.float32)[-1]
+            # Sigmoid as XGBoost computes it
+            exp = _exp32(np.minimum(-margin, np.float32(88.7)))
+            home = np.float32(1) / (exp + np.float32(1))
+            return np.column_stack([np.float32(1) - home, home]).astype(np.float64)
+
+        home = leaf_values.mean(axis=0)
+        return np.column_stack([1 - home, home])
+
+
+def _flatten_steps(pipeline: Pipeline) -> List:
+    """List a pipeline's steps with nested pipelines expanded, in order."""
+    steps = []
+    for _, step in pipeline.steps:
+        if isinstance(step, Pipeline):
+            steps.extend(_flatten_steps(step))
+        elif step is not None and step != 'passthrough':
+            steps.append(step)
+    return steps
+
+
+def _compile_preprocessing(steps: List, n_features: int) -> Dict[str, np.ndarray]:
+    """Imputer fill values and scaler parameters, as identity values where a step is absent."""
+    fill = np.full(n_features, np.nan)
+    mean = np.zeros(n_features)
+    scale = np.ones(n_features)
+    seen_scaler = False
+
+    for step in steps:
+        if isinstance(step, SimpleImputer):
+            if seen_scaler or not np.isnan(fill).all():
+                raise ValueError("Only one SimpleImputer, before the scaler, is supported")
+            if not (isinstance(step.missing_values, float) and np.isnan(step.missing_values)):
+                raise ValueError("SimpleImputer must impute NaN")
+            if step.add_indicator or np.isnan(step.statistics_.astype(np.float64)).any():
+                raise ValueError("SimpleImputer must keep every feature and add no indicators")
+            fill = step.statistics_.astype(np.float64)
+        elif isinstance(step, StandardScaler):
+            if seen_scaler:
+                raise ValueError("Only one StandardScaler is supported")
+            seen_scaler = True
+            if step.mean_ is not None:
+                mean = step.mean_.astype(np.float64)
+            if step.scale_ is not None:
+                scale = step.scale_.astype(np.float64)
+        else:
+            raise ValueError(f"Unsupported pipeline step: {type(step).__name__}")
+
+    return {'fill': fill, 'mean': mean, 'scale': scale}
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Depth in edges of a tree given local child arrays, with -1 for leaves."""
+    depth = 0
+    level = [0]
+    while True:
+        children = [c for n in level for c in (left[n], right[n]) if c >= 0]
+        if not children:
+            return depth
+        depth += 1
+        level = children
+
+
+def _join_trees(trees: List[Tuple]) -> Dict[str, np.ndarray]:
+    """
+    Concatenate per-tree node arrays, renumbering children globally.
+
+    Args:
+        trees: (feature, threshold, left, right, missing_left, value) per tree,
+            with local child indices and -1 children at leaves
+
+    Returns:
+        Flat node arrays, tree roots and the deepest tree's depth
+    """
+    features, thresholds, lefts, rights, missing_lefts, values, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for feature, threshold, left, right, missing_left, value in trees:
+        n_nodes = len(left)
+        own = np.arange(n_nodes) + offset
+        leaf = left < 0
+        max_depth = max(max_depth, _tree_depth(left, right))
+        roots.append(offset)
+        features.append(np.where(leaf, 0, feature))
+        thresholds.append(threshold)
+        lefts.append(np.where(leaf, own, left + offset))
+        rights.append(np.where(leaf, own, right + offset))
+        missing_lefts.append(missing_left)
+        values.append(value)
+        offset += n_nodes
+
+    return {
+        'roots': np.array(roots, dtype=np.int64),
+        'feature': np.concatenate(features).astype(np.int64),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.int64),
+        'right': np.concatenate(rights).astype(np.int64),
+        'missing_left': np.concatenate(missing_lefts).astype(bool),
+        'value': np.concatenate(values).astype(np.float64),
+        'max_depth': np.array(max_depth),
+    }
+
+
+def _compile_forest(model) -> Dict[str, np.ndarray]:
+    """Node arrays of a binary sklearn forest, with each leaf's class 1 probability."""
+    if model.n_outputs_ != 1 or list(model.classes_) != [0, 1]:
+        raise ValueError("Only binary forests with classes [0, 1] are supported")
+
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        counts = tree.value[:, 0, :]
+        # DecisionTreeClassifier.predict_proba normalizes leaf values, leaving all-zero rows as they are
+        totals = counts.sum(axis=1)
+        totals[totals == 0.0] = 1.0
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+        trees.append((
+            tree.feature, tree.threshold, tree.children_left, tree.children_right,
+            missing_left, counts[:, 1] / totals
+        ))
+
+    arrays = _join_trees(trees)
+    arrays['kind'] = np.array(FOREST)
+    arrays['base_margin'] = np.array(0.0)
+    return arrays
+
+
+def _parse_float(value) -> float:
+    """Parse an XGBoost config number, which newer versions write as a one-element list."""
+    return float(str(value).strip('[]'))
+
+
+def _best_iteration(model) -> Optional[int]:
+    try:
+        return model.best_iteration
+    except AttributeError:
+        return None
+
+
+def _compile_xgboost(model) -> Dict[str, np.ndarray]:
+    """Node arrays of a binary:logistic gbtree XGBClassifier, from its JSON model dump."""
+    booster = model.get_booster()
+    config = json.loads(booster.save_config())
+    learner = config['learner']
+    if learner['objective']['name'] != 'binary:logistic':
+        raise ValueError(f"Unsupported XGBoost objective: {learner['objective']['name']}")
+
+    dump = json.loads(booster.save_raw(raw_format='json'))
+    gradient_booster = dump['learner']['gradient_booster']
+    if gradient_booster['name'] != 'gbtree':
+        raise ValueError(f"Unsupported XGBoost booster: {gradient_booster['name']}")
+
+    trees = gradient_booster['model']['trees']
+    # Prediction stops at the best iteration when the model was fitted with early stopping
+    best_iteration = _best_iteration(model)
+    if best_iteration is not None:
+        per_round = int(gradient_booster['model']['gbtree_model_param'].get('num_parallel_tree', 1))
+        trees = trees[:(best_iteration + 1) * per_round]
+
+    compiled = []
+    for tree in trees:
+        if tree.get('categories_nodes'):
+            raise ValueError("Categorical XGBoost splits are not supported")
+        left = np.array(tree['left_children'])
+        conditions = np.array(tree['split_conditions'], dtype=np.float32)
+        # XGBoost stores each leaf's value in split_conditions
+        compiled.append((
+            np.array(tree['split_indices']), conditions, left, np.array(tree['right_children']),
+            np.array(tree['default_left'], dtype=bool), np.where(left < 0, conditions, 0)
+        ))
+
+    # base_score is a probability; the margin is its logit, computed in float32 as XGBoost does
+    base_score = np.float32(_parse_float(learner['learner_model_param']['base_score']))
+    base_margin = -_log32(np.float32(1) / base_score - np.float32(1))
+
+    arrays = _join_trees(compiled)
+    arrays['kind'] = np.array(XGBOOST)
+    arrays['base_margin'] = np.array(base_margin, dtype=np.float32)
+    return arrays
+
+
+def compile_pipeline(pipeline: Pipeline) -> CompiledEnsemble:
+    """
+    Flatten a fitted pipeline into a CompiledEnsemble.
+
+    Args:
+        pipeline: Fitted pipeline ending in a 'model' tree ensemble
+
+    Returns:
+        CompiledEnsemble
+
+    Raises:
+        ValueError: If a step or the model type is not supported
+    """
+    *preprocessing, model = _flatten_steps(pipeline)
+    model_type = type(model).__name__
+
+    if model_type in ('RandomForestClassifier', 'ExtraTreesClassifier'):
+        arrays = _compile_forest(model)
+    elif model_type == 'XGBClassifier':
+        arrays = _compile_xgboost(model)
+    else:
+        raise ValueError(f"Unsupported model type: {model_type}")
+
+    arrays.update(_compile_preprocessing(preprocessing, model.n_features_in_))
+    return CompiledEnsemble(arrays)
+
+
+def matches_pipeline(
+    compiled: CompiledEnsemble,
+    pipeline: Pipeline,
+    rows: int = 256,
+    tolerance: float = MATCH_TOLERANCE
+) -> bool:
+    """
+    Check a compiled model against its pipeline on random rows.
+
+    Rows are drawn around the scaler's mean and spread, so they reach both
+    sides of most splits, and compared as float64 and as float32 input.
+
+    Args:
+        compiled: Compiled model to check
+        pipeline: Pipeline it was compiled from
+        rows: Number of random rows to compare
+        tolerance: Largest allowed probability difference
+
+    Returns:
+        True if every probability is within tolerance
+    """
+    rng = np.random.default_rng(0)
+    X = compiled.mean + compiled.scale * rng.standard_normal((rows, compiled.n_features))
+    difference = max(
+        float(np.abs(compiled.predict_proba(X) - np.asarray(pipeline.predict_proba(X), dtype=np.float64)).max())
+        for X in (X, X.astype(np.float32))
+    )
+    if difference > tolerance:
+        logger.warning(f"Compiled model differs from its pipeline by {difference:.3g}")
+        return False
+    return True
+
+
+def export_compiled_model(pipeline: Pipeline, model_path: Path) -> Path:
+    """
+    Compile a pipeline, check it and save it next to its joblib file.
+
+    Args:
+        pipeline: Fitted pipeline saved at model_path
+        model_path: Path to the joblib model file
+
+    Returns:
+        Path to the saved .compiled.npz file
+
+    Raises:
+        ValueError: If the pipeline can't be compiled or the compiled model doesn't match it
+    """
+    compiled = compile_pipeline(pipeline)
+    if not matches_pipeline(compiled, pipeline):
+        raise ValueError("Compiled model does not match the pipeline")
+
+    compiled_path = get_compiled_path(model_path)
+    compiled.save(compiled_path)
+    return compiled_path
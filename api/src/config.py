@@ -5,9 +5,86 @@ load_dotenv()
 
 ODDS_API_URL = os.getenv('ODDS_API_URL')
 DB_URL = os.getenv('DB_URL')
+# Optional async driver URL; derived from DB_URL when unset
+ASYNC_DB_URL = os.getenv('ASYNC_DB_URL')
 SECRET_KEY = os.getenv('SECRET_KEY')
 ALGORITHM = os.getenv('ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
 
+# Connection pool settings for the shared database engine
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+# Odds API HTTP client settings
+ODDS_API_TIMEOUT = float(os.getenv('ODDS_API_TIMEOUT', 10))
+ODDS_API_MAX_RETRIES = int(os.getenv('ODDS_API_MAX_RETRIES', 3))
+ODDS_API_BACKOFF = float(os.getenv('ODDS_API_BACKOFF', 0.5))
+ODDS_API_MAX_BACKOFF = float(os.getenv('ODDS_API_MAX_BACKOFF', 30))
+ODDS_API_MAX_CONNECTIONS = int(os.getenv('ODDS_API_MAX_CONNECTIONS', 10))
+
+# Background odds refresher (seconds unless noted)
+ODDS_REFRESH_ENABLED = os.getenv('ODDS_REFRESH_ENABLED', 'false').lower() == 'true'
+ODDS_REFRESH_LEAD = int(os.getenv('ODDS_REFRESH_LEAD', 300))
+ODDS_REFRESH_MIN_INTERVAL = int(os.getenv('ODDS_REFRESH_MIN_INTERVAL', 300))
+ODDS_REFRESH_MAX_INTERVAL = int(os.getenv('ODDS_REFRESH_MAX_INTERVAL', 3600))
+ODDS_REFRESH_JITTER = int(os.getenv('ODDS_REFRESH_JITTER', 60))
+ODDS_REFRESH_MAX_CALLS_PER_HOUR = int(os.getenv('ODDS_REFRESH_MAX_CALLS_PER_HOUR', 20))
+ODDS_API_MIN_REMAINING = int(os.getenv('ODDS_API_MIN_REMAINING', 50))
+
+# Bookmakers and markets kept from Odds API responses; homeOdds/awayOdds come from the primary book when it has a line
+ODDS_BOOKMAKERS = [b.strip() for b in os.getenv('ODDS_BOOKMAKERS', 'fanduel').split(',') if b.strip()]
+ODDS_MARKETS = [m.strip() for m in os.getenv('ODDS_MARKETS', 'h2h,spreads,totals').split(',') if m.strip()]
+ODDS_PRIMARY_BOOKMAKER = os.getenv('ODDS_PRIMARY_BOOKMAKER', 'fanduel')
+
+# Games response cache
+GAMES_CACHE_TTL = int(os.getenv('GAMES_CACHE_TTL', 300))
+GAMES_CACHE_MAX_ENTRIES = int(os.getenv('GAMES_CACHE_MAX_ENTRIES', 256))
+
+# Authenticated user cache
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', 1024))
+
+# bcrypt worker pool: concurrent hashes, pending operations before HTTP 503, and Retry-After seconds
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 32))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 1))
+
+# MLB game analytics cache; entries are also keyed by data and model version
+MLB_ANALYTICS_CACHE_TTL = int(os.getenv('MLB_ANALYTICS_CACHE_TTL', 900))
+MLB_ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv('MLB_ANALYTICS_CACHE_MAX_ENTRIES', 512))
+
+# In-memory MLB league index: loaded at startup and reloaded when the MLB data version changes
+LEAGUE_INDEX_ENABLED = os.getenv('LEAGUE_INDEX_ENABLED', 'true').lower() == 'true'
+LEAGUE_INDEX_POLL_INTERVAL = int(os.getenv('LEAGUE_INDEX_POLL_INTERVAL', 60))
+
+# Load the MLB model and run a synthetic prediction at startup; /ready reports 503 until it finishes
+ML_WARMUP_ENABLED = os.getenv('ML_WARMUP_ENABLED', 'false').lower() == 'true'
+
+# Watch the MLB model files and hot-reload the model when they change (interval in seconds)
+ML_MODEL_WATCH_ENABLED = os.getenv('ML_MODEL_WATCH_ENABLED', 'true').lower() == 'true'
+ML_MODEL_WATCH_INTERVAL = int(os.getenv('ML_MODEL_WATCH_INTERVAL', 30))
+
+# Score tree-ensemble models with their compiled numpy arrays (*.compiled.npz next to the joblib file)
+# for batches up to this many rows; larger batches use the model itself
+ML_COMPILED_MODEL_ENABLED = os.getenv('ML_COMPILED_MODEL_ENABLED', 'true').lower() == 'true'
+ML_COMPILED_MAX_ROWS = int(os.getenv('ML_COMPILED_MAX_ROWS', 256))
+
+# Other MLB model versions selectable per request: how many stay loaded, their total size on disk in MB,
+# and the fewest seconds between rescans of the models directory for a requested version it doesn't know
+ML_MODEL_REGISTRY_MAX_RESIDENT = int(os.getenv('ML_MODEL_REGISTRY_MAX_RESIDENT', 3))
+ML_MODEL_REGISTRY_MEMORY_MB = int(os.getenv('ML_MODEL_REGISTRY_MEMORY_MB', 512))
+ML_MODEL_REGISTRY_REFRESH_INTERVAL = int(os.getenv('ML_MODEL_REGISTRY_REFRESH_INTERVAL', 60))
+
+# Shadow scoring: model versions that also score every MLB analytics request off the request path,
+# recorded to ml_shadow_predictions. Rows are scored in batches every flush interval (seconds);
+# beyond max pending, new rows are dropped
+ML_SHADOW_MODELS = [m.strip() for m in os.getenv('ML_SHADOW_MODELS', '').split(',') if m.strip()]
+ML_SHADOW_BATCH_SIZE = int(os.getenv('ML_SHADOW_BATCH_SIZE', 256))
+ML_SHADOW_FLUSH_INTERVAL = int(os.getenv('ML_SHADOW_FLUSH_INTERVAL', 5))
+ML_SHADOW_MAX_PENDING = int(os.getenv('ML_SHADOW_MAX_PENDING', 10000))
+
 if not all([ODDS_API_URL, DB_URL, SECRET_KEY]):
     raise ValueError("Missing required environment variables. Please check your .env file or environment settings.")
\ No newline at end of file
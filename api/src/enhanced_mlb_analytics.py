@@ -6,19 +6,51 @@ from the machine_learning module, incorporating rolling statistics, momentum,
 and advanced team metrics.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
-import pandas as pd
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple, Union
+from sqlalchemy import Integer, and_, case, cast, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session, aliased
 
-from api.src.models.mlb_analytics import MlbAnalyticsResponse, TeamAnalytics
-from shared.database import connect_to_db
+from api.src.cache import TTLCache
+from api.src.config import MLB_ANALYTICS_CACHE_MAX_ENTRIES, MLB_ANALYTICS_CACHE_TTL
+from api.src.models.mlb_analytics import MlbAnalyticsResponse, MlbSlateAnalyticsResponse, TeamAnalytics
+from shared.database import async_session_scope
 from api.src.models.tables import Odds
+from api.src.games import games_on_date_query
+from api.src.league_index import LeagueData, TeamForm, get_league_index, get_mlb_data_version
 from machine_learning.data.models.mlb_models import (
-    MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule
+    MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule, MLBTeamState, MLBHeadToHead
 )
-from api.src.ml_model_service import get_mlb_model_service
-from api.src.ml_config import MLB_REQUIRED_FEATURES
+from machine_learning.data.processing.mlb_feature_store import ROLLING_WINDOW
+from api.src.ml_model_service import MLModelService, get_mlb_model_service
+from api.src.ml_model_registry import get_mlb_model_registry
+from api.src.ml_shadow import ShadowGame, get_shadow_scorer
+
+logger = logging.getLogger(__name__)
+
+# Game analytics keyed by (game_id, MLB data version, requested model, model version)
+analytics_cache = TTLCache(
+    'mlb_analytics', max_entries=MLB_ANALYTICS_CACHE_MAX_ENTRIES, default_ttl=MLB_ANALYTICS_CACHE_TTL
+)
+
+
+@dataclass
+class TeamSnapshot:
+    """
+    A team's record, recent form and latest stat rows as of a game.
+
+    Recent form (state) comes from the in-memory league index, the feature
+    store, or an aggregate over the schedule, in that order of preference; it
+    is None if the team has not played yet. Index lookups return TeamRecord,
+    TeamForm and stat line tuples with the same fields as the ORM rows.
+    """
+    team: MLBTeam
+    offensive: Optional[MLBOffensiveStats] = None
+    defensive: Optional[MLBDefensiveStats] = None
+    state: Optional[Union[MLBTeamState, TeamForm]] = None
 
 
 class EnhancedMLBAnalytics:
@@ -27,14 +59,24 @@ class EnhancedMLBAnalytics:
     for more sophisticated game predictions.
     """
     
-    def __init__(self, rolling_window: int = 10):
+    def __init__(self, rolling_window: int = 10, model_version: Optional[str] = None):
         """
         Initialize the enhanced analytics service.
         
         Args:
-            rolling_window: Number of games to include in rolling calculations
+            rolling_window: Number of games to include in rolling calculations.
+                The precomputed feature store is only used when this matches
+                the window it was built with.
+            model_version: Version of the ML model to predict with, from the
+                model registry; the production model if None
         """
         self.rolling_window = rolling_window
+        self.use_feature_store = rolling_window == ROLLING_WINDOW
+        self.model_version = model_version
+
+    def _ml_service(self) -> MLModelService:
+        """The model service for the requested model version."""
+        return get_ml_service(self.model_version)
     
     async def get_enhanced_game_analytics(self, game_id: str) -> MlbAnalyticsResponse:
         """
@@ -46,217 +88,680 @@ class EnhancedMLBAnalytics:
         Returns:
             Enhanced analytics response with detailed insights
         """
-        session = connect_to_db()
+        async with async_session_scope() as session:
+            # The queries use the ORM query API, so run them on the async
+            # connection without blocking the event loop
+            loaded = await session.run_sync(self._load_game, game_id)
+        # Analytics and model scoring are CPU-bound, so they run in a worker thread
+        return await asyncio.to_thread(self._analyze_game, *loaded)
+
+    def _load_game(self, session: Session, game_id: str) -> Tuple:
+        """
+        Run the queries needed to analyze a game using a synchronous session.
+
+        Team data comes from the in-memory league index when it is loaded, in
+        which case only the game itself is queried.
+
+        Args:
+            session: Database session
+            game_id: ID of the game to analyze
+
+        Returns:
+            (game, league, home_team, away_team, database data) where league is
+            the league index data or None, and database data is the teams'
+            snapshots and head-to-head records, or None if they come from the
+            index or a team is missing
+
+        Raises:
+            ValueError: If the game does not exist
+        """
+        game = session.query(Odds).filter_by(id=game_id).first()
+        if not game:
+            raise ValueError(f"Game with id {game_id} not found")
+
+        league = get_league_index().data
+        if league is not None:
+            return game, league, league.team(game.home_team), league.team(game.away_team), None
+
+        home_team = session.query(MLBTeam).filter_by(name=game.home_team).first()
+        away_team = session.query(MLBTeam).filter_by(name=game.away_team).first()
+        if not home_team or not away_team:
+            return game, None, home_team, away_team, None
+
+        pair = (home_team.id, away_team.id)
+        return game, None, home_team, away_team, self._load_team_snapshots(
+            session, [home_team, away_team], {pair}, game.time.date()
+        )
+
+    def _analyze_game(self, game: Odds, league: Optional[LeagueData], home_team, away_team, db_data) -> MlbAnalyticsResponse:
+        """
+        Build enhanced analytics for a game from the data loaded by _load_game.
+
+        Args:
+            game: Odds row of the game
+            league: Loaded league index data, or None if team data came from the database
+            home_team: Home team record, or None if it is missing
+            away_team: Away team record, or None if it is missing
+            db_data: Team snapshots and head-to-head records loaded from the database, or None
+
+        Returns:
+            Enhanced analytics response with detailed insights
+        """
+        game_id = game.id
+        home_team_name = game.home_team
+        away_team_name = game.away_team
+
+        if not home_team or not away_team:
+            # Fallback to basic analysis if team data is missing
+            return self._create_basic_response(game_id, home_team_name, away_team_name, home_team, away_team)
         
-        try:
-            # Get the game odds record
-            game = session.query(Odds).filter_by(id=game_id).first()
-            if not game:
-                raise ValueError(f"Game with id {game_id} not found")
-            
-            # Get team names
-            home_team_name = game.home_team
-            away_team_name = game.away_team
-            
-            # Get team records
-            home_team = session.query(MLBTeam).filter_by(name=home_team_name).first()
-            away_team = session.query(MLBTeam).filter_by(name=away_team_name).first()
-            
+        # Load each team's data once; analytics and ML features both read from it
+        if league is not None:
+            home = self._team_snapshot_from_index(league, home_team, game.time)
+            away = self._team_snapshot_from_index(league, away_team, game.time)
+            h2h_stats = league.head_to_head(home_team.id, away_team.id, game.time)
+        else:
+            snapshots, h2h = db_data
+            home, away = snapshots[home_team.id], snapshots[away_team.id]
+            h2h_stats = h2h[(home_team.id, away_team.id)]
+
+        # Calculate enhanced analytics
+        home_analytics = self._team_analytics_from_snapshot(home, game.time)
+        away_analytics = self._team_analytics_from_snapshot(away, game.time)
+
+        # Try ML prediction first, fallback to rule-based
+        shadow_game = ShadowGame(game_id, game.time, home_team.id, away_team.id)
+        ml_prediction = self._try_ml_prediction(
+            home, away, home_analytics, away_analytics, h2h_stats, game.time, shadow_game
+        )
+
+        return self._build_response(game_id, home_team_name, away_team_name, home_analytics, away_analytics, ml_prediction)
+
+    async def get_slate_analytics(self, date: datetime) -> MlbSlateAnalyticsResponse:
+        """
+        Get enhanced analytics for every MLB game on a date.
+
+        Args:
+            date: Date of the slate
+
+        Returns:
+            Analytics for each game on the date, ordered by start time
+        """
+        async with async_session_scope() as session:
+            loaded = await session.run_sync(self._load_slate, date)
+        return await asyncio.to_thread(self._analyze_slate, date, *loaded)
+
+    def _load_slate(self, session: Session, date: datetime) -> Tuple:
+        """
+        Run the queries needed to analyze a slate using a synchronous session.
+
+        The number of queries does not depend on the number of games: the
+        slate and its teams are each loaded with one query and team data with
+        _load_team_snapshots. When the league index is loaded only the slate
+        itself is queried.
+
+        Args:
+            session: Database session
+            date: Date of the slate
+
+        Returns:
+            (games, league, teams, database data) where league is the league
+            index data or None, teams maps team names to records loaded from
+            the database, and database data is their snapshots and head-to-head
+            records, or None if they come from the index or there are no games
+        """
+        games = session.execute(games_on_date_query(date, 'MLB').order_by(Odds.time)).scalars().all()
+        league = get_league_index().data
+        if not games or league is not None:
+            return games, league, {}, None
+
+        team_names = {game.home_team for game in games} | {game.away_team for game in games}
+        teams = {
+            team.name: team
+            for team in session.execute(select(MLBTeam).where(MLBTeam.name.in_(team_names))).scalars()
+        }
+        pairs = {
+            (teams[game.home_team].id, teams[game.away_team].id)
+            for game in games
+            if game.home_team in teams and game.away_team in teams
+        }
+        # Every game on the slate shares the same cutoff date
+        return games, None, teams, self._load_team_snapshots(session, list(teams.values()), pairs, date.date())
+
+    def _analyze_slate(
+        self,
+        date: datetime,
+        games: List[Odds],
+        league: Optional[LeagueData],
+        teams: Dict[str, MLBTeam],
+        db_data
+    ) -> MlbSlateAnalyticsResponse:
+        """
+        Build enhanced analytics for a whole slate from the data loaded by _load_slate.
+
+        All ML feature rows are scored with one predict_many call.
+
+        Args:
+            date: Date of the slate
+            games: Odds rows for the slate, ordered by start time
+            league: Loaded league index data, or None if team data came from the database
+            teams: Team records by name loaded from the database
+            db_data: Team snapshots and head-to-head records loaded from the database, or None
+
+        Returns:
+            Analytics for each game on the date, ordered by start time
+        """
+        date_str = date.strftime('%Y-%m-%d')
+        if not games:
+            return MlbSlateAnalyticsResponse(date=date_str, list=[])
+
+        if league is not None:
+            return self._analyze_slate_from_index(league, games, date.date(), date_str)
+
+        matchups = [
+            (game, teams.get(game.home_team), teams.get(game.away_team))
+            for game in games
+        ]
+        snapshots, h2h = db_data
+
+        analyzed = []
+        feature_rows = []
+        for game, home_team, away_team in matchups:
             if not home_team or not away_team:
-                # Fallback to basic analysis if team data is missing
-                return self._create_basic_response(game_id, home_team_name, away_team_name, home_team, away_team)
-            
-            # Calculate enhanced analytics
-            home_analytics = self._calculate_team_analytics(session, home_team, game.time)
-            away_analytics = self._calculate_team_analytics(session, away_team, game.time)
-
-            # Try ML prediction first, fallback to rule-based
-            ml_prediction = self._try_ml_prediction(session, home_team, away_team, home_analytics, away_analytics, game.time)
-
-            if ml_prediction:
-                # Use ML prediction
-                predicted_winner_type, win_probability, ml_metadata = ml_prediction
-                predicted_winner = home_team_name if predicted_winner_type == 'home' else away_team_name
-
-                # Get key factors from rule-based system for explainability
-                _, _, _, key_factors = self._make_rule_based_prediction(home_analytics, away_analytics)
-
-                return MlbAnalyticsResponse(
-                    id=game_id,
-                    home_team=home_team_name,
-                    away_team=away_team_name,
-                    predicted_winner=predicted_winner,
-                    win_probability=win_probability,
-                    home_analytics=home_analytics,
-                    away_analytics=away_analytics,
-                    key_factors=key_factors,
-                    confidence_level=ml_metadata['model_confidence'],
-                    ml_model_name=ml_metadata['ml_model_name'],
-                    ml_confidence=ml_metadata['model_confidence'],
-                    home_win_probability=ml_metadata['home_win_probability'],
-                    away_win_probability=ml_metadata['away_win_probability'],
-                    prediction_method='machine_learning',
-                    feature_importance=ml_metadata.get('feature_importance')
-                )
+                analyzed.append((game, None, None, None))
+                continue
+
+            home = snapshots[home_team.id]
+            away = snapshots[away_team.id]
+            home_analytics = self._team_analytics_from_snapshot(home, game.time)
+            away_analytics = self._team_analytics_from_snapshot(away, game.time)
+            h2h_stats = h2h[(home_team.id, away_team.id)]
+            features = self._features_from_snapshots(home, away, home_analytics, away_analytics, h2h_stats, game.time)
+
+            analyzed.append((game, home_analytics, away_analytics, len(feature_rows)))
+            feature_rows.append(features)
+
+        return self._build_slate_response(date_str, analyzed, feature_rows, teams.get)
+
+    def _analyze_slate_from_index(self, league: LeagueData, games: List[Odds], cutoff, date_str: str) -> MlbSlateAnalyticsResponse:
+        """
+        Build enhanced analytics for a slate entirely from the league index.
+
+        Args:
+            league: Loaded league index data
+            games: Odds rows for the slate, ordered by start time
+            cutoff: Date of the slate
+            date_str: Date of the slate as YYYY-MM-DD
+
+        Returns:
+            Analytics for each game on the date, ordered by start time
+        """
+        snapshots = {}
+        analyzed = []
+        feature_rows = []
+        for game in games:
+            home_team, away_team = league.team(game.home_team), league.team(game.away_team)
+            if not home_team or not away_team:
+                analyzed.append((game, None, None, None))
+                continue
+
+            for team in (home_team, away_team):
+                if team.id not in snapshots:
+                    snapshots[team.id] = self._team_snapshot_from_index(league, team, cutoff)
+            home, away = snapshots[home_team.id], snapshots[away_team.id]
+            home_analytics = self._team_analytics_from_snapshot(home, game.time)
+            away_analytics = self._team_analytics_from_snapshot(away, game.time)
+            h2h_stats = league.head_to_head(home_team.id, away_team.id, cutoff)
+            features = self._features_from_snapshots(home, away, home_analytics, away_analytics, h2h_stats, game.time)
+
+            analyzed.append((game, home_analytics, away_analytics, len(feature_rows)))
+            feature_rows.append(features)
+
+        return self._build_slate_response(date_str, analyzed, feature_rows, league.team)
+
+    def _build_slate_response(self, date_str: str, analyzed: List[Tuple], feature_rows: List[Dict[str, float]], find_team) -> MlbSlateAnalyticsResponse:
+        """
+        Score the slate's feature rows in one batch and build each game's response.
+
+        Args:
+            date_str: Date of the slate as YYYY-MM-DD
+            analyzed: (game, home_analytics, away_analytics, feature row) per game, with a
+                None row for games missing team data
+            feature_rows: Feature dictionaries referenced by the analyzed rows
+            find_team: Function returning a team record by name, or None
+
+        Returns:
+            Analytics for each game in the order given
+        """
+        ml_predictions = self._try_ml_predictions(feature_rows)
+
+        scorer = get_shadow_scorer()
+        if scorer.running:
+            scorer.submit([
+                ShadowGame(game.id, game.time, find_team(game.home_team).id, find_team(game.away_team).id)
+                for game, _, _, row in analyzed
+                if row is not None
+            ], feature_rows)
+
+        responses = []
+        for game, home_analytics, away_analytics, row in analyzed:
+            if row is None:
+                responses.append(self._create_basic_response(
+                    game.id, game.home_team, game.away_team, find_team(game.home_team), find_team(game.away_team)
+                ))
             else:
-                # Fallback to rule-based prediction
-                predicted_winner, win_probability, confidence_level, key_factors = self._make_rule_based_prediction(
-                    home_analytics, away_analytics
-                )
-
-                return MlbAnalyticsResponse(
-                    id=game_id,
-                    home_team=home_team_name,
-                    away_team=away_team_name,
-                    predicted_winner=predicted_winner,
-                    win_probability=win_probability,
-                    home_analytics=home_analytics,
-                    away_analytics=away_analytics,
-                    key_factors=key_factors,
-                    confidence_level=confidence_level,
-                    prediction_method='rule_based'
-                )
-            
-        finally:
-            session.close()
-    
-    def _calculate_team_analytics(
-        self, 
-        session: Session, 
-        team: MLBTeam, 
-        game_time: datetime
-    ) -> TeamAnalytics:
+                responses.append(self._build_response(
+                    game.id, game.home_team, game.away_team, home_analytics, away_analytics, ml_predictions[row]
+                ))
+
+        return MlbSlateAnalyticsResponse(date=date_str, list=responses)
+
+    def _load_team_snapshots(
+        self,
+        session: Session,
+        teams: List[MLBTeam],
+        pairs: Set[Tuple[int, int]],
+        cutoff
+    ) -> Tuple[Dict[int, TeamSnapshot], Dict[Tuple[int, int], Dict[str, float]]]:
         """
-        Calculate comprehensive analytics for a team.
-        
+        Load every team's snapshot and every matchup's head-to-head record from the database.
+
+        Recent form and head-to-head come from the feature store where it covers
+        the teams, and from one aggregate query over the schedule otherwise, so
+        the number of queries does not depend on the number of teams or games.
+
         Args:
             session: Database session
-            team: MLBTeam record
-            game_time: Time of the game
-            
+            teams: Team records
+            pairs: Set of (home_team_id, away_team_id) matchups
+            cutoff: Date of the games
+
         Returns:
-            TeamAnalytics object with detailed metrics
+            Tuple of (snapshots by team ID, head-to-head stats by matchup from the home team's perspective)
         """
-        # Get recent games for rolling calculations
-        recent_games = self._get_recent_team_games(session, team.id, game_time)
-        
-        # Calculate rolling win percentage
-        rolling_win_pct = self._calculate_rolling_win_percentage(recent_games, team.id)
-        
-        # Get offensive and defensive ratings
-        offensive_rating = self._calculate_offensive_rating(session, team.id, game_time)
-        defensive_rating = self._calculate_defensive_rating(session, team.id, game_time)
-        
-        # Calculate days of rest
-        days_rest = self._calculate_days_rest(recent_games, game_time)
-        
-        # Calculate momentum score (combination of rolling stats and recent performance)
-        momentum_score = self._calculate_momentum_score(rolling_win_pct, offensive_rating, defensive_rating)
-        
-        return TeamAnalytics(
-            name=team.name,
-            winning_percentage=team.winning_percentage,
-            rolling_win_percentage=rolling_win_pct,
-            offensive_rating=offensive_rating,
-            defensive_rating=defensive_rating,
-            days_rest=days_rest,
-            momentum_score=momentum_score
-        )
-    
-    def _get_recent_team_games(
-        self, 
-        session: Session, 
-        team_id: int, 
-        game_time: datetime,
-        limit: int = None
-    ) -> pd.DataFrame:
+        team_ids = [team.id for team in teams]
+        states = self._get_team_states_for_teams(session, team_ids, cutoff) if self.use_feature_store else {}
+        stored_pairs = {pair for pair in pairs if pair[0] in states and pair[1] in states}
+        schedule_ids = [team_id for team_id in team_ids if team_id not in states]
+        schedule_pairs = pairs - stored_pairs
+
+        forms, h2h = self._get_team_forms(session, schedule_ids, schedule_pairs, cutoff)
+        offensive = self._get_latest_stats_for_teams(session, MLBOffensiveStats, team_ids, cutoff)
+        defensive = self._get_latest_stats_for_teams(session, MLBDefensiveStats, team_ids, cutoff)
+        h2h_records = self._get_stored_head_to_head_for_pairs(session, stored_pairs, cutoff)
+
+        for home_team_id, away_team_id in stored_pairs:
+            record = h2h_records.get(frozenset((home_team_id, away_team_id)))
+            h2h[(home_team_id, away_team_id)] = self._head_to_head_from_record(record, home_team_id)
+
+        snapshots = {
+            team.id: TeamSnapshot(
+                team=team,
+                offensive=offensive.get(team.id),
+                defensive=defensive.get(team.id),
+                state=states.get(team.id) or forms.get(team.id)
+            )
+            for team in teams
+        }
+        return snapshots, h2h
+
+    def _get_team_forms(
+        self,
+        session: Session,
+        team_ids: List[int],
+        pairs: Set[Tuple[int, int]],
+        cutoff,
+        h2h_window: int = 5
+    ) -> Tuple[Dict[int, TeamForm], Dict[Tuple[int, int], Dict[str, float]]]:
         """
-        Get recent games for a team up to the specified time.
-        
+        Aggregate recent form and head-to-head records from the schedule in one statement.
+
+        Each team's final games before the cutoff are ranked most recent first,
+        overall and per opponent, with ROW_NUMBER(); the statement then returns
+        one row per team (games played, wins, runs for and against over the
+        rolling window and last game date) and one row per matchup (wins and
+        losses over the last h2h_window meetings).
+
         Args:
             session: Database session
-            team_id: ID of the team
-            game_time: Cutoff time for games
-            limit: Maximum number of games to retrieve
-            
+            team_ids: IDs of the teams whose form is needed
+            pairs: Set of (home_team_id, away_team_id) matchups whose head-to-head is needed
+            cutoff: Only games strictly before this date are included
+            h2h_window: Maximum number of meetings per matchup
+
         Returns:
-            DataFrame of recent games
+            Tuple of (TeamForm by team ID for teams that have played, head-to-head
+            stats by matchup from the home team's perspective)
         """
-        if limit is None:
-            limit = self.rolling_window * 2  # Get more games to ensure we have enough for rolling calculations
-        
-        games = session.query(MLBSchedule).filter(
-            MLBSchedule.home_team_id == team_id,
-            MLBSchedule.date < game_time.date(),
-            MLBSchedule.status == 'Final'
-        ).union(
-            session.query(MLBSchedule).filter(
-                MLBSchedule.away_team_id == team_id,
-                MLBSchedule.date < game_time.date(),
+        h2h = {pair: {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0} for pair in pairs}
+        scanned_ids = set(team_ids) | {home_team_id for home_team_id, _ in pairs}
+        if not scanned_ids:
+            return {}, h2h
+
+        def team_games(team_column, opponent_column, scored, allowed):
+            return select(
+                team_column.label('team_id'),
+                opponent_column.label('opponent_id'),
+                MLBSchedule.id,
+                MLBSchedule.date,
+                scored.label('runs_scored'),
+                allowed.label('runs_allowed')
+            ).where(
+                team_column.in_(scanned_ids),
+                MLBSchedule.date < cutoff,
                 MLBSchedule.status == 'Final'
             )
-        ).order_by(MLBSchedule.date.desc()).limit(limit).all()
-        
-        # Convert to DataFrame for easier manipulation
-        games_data = []
-        for game in games:
-            games_data.append({
-                'date': game.date,
-                'home_team_id': game.home_team_id,
-                'away_team_id': game.away_team_id,
-                'home_score': game.home_score,
-                'away_score': game.away_score
-            })
-        
-        return pd.DataFrame(games_data)
-    
-    def _calculate_rolling_win_percentage(self, games_df: pd.DataFrame, team_id: int) -> Optional[float]:
+
+        games = union_all(
+            team_games(MLBSchedule.home_team_id, MLBSchedule.away_team_id, MLBSchedule.home_score, MLBSchedule.away_score),
+            team_games(MLBSchedule.away_team_id, MLBSchedule.home_team_id, MLBSchedule.away_score, MLBSchedule.home_score)
+        ).cte('team_games')
+        ranked = select(
+            games,
+            func.row_number().over(
+                partition_by=games.c.team_id, order_by=(games.c.date.desc(), games.c.id.desc())
+            ).label('game_rank'),
+            func.row_number().over(
+                partition_by=(games.c.team_id, games.c.opponent_id), order_by=(games.c.date.desc(), games.c.id.desc())
+            ).label('meeting_rank')
+        ).cte('ranked_games')
+
+        in_window = ranked.c.game_rank <= self.rolling_window
+        won = ranked.c.runs_scored > ranked.c.runs_allowed
+        lost = ranked.c.runs_allowed > ranked.c.runs_scored
+
+        def count_if(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        form_rows = select(
+            literal('form').label('kind'),
+            ranked.c.team_id,
+            cast(null(), Integer).label('opponent_id'),
+            func.count().label('games_played'),
+            count_if(in_window & won).label('wins'),
+            count_if(in_window & lost).label('losses'),
+            func.sum(case((in_window, ranked.c.runs_scored), else_=0)).label('runs_scored'),
+            func.sum(case((in_window, ranked.c.runs_allowed), else_=0)).label('runs_allowed'),
+            func.max(ranked.c.date).label('last_game_date')
+        ).where(ranked.c.team_id.in_(team_ids)).group_by(ranked.c.team_id)
+
+        statement = form_rows
+        if pairs:
+            h2h_rows = select(
+                literal('h2h').label('kind'),
+                ranked.c.team_id,
+                ranked.c.opponent_id,
+                func.count().label('games_played'),
+                count_if(won).label('wins'),
+                count_if(lost).label('losses'),
+                literal(0).label('runs_scored'),
+                literal(0).label('runs_allowed'),
+                func.max(ranked.c.date).label('last_game_date')
+            ).where(
+                ranked.c.meeting_rank <= h2h_window,
+                or_(*(
+                    and_(ranked.c.team_id == home_team_id, ranked.c.opponent_id == away_team_id)
+                    for home_team_id, away_team_id in pairs
+                ))
+            ).group_by(ranked.c.team_id, ranked.c.opponent_id)
+            statement = union_all(form_rows, h2h_rows)
+
+        forms = {}
+        for row in session.execute(statement):
+            if row.kind == 'h2h':
+                h2h[(row.team_id, row.opponent_id)] = {
+                    'home_win_pct': round(row.wins / row.games_played, 3),
+                    'away_win_pct': round(row.losses / row.games_played, 3),
+                    'games_played': row.games_played
+                }
+                continue
+
+            # Rolling values are null until a full window, as in the training data
+            full_window = row.games_played >= self.rolling_window
+            forms[row.team_id] = TeamForm(
+                date=row.last_game_date,
+                games_played=row.games_played,
+                rolling_win_pct=round(row.wins / self.rolling_window, 3) if full_window else None,
+                rolling_runs_scored=row.runs_scored / self.rolling_window if full_window else None,
+                rolling_runs_allowed=row.runs_allowed / self.rolling_window if full_window else None
+            )
+        return forms, h2h
+
+    def _get_latest_stats_for_teams(self, session: Session, model, team_ids: List[int], cutoff) -> Dict[int, object]:
         """
-        Calculate rolling win percentage for the last N games.
-        
+        Get each team's latest stats row on or before a date in one query.
+
         Args:
-            games_df: DataFrame of team games
-            team_id: ID of the team
-            
+            session: Database session
+            model: MLBOffensiveStats or MLBDefensiveStats
+            team_ids: IDs of the teams
+            cutoff: Only rows dated on or before this date are included
+
         Returns:
-            Rolling win percentage or None if insufficient data
+            Mapping of team ID to its latest stats row
         """
-        if len(games_df) < self.rolling_window:
-            return None
-        
-        # Take the most recent games
-        recent_games = games_df.head(self.rolling_window)
-        
-        # Calculate wins
-        wins = 0
-        for _, game in recent_games.iterrows():
-            if game['home_team_id'] == team_id:
-                if game['home_score'] > game['away_score']:
-                    wins += 1
-            else:  # away_team_id == team_id
-                if game['away_score'] > game['home_score']:
-                    wins += 1
-        
-        return round(wins / self.rolling_window, 3)
-    
-    def _calculate_offensive_rating(self, session: Session, team_id: int, game_time: datetime) -> Optional[float]:
+        ranked = select(
+            model,
+            func.row_number().over(partition_by=model.team_id, order_by=model.date.desc()).label('rn')
+        ).where(
+            model.team_id.in_(team_ids),
+            model.date <= cutoff
+        ).subquery()
+        latest = aliased(model, ranked)
+
+        rows = session.execute(select(latest).where(ranked.c.rn == 1)).scalars()
+        return {row.team_id: row for row in rows}
+
+    def _get_team_states_for_teams(self, session: Session, team_ids: List[int], cutoff) -> Dict[int, MLBTeamState]:
         """
-        Calculate offensive rating based on recent offensive statistics.
-        
+        Get each team's latest feature store row before a date in one query.
+
         Args:
             session: Database session
-            team_id: ID of the team
+            team_ids: IDs of the teams
+            cutoff: Only rows dated strictly before this date are included
+
+        Returns:
+            Mapping of team ID to its latest state, for teams the store covers
+        """
+        ranked = select(
+            MLBTeamState,
+            func.row_number().over(partition_by=MLBTeamState.team_id, order_by=MLBTeamState.date.desc()).label('rn')
+        ).where(
+            MLBTeamState.team_id.in_(team_ids),
+            MLBTeamState.date < cutoff
+        ).subquery()
+        latest = aliased(MLBTeamState, ranked)
+
+        rows = session.execute(select(latest).where(ranked.c.rn == 1)).scalars()
+        return {row.team_id: row for row in rows}
+
+    def _get_stored_head_to_head_for_pairs(self, session: Session, pairs, cutoff) -> Dict[frozenset, MLBHeadToHead]:
+        """
+        Get the latest feature store head-to-head row before a date for several pairs in one query.
+
+        Args:
+            session: Database session
+            pairs: Set of (home_team_id, away_team_id) matchups
+            cutoff: Only rows dated strictly before this date are included
+
+        Returns:
+            Mapping of frozenset({team_a, team_b}) to its latest row, for pairs that have met
+        """
+        if not pairs:
+            return {}
+
+        ranked = select(
+            MLBHeadToHead,
+            func.row_number().over(
+                partition_by=(MLBHeadToHead.team_a_id, MLBHeadToHead.team_b_id),
+                order_by=MLBHeadToHead.date.desc()
+            ).label('rn')
+        ).where(
+            or_(*(
+                and_(MLBHeadToHead.team_a_id == min(pair), MLBHeadToHead.team_b_id == max(pair))
+                for pair in pairs
+            )),
+            MLBHeadToHead.date < cutoff
+        ).subquery()
+        latest = aliased(MLBHeadToHead, ranked)
+
+        rows = session.execute(select(latest).where(ranked.c.rn == 1)).scalars()
+        return {frozenset((row.team_a_id, row.team_b_id)): row for row in rows}
+
+    def _try_ml_predictions(self, feature_rows: List[Dict[str, float]]) -> List[Optional[Tuple[str, float, Dict]]]:
+        """
+        Score many feature rows with the ML model in one batch.
+
+        Args:
+            feature_rows: Feature dictionaries, one per game
+
+        Returns:
+            One (predicted_winner_type, win_probability, metadata) per row, or None
+            where ML prediction failed or was not confident enough
+        """
+        try:
+            ml_service = self._ml_service()
+
+            if not feature_rows or not ml_service.is_available:
+                return [None] * len(feature_rows)
+
+            return [
+                result if result and result[2].get('use_ml_prediction', False) else None
+                for result in ml_service.predict_many(feature_rows)
+            ]
+
+        except Exception as e:
+            logger.warning(f"Batch ML prediction failed: {e}")
+            return [None] * len(feature_rows)
+
+    def _build_response(
+        self,
+        game_id: str,
+        home_team_name: str,
+        away_team_name: str,
+        home_analytics: TeamAnalytics,
+        away_analytics: TeamAnalytics,
+        ml_prediction: Optional[Tuple[str, float, Dict]]
+    ) -> MlbAnalyticsResponse:
+        """
+        Build the analytics response from team analytics and an optional ML prediction.
+
+        Args:
+            game_id: Game ID
+            home_team_name: Home team name
+            away_team_name: Away team name
+            home_analytics: Home team analytics
+            away_analytics: Away team analytics
+            ml_prediction: Confident ML prediction, or None to use the rule-based one
+
+        Returns:
+            Enhanced analytics response
+        """
+        if ml_prediction:
+            # Use ML prediction
+            predicted_winner_type, win_probability, ml_metadata = ml_prediction
+            predicted_winner = home_team_name if predicted_winner_type == 'home' else away_team_name
+
+            # Get key factors from rule-based system for explainability
+            _, _, _, key_factors = self._make_rule_based_prediction(home_analytics, away_analytics)
+
+            return MlbAnalyticsResponse(
+                id=game_id,
+                home_team=home_team_name,
+                away_team=away_team_name,
+                predicted_winner=predicted_winner,
+                win_probability=win_probability,
+                home_analytics=home_analytics,
+                away_analytics=away_analytics,
+                key_factors=key_factors,
+                confidence_level=ml_metadata['model_confidence'],
+                ml_model_name=ml_metadata['ml_model_name'],
+                ml_confidence=ml_metadata['model_confidence'],
+                home_win_probability=ml_metadata['home_win_probability'],
+                away_win_probability=ml_metadata['away_win_probability'],
+                prediction_method='machine_learning',
+                feature_importance=ml_metadata.get('feature_importance')
+            )
+        else:
+            # Fallback to rule-based prediction
+            predicted_winner, win_probability, confidence_level, key_factors = self._make_rule_based_prediction(
+                home_analytics, away_analytics
+            )
+
+            return MlbAnalyticsResponse(
+                id=game_id,
+                home_team=home_team_name,
+                away_team=away_team_name,
+                predicted_winner=predicted_winner,
+                win_probability=win_probability,
+                home_analytics=home_analytics,
+                away_analytics=away_analytics,
+                key_factors=key_factors,
+                confidence_level=confidence_level,
+                prediction_method='rule_based'
+            )
+
+    def _team_snapshot_from_index(self, league: LeagueData, team, cutoff) -> TeamSnapshot:
+        """
+        Build a team's snapshot from the league index without querying the database.
+
+        Args:
+            league: Loaded league index data
+            team: TeamRecord from the index
+            cutoff: Game date or time
+
+        Returns:
+            TeamSnapshot whose state is the team's form over the rolling window
+        """
+        return TeamSnapshot(
+            team=team,
+            offensive=league.offensive_stats(team.id, cutoff),
+            defensive=league.defensive_stats(team.id, cutoff),
+            state=league.team_form(team.id, cutoff, self.rolling_window)
+        )
+
+    def _team_analytics_from_snapshot(self, snapshot: TeamSnapshot, game_time: datetime) -> TeamAnalytics:
+        """
+        Calculate team analytics from already loaded data.
+
+        Args:
+            snapshot: The team's loaded data
             game_time: Time of the game
-            
+
+        Returns:
+            TeamAnalytics object with detailed metrics
+        """
+        team = snapshot.team
+        if snapshot.state is not None:
+            rolling_win_pct = snapshot.state.rolling_win_pct
+            days_rest = (game_time.date() - snapshot.state.date).days
+        else:
+            rolling_win_pct = None
+            days_rest = None
+        offensive_rating = self._offensive_rating_from_stats(snapshot.offensive)
+        defensive_rating = self._defensive_rating_from_stats(snapshot.defensive)
+
+        return TeamAnalytics(
+            name=team.name,
+            winning_percentage=team.winning_percentage,
+            rolling_win_percentage=rolling_win_pct,
+            offensive_rating=offensive_rating,
+            defensive_rating=defensive_rating,
+            days_rest=days_rest,
+            momentum_score=self._calculate_momentum_score(rolling_win_pct, offensive_rating, defensive_rating)
+        )
+
+    def _offensive_rating_from_stats(self, offensive_stats: Optional[MLBOffensiveStats]) -> Optional[float]:
+        """
+        Calculate offensive rating from an offensive stats row.
+
+        Args:
+            offensive_stats: Latest offensive stats, or None
+
         Returns:
             Offensive rating or None if no data available
         """
-        # Get most recent offensive stats
-        offensive_stats = session.query(MLBOffensiveStats).filter(
-            MLBOffensiveStats.team_id == team_id,
-            MLBOffensiveStats.date <= game_time.date()
-        ).order_by(MLBOffensiveStats.date.desc()).first()
-        
         if not offensive_stats:
             return None
         
@@ -270,24 +775,16 @@ class EnhancedMLBAnalytics:
         
         return round(offensive_rating, 3)
     
-    def _calculate_defensive_rating(self, session: Session, team_id: int, game_time: datetime) -> Optional[float]:
+    def _defensive_rating_from_stats(self, defensive_stats: Optional[MLBDefensiveStats]) -> Optional[float]:
         """
-        Calculate defensive rating based on recent defensive statistics.
-        
+        Calculate defensive rating from a defensive stats row.
+
         Args:
-            session: Database session
-            team_id: ID of the team
-            game_time: Time of the game
-            
+            defensive_stats: Latest defensive stats, or None
+
         Returns:
             Defensive rating or None if no data available
         """
-        # Get most recent defensive stats
-        defensive_stats = session.query(MLBDefensiveStats).filter(
-            MLBDefensiveStats.team_id == team_id,
-            MLBDefensiveStats.date <= game_time.date()
-        ).order_by(MLBDefensiveStats.date.desc()).first()
-        
         if not defensive_stats:
             return None
         
@@ -300,28 +797,6 @@ class EnhancedMLBAnalytics:
         
         return round(defensive_rating, 3)
     
-    def _calculate_days_rest(self, games_df: pd.DataFrame, game_time: datetime) -> Optional[int]:
-        """
-        Calculate days of rest since the last game.
-        
-        Args:
-            games_df: DataFrame of team games
-            game_time: Time of the upcoming game
-            
-        Returns:
-            Number of days of rest or None if no recent games
-        """
-        if games_df.empty:
-            return None
-        
-        # Get the most recent game date
-        most_recent_game = games_df.iloc[0]['date']
-        
-        # Calculate days between most recent game and upcoming game
-        days_rest = (game_time.date() - most_recent_game).days
-        
-        return days_rest
-    
     def _calculate_momentum_score(
         self, 
         rolling_win_pct: Optional[float], 
@@ -364,45 +839,47 @@ class EnhancedMLBAnalytics:
     
     def _try_ml_prediction(
         self,
-        session: Session,
-        home_team: MLBTeam,
-        away_team: MLBTeam,
+        home: TeamSnapshot,
+        away: TeamSnapshot,
         home_analytics: TeamAnalytics,
         away_analytics: TeamAnalytics,
-        game_time: datetime
+        h2h_stats: Dict[str, float],
+        game_time: datetime,
+        shadow_game: Optional[ShadowGame] = None
     ) -> Optional[Tuple[str, float, Dict]]:
         """
         Attempt to make a prediction using the ML model.
 
         Args:
-            session: Database session
-            home_team: Home team record
-            away_team: Away team record
+            home: Home team's loaded data
+            away: Away team's loaded data
             home_analytics: Home team analytics
             away_analytics: Away team analytics
+            h2h_stats: Head-to-head stats from the home team's perspective
             game_time: Game time
+            shadow_game: The game, to queue its features for shadow scoring by challenger models
 
         Returns:
             Tuple of (predicted_winner_type, win_probability, metadata) or None if ML prediction fails
         """
         try:
             # Get the ML model service
-            ml_service = get_mlb_model_service()
+            ml_service = self._ml_service()
 
             if not ml_service.is_available:
                 return None
 
             # Prepare features for ML model
-            features = self._prepare_ml_features(
-                session, home_team, away_team, home_analytics, away_analytics, game_time
+            features = self._features_from_snapshots(
+                home, away, home_analytics, away_analytics, h2h_stats, game_time
             )
 
-            if not features:
-                return None
-
             # Get prediction from ML model
             prediction_result = ml_service.predict(features)
 
+            if shadow_game is not None:
+                get_shadow_scorer().submit([shadow_game], [features])
+
             if not prediction_result:
                 return None
 
@@ -415,153 +892,96 @@ class EnhancedMLBAnalytics:
                 return None
 
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"ML prediction failed: {e}")
+            logger.warning(f"ML prediction failed: {e}")
             return None
 
-    def _prepare_ml_features(
+    def _snapshot_rolling_runs(self, snapshot: TeamSnapshot) -> Tuple[float, float]:
+        """Rolling runs scored and allowed from the team's recent form, zeros if it has none."""
+        if snapshot.state is None:
+            return 0.0, 0.0
+        # Null until the team has played a full window, like in training data
+        return snapshot.state.rolling_runs_scored or 0.0, snapshot.state.rolling_runs_allowed or 0.0
+
+    def _features_from_snapshots(
         self,
-        session: Session,
-        home_team: MLBTeam,
-        away_team: MLBTeam,
+        home: TeamSnapshot,
+        away: TeamSnapshot,
         home_analytics: TeamAnalytics,
         away_analytics: TeamAnalytics,
+        h2h_stats: Dict[str, float],
         game_time: datetime
-    ) -> Optional[Dict[str, float]]:
+    ) -> Dict[str, float]:
         """
-        Prepare features for ML model prediction.
+        Build the ML feature dictionary from already loaded data.
 
         Args:
-            session: Database session
-            home_team: Home team record
-            away_team: Away team record
+            home: Home team's loaded data
+            away: Away team's loaded data
             home_analytics: Home team analytics
             away_analytics: Away team analytics
+            h2h_stats: Head-to-head stats from the home team's perspective
             game_time: Game time
 
         Returns:
-            Dictionary of features or None if features cannot be prepared
+            Dictionary of features, with league-typical defaults for missing stats
         """
-        try:
-            # Get recent games for rolling stats (already calculated in analytics)
-            home_recent_games = self._get_recent_team_games(session, home_team.id, game_time)
-            away_recent_games = self._get_recent_team_games(session, away_team.id, game_time)
-
-            # Calculate rolling runs scored/allowed
-            home_rolling_runs_scored = home_recent_games['home_score'].where(
-                home_recent_games['home_team_id'] == home_team.id,
-                home_recent_games['away_score']
-            ).head(10).mean() if not home_recent_games.empty else 0.0
-
-            home_rolling_runs_allowed = home_recent_games['away_score'].where(
-                home_recent_games['home_team_id'] == home_team.id,
-                home_recent_games['home_score']
-            ).head(10).mean() if not home_recent_games.empty else 0.0
-
-            away_rolling_runs_scored = away_recent_games['home_score'].where(
-                away_recent_games['home_team_id'] == away_team.id,
-                away_recent_games['away_score']
-            ).head(10).mean() if not away_recent_games.empty else 0.0
-
-            away_rolling_runs_allowed = away_recent_games['away_score'].where(
-                away_recent_games['home_team_id'] == away_team.id,
-                away_recent_games['home_score']
-            ).head(10).mean() if not away_recent_games.empty else 0.0
-
-            # Get head-to-head stats
-            h2h_stats = self._get_head_to_head_stats(session, home_team.id, away_team.id, game_time)
-
-            # Get recent offensive/defensive stats
-            home_offensive = session.query(MLBOffensiveStats).filter(
-                MLBOffensiveStats.team_id == home_team.id,
-                MLBOffensiveStats.date <= game_time.date()
-            ).order_by(MLBOffensiveStats.date.desc()).first()
-
-            away_offensive = session.query(MLBOffensiveStats).filter(
-                MLBOffensiveStats.team_id == away_team.id,
-                MLBOffensiveStats.date <= game_time.date()
-            ).order_by(MLBOffensiveStats.date.desc()).first()
-
-            home_defensive = session.query(MLBDefensiveStats).filter(
-                MLBDefensiveStats.team_id == home_team.id,
-                MLBDefensiveStats.date <= game_time.date()
-            ).order_by(MLBDefensiveStats.date.desc()).first()
-
-            away_defensive = session.query(MLBDefensiveStats).filter(
-                MLBDefensiveStats.team_id == away_team.id,
-                MLBDefensiveStats.date <= game_time.date()
-            ).order_by(MLBDefensiveStats.date.desc()).first()
-
-            # Prepare feature dictionary
-            features = {
-                'home_rolling_win_pct': home_analytics.rolling_win_percentage or 0.0,
-                'away_rolling_win_pct': away_analytics.rolling_win_percentage or 0.0,
-                'home_rolling_runs_scored': float(home_rolling_runs_scored),
-                'away_rolling_runs_scored': float(away_rolling_runs_scored),
-                'home_rolling_runs_allowed': float(home_rolling_runs_allowed),
-                'away_rolling_runs_allowed': float(away_rolling_runs_allowed),
-                'home_days_rest': float(home_analytics.days_rest or 1),
-                'away_days_rest': float(away_analytics.days_rest or 1),
-                'home_batting_avg': float(home_offensive.team_batting_average if home_offensive else 0.25),
-                'away_batting_avg': float(away_offensive.team_batting_average if away_offensive else 0.25),
-                'home_obp': float(home_offensive.on_base_percentage if home_offensive else 0.32),
-                'away_obp': float(away_offensive.on_base_percentage if away_offensive else 0.32),
-                'home_slg': float(home_offensive.slugging_percentage if home_offensive else 0.4),
-                'away_slg': float(away_offensive.slugging_percentage if away_offensive else 0.4),
-                'home_era': float(home_defensive.team_era if home_defensive else 4.5),
-                'away_era': float(away_defensive.team_era if away_defensive else 4.5),
-                'home_whip': float(home_defensive.whip if home_defensive else 1.35),
-                'away_whip': float(away_defensive.whip if away_defensive else 1.35),
-                'home_strikeouts': float(home_defensive.strikeouts if home_defensive else 150),
-                'away_strikeouts': float(away_defensive.strikeouts if away_defensive else 150),
-                'h2h_home_win_pct': h2h_stats['home_win_pct'],
-                'h2h_away_win_pct': h2h_stats['away_win_pct'],
-                'h2h_games_played': float(h2h_stats['games_played']),
-                'month': float(game_time.month),
-                'day_of_week': float(game_time.weekday()),
-                'is_weekend': float(1 if game_time.weekday() >= 5 else 0)
-            }
-
-            return features
+        home_rolling_runs_scored, home_rolling_runs_allowed = self._snapshot_rolling_runs(home)
+        away_rolling_runs_scored, away_rolling_runs_allowed = self._snapshot_rolling_runs(away)
+        home_offensive, away_offensive = home.offensive, away.offensive
+        home_defensive, away_defensive = home.defensive, away.defensive
 
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Feature preparation failed: {e}")
-            return None
+        return {
+            'home_rolling_win_pct': home_analytics.rolling_win_percentage or 0.0,
+            'away_rolling_win_pct': away_analytics.rolling_win_percentage or 0.0,
+            'home_rolling_runs_scored': home_rolling_runs_scored,
+            'away_rolling_runs_scored': away_rolling_runs_scored,
+            'home_rolling_runs_allowed': home_rolling_runs_allowed,
+            'away_rolling_runs_allowed': away_rolling_runs_allowed,
+            'home_days_rest': float(home_analytics.days_rest or 1),
+            'away_days_rest': float(away_analytics.days_rest or 1),
+            'home_batting_avg': float(home_offensive.team_batting_average if home_offensive else 0.25),
+            'away_batting_avg': float(away_offensive.team_batting_average if away_offensive else 0.25),
+            'home_obp': float(home_offensive.on_base_percentage if home_offensive else 0.32),
+            'away_obp': float(away_offensive.on_base_percentage if away_offensive else 0.32),
+            'home_slg': float(home_offensive.slugging_percentage if home_offensive else 0.4),
+            'away_slg': float(away_offensive.slugging_percentage if away_offensive else 0.4),
+            'home_era': float(home_defensive.team_era if home_defensive else 4.5),
+            'away_era': float(away_defensive.team_era if away_defensive else 4.5),
+            'home_whip': float(home_defensive.whip if home_defensive else 1.35),
+            'away_whip': float(away_defensive.whip if away_defensive else 1.35),
+            'home_strikeouts': float(home_defensive.strikeouts if home_defensive else 150),
+            'away_strikeouts': float(away_defensive.strikeouts if away_defensive else 150),
+            'h2h_home_win_pct': h2h_stats['home_win_pct'],
+            'h2h_away_win_pct': h2h_stats['away_win_pct'],
+            'h2h_games_played': float(h2h_stats['games_played']),
+            'month': float(game_time.month),
+            'day_of_week': float(game_time.weekday()),
+            'is_weekend': float(1 if game_time.weekday() >= 5 else 0)
+        }
 
-    def _get_head_to_head_stats(
-        self,
-        session: Session,
-        home_team_id: int,
-        away_team_id: int,
-        game_time: datetime,
-        window: int = 5
-    ) -> Dict[str, float]:
-        """Get head-to-head statistics between two teams."""
-        h2h_games = session.query(MLBSchedule).filter(
-            (
-                ((MLBSchedule.home_team_id == home_team_id) & (MLBSchedule.away_team_id == away_team_id)) |
-                ((MLBSchedule.home_team_id == away_team_id) & (MLBSchedule.away_team_id == home_team_id))
-            ),
-            MLBSchedule.date < game_time.date(),
-            MLBSchedule.status == 'Final'
-        ).order_by(MLBSchedule.date.desc()).limit(window).all()
-
-        if not h2h_games:
-            return {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
+    def _head_to_head_from_record(self, record: Optional[MLBHeadToHead], home_team_id: int) -> Dict[str, float]:
+        """
+        Summarize a feature store head-to-head row from the home team's perspective.
 
-        home_wins = sum(
-            1 for game in h2h_games
-            if (game.home_team_id == home_team_id and game.home_score > game.away_score) or
-               (game.away_team_id == home_team_id and game.away_score > game.home_score)
-        )
+        Args:
+            record: Latest row for the pair before the game, or None if they haven't met
+            home_team_id: ID of the home team in the upcoming game
 
-        games_played = len(h2h_games)
+        Returns:
+            Dictionary with home_win_pct, away_win_pct and games_played
+        """
+        if record is None or not record.games_played:
+            return {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
+
+        if record.team_a_id == home_team_id:
+            home_wins, away_wins = record.team_a_wins, record.team_b_wins
+        else:
+            home_wins, away_wins = record.team_b_wins, record.team_a_wins
 
         return {
-            'home_win_pct': round(home_wins / games_played, 3),
-            'away_win_pct': round((games_played - home_wins) / games_played, 3),
-            'games_played': games_played
+            'home_win_pct': round(home_wins / record.games_played, 3),
+            'away_win_pct': round(away_wins / record.games_played, 3),
+            'games_played': record.games_played
         }
 
     def _make_rule_based_prediction(
@@ -706,16 +1126,105 @@ class EnhancedMLBAnalytics:
         )
 
 
+def get_ml_service(model_version: Optional[str] = None) -> MLModelService:
+    """
+    Get the model service for a model version.
+
+    Args:
+        model_version: Version from the model registry, or None for the production model
+
+    Returns:
+        MLModelService for the version
+
+    Raises:
+        UnknownModelError: If the version is not in the model registry
+    """
+    if model_version is None:
+        return get_mlb_model_service()
+    return get_mlb_model_registry().get_service(model_version)
+
+
+async def _load_ml_service(model_version: Optional[str]) -> MLModelService:
+    """
+    Get the model service for a model version, loading a requested version off the event loop.
+
+    Registry lookups may rescan the models directory and a version's first
+    request deserializes its model, so both run in a worker thread before any
+    analytics. The production model is loaded by the startup warmup, which
+    requests don't wait for.
+
+    Args:
+        model_version: Version from the model registry, or None for the production model
+
+    Returns:
+        MLModelService for the version
+
+    Raises:
+        UnknownModelError: If the version is not in the model registry
+    """
+    ml_service = await asyncio.to_thread(get_ml_service, model_version)
+    if model_version is not None:
+        await asyncio.to_thread(ml_service._load_model)
+    return ml_service
+
+
 # Convenience function for backward compatibility
-async def get_enhanced_mlb_game_analytics(game_id: str) -> MlbAnalyticsResponse:
+async def get_enhanced_mlb_game_analytics(game_id: str, model_version: Optional[str] = None) -> MlbAnalyticsResponse:
     """
     Get enhanced MLB game analytics using the new analytics service.
+
+    Results only depend on the game, the MLB data and the model, so they are
+    cached per (game_id, data version, requested model, model version). A data
+    update or model reload changes the key; the TTL bounds staleness of the
+    game row itself.
     
     Args:
         game_id: ID of the game to analyze
+        model_version: Version of the ML model to predict with, or None for the production model
         
     Returns:
         Enhanced analytics response
+
+    Raises:
+        UnknownModelError: If model_version is not in the model registry
+    """
+    ml_service = await _load_ml_service(model_version)
+    analytics_service = EnhancedMLBAnalytics(model_version=model_version)
+    try:
+        data_version = await get_mlb_data_version()
+    except Exception as e:
+        logger.warning(f"Could not read MLB data version, skipping analytics cache: {e}")
+        return await analytics_service.get_enhanced_game_analytics(game_id)
+
+    key = (game_id, data_version, model_version, ml_service.model_version)
+    result = analytics_cache.get(key)
+    if result is None:
+        generation = analytics_cache.generation
+        result = await analytics_service.get_enhanced_game_analytics(game_id)
+        # The model loads lazily on first use; don't file a result under the version it replaced
+        if ml_service.model_version == key[3]:
+            analytics_cache.set(key, result, generation=generation)
+    return result
+
+
+def get_analytics_cache_stats():
+    return analytics_cache.get_stats()
+
+
+async def get_enhanced_mlb_slate_analytics(date: datetime, model_version: Optional[str] = None) -> MlbSlateAnalyticsResponse:
+    """
+    Get enhanced analytics for every MLB game on a date.
+
+    Args:
+        date: Date of the slate
+        model_version: Version of the ML model to predict with, or None for the production model
+
+    Returns:
+        Analytics for each game on the date
+
+    Raises:
+        UnknownModelError: If model_version is not in the model registry
     """
-    analytics_service = EnhancedMLBAnalytics()
-    return await analytics_service.get_enhanced_game_analytics(game_id)
+    await _load_ml_service(model_version)
+    analytics_service = EnhancedMLBAnalytics(model_version=model_version)
+    return await analytics_service.get_slate_analytics(date)
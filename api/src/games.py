@@ -1,20 +1,48 @@
 import traceback
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from api.src.models.tables import Odds
-from api.src.models.games import Game, GamesResponse
+from api.src.models.games import BestLines, Game, GamesResponse
 from dateutil import parser
 from datetime import timedelta, datetime
-from api.src.config import ODDS_API_URL
+from api.src.cache import TTLCache
+from api.src.config import (
+    ODDS_REFRESH_ENABLED,
+    GAMES_CACHE_TTL,
+    GAMES_CACHE_MAX_ENTRIES,
+    ODDS_BOOKMAKERS,
+    ODDS_MARKETS,
+    ODDS_PRIMARY_BOOKMAKER
+)
+from api.src.odds_client import get_odds_client
+from api.src.odds_history import append_odds_snapshots
+from api.src.odds_lines import best_lines, parse_game_lines
+from api.src.single_flight import SingleFlight
 from api.src.utils import format_american_odds
-from shared.database import connect_to_db
-import requests
-from sqlalchemy import cast, Date, func
+from shared.database import async_session_scope
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from pytz import timezone, utc
+
+# Concurrent requests for an expired sport share a single Odds API refresh
+odds_refreshes = SingleFlight('odds-refresh')
+_stale_served = 0
+
+# Serialized GamesResponse bodies keyed by (sport, YYYY-MM-DD)
+games_cache = TTLCache('games', max_entries=GAMES_CACHE_MAX_ENTRIES, default_ttl=GAMES_CACHE_TTL)
     
 async def get_games_for_sport(date: str, sport: str, api_sport_param: str):
     try:
         parsed_date = datetime.strptime(date, "%Y-%m-%d")
-        return get_games_by_date(parsed_date, sport, api_sport_param)
+        key = (sport, parsed_date.strftime("%Y-%m-%d"))
+        payload = games_cache.get(key)
+        if payload is None:
+            generation = games_cache.generation
+            games = await get_games_by_date(parsed_date, sport, api_sport_param)
+            payload = games.model_dump_json().encode('utf-8')
+            games_cache.set(key, payload, ttl=await get_games_cache_ttl(sport), generation=generation)
+        # Already serialized, so FastAPI returns it without re-validating the model
+        return Response(content=payload, media_type='application/json')
     except ValueError as e:
         error_message = f"Invalid date format. Please use YYYY-MM-DD format. Error: {str(e)}"
         traceback_message = traceback.format_exc()
@@ -26,12 +54,10 @@ async def get_games_for_sport(date: str, sport: str, api_sport_param: str):
         print(f"Error: {error_message}\nTraceback: {traceback_message}")
         raise HTTPException(status_code=500, detail=error_message)
 
-def call_odds_api(sport):
-    url = ODDS_API_URL.format(sport=sport)
-    response = requests.get(url).json()
-    return response
+async def call_odds_api(sport):
+    return await get_odds_client().get_odds(sport)
 
-def parse_response_and_store_games(odds_response, sport):
+async def parse_response_and_store_games(odds_response, sport):
     games = []
     eastern = timezone('US/Eastern')
     for game_data in odds_response:
@@ -41,66 +67,116 @@ def parse_response_and_store_games(odds_response, sport):
         commence_time_local = commence_time_utc.astimezone(eastern)
         game_id = game_data['id']
         
-        fanduel_bookmaker = next((bm for bm in game_data.get('bookmakers', []) if bm['key'] == 'fanduel'), None)
-        if fanduel_bookmaker:
-            h2h_market = next((market for market in fanduel_bookmaker.get('markets', []) if market['key'] == 'h2h'), None)
-            if h2h_market:
-                outcomes = {outcome['name']: outcome['price'] for outcome in h2h_market.get('outcomes', [])}
-                home_odds = format_american_odds(outcomes.get(home_team, 0))
-                away_odds = format_american_odds(outcomes.get(away_team, 0))
-                
-                game = Game(
-                    id=game_id,
-                    sport=sport,
-                    homeTeam=home_team,
-                    awayTeam=away_team,
-                    time=commence_time_local.strftime("%Y-%m-%d %H:%M"),
-                    homeOdds=home_odds,
-                    awayOdds=away_odds
-                )
-                games.append(game)
-                
-                if not update_existing_odds_in_db(game_id, home_odds, away_odds):
-                    store_odds(game)
-    
+        lines = parse_game_lines(game_data, ODDS_BOOKMAKERS, ODDS_MARKETS)
+        h2h_lines = lines.get('h2h')
+        if not h2h_lines:
+            continue
+
+        best = best_lines(lines)
+        primary = next((line for line in h2h_lines if line.bookmaker == ODDS_PRIMARY_BOOKMAKER), None)
+        if primary:
+            home_odds = format_american_odds(primary.first_price or 0)
+            away_odds = format_american_odds(primary.second_price or 0)
+        else:
+            home_odds = best.home.odds if best.home else "None"
+            away_odds = best.away.odds if best.away else "None"
+
+        game = Game(
+            id=game_id,
+            sport=sport,
+            homeTeam=home_team,
+            awayTeam=away_team,
+            time=commence_time_local.strftime("%Y-%m-%d %H:%M"),
+            homeOdds=home_odds,
+            awayOdds=away_odds,
+            bestLines=best
+        )
+        games.append(game)
+
+    await upsert_odds(games)
     return games
 
-def update_existing_odds_in_db(game_id, home_odds, away_odds):
-    session = connect_to_db()
-    existing = session.query(Odds).filter_by(id=game_id).first()
-    if existing:
-        existing.home_odds = home_odds
-        existing.away_odds = away_odds
-        existing.expires = datetime.now() + timedelta(minutes=72)
-        session.commit()
-        session.close()
-        return True
-    session.close()
-    return False
-
-def store_odds(game: Game):
-    session = connect_to_db()
-    # Convert time string to datetime object for storage
-    game_time = datetime.strptime(game.time, "%Y-%m-%d %H:%M")
-    odds_record = Odds(
-        id=game.id,
-        sport=game.sport,
-        time=game_time,
-        home_odds=game.homeOdds,
-        away_odds=game.awayOdds,
-        home_team=game.homeTeam,
-        away_team=game.awayTeam,
-        expires=game_time + timedelta(minutes=72)
-    )
-    session.add(odds_record)
-    session.commit()
-    session.close()
-
-def is_data_expired(sport):
-    session = connect_to_db()
+def _upsert_statement(dialect_name):
+    if dialect_name == 'postgresql':
+        return postgresql_insert(Odds)
+    if dialect_name == 'sqlite':
+        return sqlite_insert(Odds)
+    raise ValueError(f"Odds upsert is not supported for database dialect: {dialect_name}")
+
+async def get_next_expiry(sport):
+    """
+    Get the earliest expiry among a sport's games that have not started yet.
+
+    Returns None if no upcoming games are stored.
+    """
+    async with async_session_scope() as session:
+        result = await session.execute(
+            select(func.min(Odds.expires)).filter(Odds.sport == sport, Odds.time > datetime.now())
+        )
+        return result.scalar()
+
+async def get_games_cache_ttl(sport):
+    """
+    Seconds a cached games response for a sport stays valid: until the sport's
+    next odds expiry, capped at GAMES_CACHE_TTL.
+    """
+    next_expiry = await get_next_expiry(sport)
+    if next_expiry is None:
+        return GAMES_CACHE_TTL
+    return min(GAMES_CACHE_TTL, (next_expiry - datetime.now()).total_seconds())
+
+async def upsert_odds(games):
+    """
+    Write a parsed slate of games in a single INSERT ... ON CONFLICT (id) DO UPDATE,
+    appending moved lines to the odds history in the same transaction.
+
+    New games expire 72 minutes after their start time. Games already stored keep
+    their row and get the new odds and an expiry 72 minutes from now.
+    """
+    if not games:
+        return
+
+    rows = []
+    for game in games:
+        # Convert time string to datetime object for storage
+        game_time = datetime.strptime(game.time, "%Y-%m-%d %H:%M")
+        rows.append({
+            'id': game.id,
+            'sport': game.sport,
+            'time': game_time,
+            'home_odds': game.homeOdds,
+            'away_odds': game.awayOdds,
+            'home_team': game.homeTeam,
+            'away_team': game.awayTeam,
+            'best_lines': game.bestLines.model_dump() if game.bestLines else None,
+            'expires': game_time + timedelta(minutes=72)
+        })
+
+    async with async_session_scope() as session:
+        # Record line movement before the upsert overwrites the current odds
+        await append_odds_snapshots(session, games, datetime.now())
+
+        stmt = _upsert_statement(session.bind.dialect.name).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Odds.id],
+            set_={
+                'home_odds': stmt.excluded.home_odds,
+                'away_odds': stmt.excluded.away_odds,
+                'best_lines': stmt.excluded.best_lines,
+                'expires': datetime.now() + timedelta(minutes=72)
+            }
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+    sports = {game.sport for game in games}
+    games_cache.invalidate(lambda key: key[0] in sports)
+
+async def is_data_expired(sport):
     current_time = datetime.now()
-    nearest_expiration = session.query(func.min(Odds.expires)).filter(Odds.sport == sport).scalar()
-    session.close()
+    async with async_session_scope() as session:
+        result = await session.execute(select(func.min(Odds.expires)).filter(Odds.sport == sport))
+        nearest_expiration = result.scalar()
 
     if nearest_expiration is None:
         return True
@@ -109,17 +185,20 @@ def is_data_expired(sport):
     return is_expired
 
 
-def get_games_by_date(date, sport, api_sport_param):
-    if is_data_expired(sport):
-        odds_response = call_odds_api(api_sport_param)
-        games = parse_response_and_store_games(odds_response, sport)
-        games_for_date = [game for game in games if game.time.split(" ")[0] == date.strftime("%Y-%m-%d")]
-        return GamesResponse(list=games_for_date)
-    else:
-        session = connect_to_db()
-        # Convert datetime to date for proper comparison
-        target_date = date.date()
-        games = session.query(Odds).filter(cast(Odds.time, Date) == target_date, Odds.sport == sport).all()
+async def refresh_odds(sport, api_sport_param):
+    odds_response = await call_odds_api(api_sport_param)
+    return await parse_response_and_store_games(odds_response, sport)
+
+def games_on_date_query(date, sport):
+    # Half-open range [midnight, next midnight) so the (sport, time) index can be used
+    day_start = datetime.combine(date.date(), datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+    return select(Odds).filter(Odds.sport == sport, Odds.time >= day_start, Odds.time < day_end)
+
+async def get_stored_games(date, sport):
+    async with async_session_scope() as session:
+        result = await session.execute(games_on_date_query(date, sport))
+        games = result.scalars().all()
         games_list = [
             Game(
                 id=game.id,
@@ -128,9 +207,37 @@ def get_games_by_date(date, sport, api_sport_param):
                 awayTeam=game.away_team,
                 time=game.time.strftime("%Y-%m-%d %H:%M"),
                 homeOdds=game.home_odds,
-                awayOdds=game.away_odds
+                awayOdds=game.away_odds,
+                bestLines=BestLines.model_validate(game.best_lines) if game.best_lines else None
             )
             for game in games
         ]
-        session.close()
-        return GamesResponse(list=games_list)
+    return GamesResponse(list=games_list)
+
+def get_games_cache_stats():
+    return games_cache.get_stats()
+
+def get_odds_refresh_stats():
+    return {**odds_refreshes.get_stats(), 'stale_served': _stale_served}
+
+async def get_games_by_date(date, sport, api_sport_param):
+    global _stale_served
+
+    # The background refresher keeps stored odds fresh; requests only read them
+    if ODDS_REFRESH_ENABLED:
+        return await get_stored_games(date, sport)
+
+    if await is_data_expired(sport):
+        # Another request is already refreshing this sport: serve what is stored
+        # for the date rather than queueing behind the Odds API call
+        if odds_refreshes.in_flight(sport):
+            stale = await get_stored_games(date, sport)
+            if stale.list:
+                _stale_served += 1
+                return stale
+
+        games = await odds_refreshes.do(sport, lambda: refresh_odds(sport, api_sport_param))
+        games_for_date = [game for game in games if game.time.split(" ")[0] == date.strftime("%Y-%m-%d")]
+        return GamesResponse(list=games_for_date)
+    else:
+        return await get_stored_games(date, sport)
@@ -0,0 +1,492 @@
+"""
+In-memory MLB League Index
+
+The MLB dataset is small (30 teams, a few thousand games a season), so the API
+keeps all of it in memory as columnar numpy arrays: each team's results in date
+order, each team's offensive and defensive stat history, and a team-by-team
+matrix of head-to-head meetings. Analytics read team form, stat lines and
+head-to-head records from here with no database access.
+
+The index is loaded at startup and reloaded in the background whenever the
+MLB data version (bumped by the nightly data update) changes. Each load builds
+a new immutable LeagueData that replaces the old one in a single assignment,
+so requests always see one consistent version.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.src.config import LEAGUE_INDEX_POLL_INTERVAL
+from api.src.models.tables import DataVersion
+from machine_learning.data.models.mlb_models import MLBDefensiveStats, MLBOffensiveStats, MLBSchedule, MLBTeam
+from shared.database import async_session_scope
+
+logger = logging.getLogger(__name__)
+
+# DataVersion name bumped by update_mlb_data.py
+MLB_DATASET = 'mlb'
+
+OFFENSIVE_COLUMNS = ('team_batting_average', 'runs_scored', 'home_runs', 'on_base_percentage', 'slugging_percentage')
+DEFENSIVE_COLUMNS = ('team_era', 'runs_allowed', 'whip', 'strikeouts', 'avg_against')
+
+
+class TeamRecord(NamedTuple):
+    """A team's identity and season record."""
+    id: int
+    name: str
+    winning_percentage: Optional[float]
+
+
+class TeamForm(NamedTuple):
+    """
+    A team's rolling form before a date, with the same fields as MLBTeamState.
+
+    Rolling values are None until the team has played a full window.
+    """
+    date: date
+    games_played: int
+    rolling_win_pct: Optional[float]
+    rolling_runs_scored: Optional[float]
+    rolling_runs_allowed: Optional[float]
+
+
+class OffensiveLine(NamedTuple):
+    """An offensive stats row with the same fields as MLBOffensiveStats."""
+    date: date
+    team_batting_average: Optional[float]
+    runs_scored: Optional[float]
+    home_runs: Optional[float]
+    on_base_percentage: Optional[float]
+    slugging_percentage: Optional[float]
+
+
+class DefensiveLine(NamedTuple):
+    """A defensive stats row with the same fields as MLBDefensiveStats."""
+    date: date
+    team_era: Optional[float]
+    runs_allowed: Optional[float]
+    whip: Optional[float]
+    strikeouts: Optional[float]
+    avg_against: Optional[float]
+
+
+class TeamResults(NamedTuple):
+    """A team's final games in date order, one array element per game."""
+    dates: np.ndarray  # datetime64[D]
+    opponents: np.ndarray  # opponent team IDs
+    runs_scored: np.ndarray
+    runs_allowed: np.ndarray
+
+
+class StatHistory(NamedTuple):
+    """A team's stat rows in date order."""
+    dates: np.ndarray  # datetime64[D]
+    values: np.ndarray  # one row per date, one column per stat
+
+
+def _day(value) -> np.datetime64:
+    """Convert a date or datetime to a numpy day."""
+    return np.datetime64(value.date() if isinstance(value, datetime) else value, 'D')
+
+
+def _optional(value) -> Optional[float]:
+    """Convert a stored float back to a Python value, with NaN as None."""
+    return None if np.isnan(value) else float(value)
+
+
+class LeagueData:
+    """
+    One immutable load of the MLB dataset, indexed for point-in-time lookups.
+
+    Every lookup takes a cutoff date and only sees rows a database query for
+    the same cutoff would: results strictly before it and stats on or before it.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        teams: List[TeamRecord],
+        games: List[tuple],
+        offensive_stats: List[tuple],
+        defensive_stats: List[tuple]
+    ):
+        """
+        Index the dataset.
+
+        Args:
+            version: MLB data version the rows were read at
+            teams: Team records
+            games: (date, home_team_id, away_team_id, home_score, away_score) for every final game
+            offensive_stats: (team_id, date, *OFFENSIVE_COLUMNS) rows
+            defensive_stats: (team_id, date, *DEFENSIVE_COLUMNS) rows
+        """
+        self.version = version
+        self.teams_by_name: Dict[str, TeamRecord] = {team.name: team for team in teams}
+        self.positions: Dict[int, int] = {team.id: position for position, team in enumerate(teams)}
+        self.game_count = len(games)
+
+        self.results = self._index_results(games)
+        self.offensive = self._index_stats(offensive_stats, len(OFFENSIVE_COLUMNS))
+        self.defensive = self._index_stats(defensive_stats, len(DEFENSIVE_COLUMNS))
+        self.meetings = self._index_meetings()
+
+    @classmethod
+    def load(cls, session: Session, version: int) -> 'LeagueData':
+        """
+        Read the MLB tables and index them.
+
+        Args:
+            session: Database session
+            version: MLB data version being loaded
+
+        Returns:
+            LeagueData for the current contents of the database
+        """
+        teams = [
+            TeamRecord(*row) for row in session.execute(
+                select(MLBTeam.id, MLBTeam.name, MLBTeam.winning_percentage).order_by(MLBTeam.id)
+            )
+        ]
+        games = session.execute(
+            select(
+                MLBSchedule.date,
+                MLBSchedule.home_team_id,
+                MLBSchedule.away_team_id,
+                MLBSchedule.home_score,
+                MLBSchedule.away_score
+            ).where(MLBSchedule.status == 'Final').order_by(MLBSchedule.date, MLBSchedule.id)
+        ).all()
+        offensive_stats = session.execute(
+            select(MLBOffensiveStats.team_id, MLBOffensiveStats.date,
+                   *(getattr(MLBOffensiveStats, column) for column in OFFENSIVE_COLUMNS))
+            .order_by(MLBOffensiveStats.date, MLBOffensiveStats.id)
+        ).all()
+        defensive_stats = session.execute(
+            select(MLBDefensiveStats.team_id, MLBDefensiveStats.date,
+                   *(getattr(MLBDefensiveStats, column) for column in DEFENSIVE_COLUMNS))
+            .order_by(MLBDefensiveStats.date, MLBDefensiveStats.id)
+        ).all()
+
+        return cls(version, teams, games, offensive_stats, defensive_stats)
+
+    def _index_results(self, games: List[tuple]) -> List[TeamResults]:
+        """Split date-ordered games into each team's results."""
+        dates = np.array([_day(game[0]) for game in games], dtype='datetime64[D]')
+        home = np.array([game[1] for game in games], dtype=np.int64)
+        away = np.array([game[2] for game in games], dtype=np.int64)
+        home_score = np.array([game[3] for game in games], dtype=np.float64)
+        away_score = np.array([game[4] for game in games], dtype=np.float64)
+
+        results = []
+        for team_id in self.positions:
+            at_home = np.flatnonzero(home == team_id)
+            on_road = np.flatnonzero(away == team_id)
+            # Merge back into schedule order
+            order = np.sort(np.concatenate([at_home, on_road]))
+            is_home = home[order] == team_id
+            results.append(TeamResults(
+                dates=dates[order],
+                opponents=np.where(is_home, away[order], home[order]),
+                runs_scored=np.where(is_home, home_score[order], away_score[order]),
+                runs_allowed=np.where(is_home, away_score[order], home_score[order])
+            ))
+        return results
+
+    def _index_stats(self, rows: List[tuple], width: int) -> List[StatHistory]:
+        """Group date-ordered stat rows by team."""
+        by_team: Dict[int, List[tuple]] = {team_id: [] for team_id in self.positions}
+        for row in rows:
+            if row[0] in by_team:
+                by_team[row[0]].append(row)
+
+        return [
+            StatHistory(
+                dates=np.array([_day(row[1]) for row in team_rows], dtype='datetime64[D]'),
+                values=np.array([row[2:] for row in team_rows], dtype=np.float64).reshape(len(team_rows), width)
+            )
+            for team_rows in by_team.values()
+        ]
+
+    def _index_meetings(self) -> np.ndarray:
+        """
+        Build the head-to-head matrix.
+
+        Cell [i, j] holds the positions in team i's results of its games against
+        team j, in date order.
+        """
+        size = len(self.positions)
+        meetings = np.empty((size, size), dtype=object)
+        empty = np.array([], dtype=np.int64)
+        for position, results in enumerate(self.results):
+            for opponent, opponent_position in self.positions.items():
+                games = np.flatnonzero(results.opponents == opponent)
+                meetings[position, opponent_position] = games if len(games) else empty
+        return meetings
+
+    def team(self, name: str) -> Optional[TeamRecord]:
+        """Look up a team by name."""
+        return self.teams_by_name.get(name)
+
+    def team_form(self, team_id: int, cutoff, window: int) -> Optional[TeamForm]:
+        """
+        Get a team's rolling form from its final games before a date.
+
+        Args:
+            team_id: ID of the team
+            cutoff: Only games strictly before this date are included
+            window: Number of games in the rolling window
+
+        Returns:
+            TeamForm, or None if the team has not played before the date
+        """
+        results = self.results[self.positions[team_id]]
+        played = int(np.searchsorted(results.dates, _day(cutoff), side='left'))
+        if played == 0:
+            return None
+
+        last_played = results.dates[played - 1].astype(date)
+        if played < window:
+            return TeamForm(last_played, played, None, None, None)
+
+        scored = results.runs_scored[played - window:played]
+        allowed = results.runs_allowed[played - window:played]
+        return TeamForm(
+            date=last_played,
+            games_played=played,
+            rolling_win_pct=round(float(np.mean(scored > allowed)), 3),
+            rolling_runs_scored=float(scored.mean()),
+            rolling_runs_allowed=float(allowed.mean())
+        )
+
+    def offensive_stats(self, team_id: int, cutoff) -> Optional[OffensiveLine]:
+        """Get a team's latest offensive stats on or before a date."""
+        return self._latest(self.offensive[self.positions[team_id]], cutoff, OffensiveLine)
+
+    def defensive_stats(self, team_id: int, cutoff) -> Optional[DefensiveLine]:
+        """Get a team's latest defensive stats on or before a date."""
+        return self._latest(self.defensive[self.positions[team_id]], cutoff, DefensiveLine)
+
+    def _latest(self, history: StatHistory, cutoff, line_type):
+        """Get the last stat row dated on or before a date as a line_type."""
+        row = int(np.searchsorted(history.dates, _day(cutoff), side='right')) - 1
+        if row < 0:
+            return None
+        return line_type(history.dates[row].astype(date), *(_optional(value) for value in history.values[row]))
+
+    def head_to_head(self, home_team_id: int, away_team_id: int, cutoff, window: int = 5) -> Dict[str, float]:
+        """
+        Summarize the two teams' most recent final meetings before a date.
+
+        Args:
+            home_team_id: ID of the home team in the upcoming game
+            away_team_id: ID of the away team in the upcoming game
+            cutoff: Only games strictly before this date are included
+            window: Maximum number of meetings
+
+        Returns:
+            Dictionary with home_win_pct, away_win_pct and games_played
+        """
+        position = self.positions[home_team_id]
+        results = self.results[position]
+        games = self.meetings[position, self.positions[away_team_id]]
+        before = int(np.searchsorted(results.dates[games], _day(cutoff), side='left'))
+        recent = games[max(before - window, 0):before]
+        if len(recent) == 0:
+            return {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
+
+        scored, allowed = results.runs_scored[recent], results.runs_allowed[recent]
+        return {
+            'home_win_pct': round(int(np.sum(scored > allowed)) / len(recent), 3),
+            'away_win_pct': round(int(np.sum(allowed > scored)) / len(recent), 3),
+            'games_played': len(recent)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index: array buffers plus container overhead."""
+        arrays = [array for results in self.results for array in results]
+        arrays += [array for history in self.offensive + self.defensive for array in history]
+        arrays += list(self.meetings.flat)
+        return (
+            sum(array.nbytes for array in arrays) +
+            self.meetings.nbytes +
+            sys.getsizeof(self.teams_by_name) +
+            sys.getsizeof(self.positions) +
+            sum(sys.getsizeof(team) for team in self.teams_by_name.values())
+        )
+
+
+class LeagueIndex:
+    """
+    Holds the current LeagueData and reloads it when the MLB data version changes.
+    """
+
+    def __init__(self, poll_interval: float = LEAGUE_INDEX_POLL_INTERVAL):
+        """
+        Initialize an empty index.
+
+        Args:
+            poll_interval: Seconds between data version checks
+        """
+        self.poll_interval = poll_interval
+        self.data: Optional[LeagueData] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_refresh_seconds: Optional[float] = None
+        self.last_refreshed_at: Optional[datetime] = None
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the index if the MLB data version has changed since the last load.
+
+        Failures are logged and leave the current data in place.
+
+        Args:
+            force: Reload even if the version is unchanged
+
+        Returns:
+            True if new data was loaded
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            try:
+                async with async_session_scope() as session:
+                    version = await _read_data_version(session)
+                    if not force and self.data is not None and self.data.version == version:
+                        return False
+                    data = await session.run_sync(LeagueData.load, version)
+            except Exception as e:
+                self.failure_count += 1
+                logger.error(f"League index refresh failed: {e}")
+                return False
+
+            self.data = data
+            self.refresh_count += 1
+            self.last_refresh_seconds = time.perf_counter() - started
+            self.last_refreshed_at = datetime.now()
+            logger.info(
+                f"Loaded league index version {version}: {len(data.positions)} teams, "
+                f"{data.game_count} games in {self.last_refresh_seconds:.3f}s"
+            )
+            return True
+
+    async def run(self):
+        """Check the data version forever, reloading when it changes."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.refresh()
+
+    def start(self):
+        """Start the version polling loop as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("Started league index refresher")
+
+    async def stop(self):
+        """Cancel the polling loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Stopped league index refresher")
+
+    def get_stats(self) -> Dict:
+        """
+        Get the index size and refresh counters.
+
+        Returns:
+            Dictionary with load state, data version, row counts, memory footprint,
+            last refresh duration and time, and refresh and failure counts
+        """
+        data = self.data
+        return {
+            'loaded': data is not None,
+            'polling': self._task is not None and not self._task.done(),
+            'data_version': data.version if data else None,
+            'teams': len(data.positions) if data else 0,
+            'games': data.game_count if data else 0,
+            'offensive_stats': sum(len(history.dates) for history in data.offensive) if data else 0,
+            'defensive_stats': sum(len(history.dates) for history in data.defensive) if data else 0,
+            'memory_bytes': data.nbytes if data else 0,
+            'last_refresh_seconds': self.last_refresh_seconds,
+            'last_refreshed_at': self.last_refreshed_at.isoformat() if self.last_refreshed_at else None,
+            'refreshes': self.refresh_count,
+            'failures': self.failure_count
+        }
+
+
+async def _read_data_version(session, name: str = MLB_DATASET) -> int:
+    """Read a dataset's version, 0 if it has never been bumped."""
+    return await session.scalar(select(DataVersion.version).where(DataVersion.name == name)) or 0
+
+
+async def get_mlb_data_version() -> int:
+    """
+    Get the MLB data version analytics are computed from.
+
+    This is the version held by the league index when it is loaded, so it only
+    changes once the index has reloaded; otherwise it is read from the database.
+
+    Returns:
+        MLB data version
+    """
+    data = get_league_index().data
+    if data is not None:
+        return data.version
+
+    async with async_session_scope() as session:
+        return await _read_data_version(session)
+
+
+def bump_data_version(session: Session, name: str = MLB_DATASET) -> int:
+    """
+    Increment a dataset's version so running APIs reload their in-memory copy.
+
+    Args:
+        session: Database session; the change is committed
+        name: Dataset name
+
+    Returns:
+        The new version
+    """
+    record = session.get(DataVersion, name)
+    if record is None:
+        record = DataVersion(name=name, version=0)
+        session.add(record)
+    record.version += 1
+    record.updated_at = datetime.now()
+    session.commit()
+    return record.version
+
+
+# Global index instance (singleton pattern)
+_league_index: Optional[LeagueIndex] = None
+
+
+def get_league_index() -> LeagueIndex:
+    """
+    Get the global MLB league index.
+
+    Returns:
+        LeagueIndex instance
+    """
+    global _league_index
+
+    if _league_index is None:
+        _league_index = LeagueIndex()
+
+    return _league_index
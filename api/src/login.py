@@ -2,21 +2,26 @@ from datetime import datetime, timedelta, timezone
 from typing import Union
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from api.src.config import ALGORITHM, SECRET_KEY
+from api.src.cache import TTLCache
+from api.src.config import ALGORITHM, SECRET_KEY, USER_CACHE_TTL, USER_CACHE_MAX_ENTRIES
 from api.src.models.auth import AuthenticatedUser
 from api.src.models.tables import Users
-from shared.database import connect_to_db
+from api.src.passwords import get_password_hasher
+from shared.database import async_session_scope
+from sqlalchemy import select
 import jwt
-import bcrypt
 from jwt.exceptions import InvalidTokenError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_user_by_username(username: str) -> AuthenticatedUser:
-    session = connect_to_db()
-    user = session.query(Users).filter_by(username=username).first()
-    session.close()
-    
+# Authenticated users keyed by username, so token-authenticated requests skip the users lookup
+user_cache = TTLCache('users', max_entries=USER_CACHE_MAX_ENTRIES, default_ttl=USER_CACHE_TTL)
+
+async def get_user_by_username(username: str) -> AuthenticatedUser:
+    async with async_session_scope() as session:
+        result = await session.execute(select(Users).filter_by(username=username))
+        user = result.scalars().first()
+
     if user:
         user = AuthenticatedUser(
             username=user.username,
@@ -27,6 +32,21 @@ def get_user_by_username(username: str) -> AuthenticatedUser:
         )
     return user
 
+async def get_cached_user(username: str) -> AuthenticatedUser:
+    user = user_cache.get(username)
+    if user is None:
+        generation = user_cache.generation
+        user = await get_user_by_username(username)
+        if user:
+            user_cache.set(username, user, generation=generation)
+    return user
+
+def invalidate_cached_user(username: str):
+    user_cache.invalidate(lambda key: key == username)
+
+def get_user_cache_stats():
+    return user_cache.get_stats()
+
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -50,18 +70,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except InvalidTokenError:
         raise credentials_exception
-    user = get_user_by_username(username)
+    user = await get_cached_user(username)
     if user is None:
         raise credentials_exception
     return user
 
-def authenticate_user(username: str, password: str):
-    user = get_user_by_username(username)
+async def authenticate_user(username: str, password: str):
+    user = await get_user_by_username(username)
     if not user:
         return False
     
     try:
-        if not bcrypt.checkpw(password.encode('utf-8'), user.hashed_password.encode('utf-8')):
+        if not await get_password_hasher().verify(password, user.hashed_password):
             return False
     except ValueError:
         return False
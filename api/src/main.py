@@ -1,25 +1,77 @@
 from dotenv import load_dotenv
 
-from api.src.mlb_analytics import get_mlb_game_analytics
-from api.src.models.mlb_analytics import MlbAnalyticsResponse, ModelInfoResponse
-from api.src.ml_model_service import get_mlb_model_service
+from api.src.mlb_analytics import get_mlb_game_analytics, get_mlb_models, get_mlb_model_version_service, get_mlb_slate_analytics
+from api.src.enhanced_mlb_analytics import get_analytics_cache_stats
+from api.src.models.mlb_analytics import MlbAnalyticsResponse, MlbModelListResponse, MlbSlateAnalyticsResponse, ModelInfoResponse
+from api.src.ml_model_registry import get_mlb_model_registry
+from api.src.ml_shadow import get_shadow_scorer
+from api.src.ml_model_service import get_mlb_model_service, get_mlb_model_watcher
 from api.src.models.settings import SettingsRequest, SettingsResponse
 from api.src.settings import get_user_settings, update_user_settings
 load_dotenv()
 from fastapi import FastAPI, HTTPException, Query, Depends
 from datetime import timedelta
 from fastapi.security import OAuth2PasswordRequestForm
-from api.src.config import ACCESS_TOKEN_EXPIRE_MINUTES
-from api.src.login import authenticate_user, create_access_token, get_current_user, get_user_by_username
+from api.src.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, LEAGUE_INDEX_ENABLED, ML_MODEL_WATCH_ENABLED, ML_SHADOW_MODELS, ML_WARMUP_ENABLED,
+    ODDS_REFRESH_ENABLED
+)
+from api.src.login import authenticate_user, create_access_token, get_current_user, get_user_by_username, get_user_cache_stats
 from api.src.models.auth import AuthenticatedUser, LoginResponse, RegisterRequest, RegisterResponse, User
-from api.src.games import get_games_for_sport
+from api.src.games import get_games_cache_stats, get_games_for_sport, get_odds_refresh_stats
 from api.src.models.games import GamesResponse
+from api.src.models.odds_history import OddsHistoryResponse
+from api.src.odds_history import get_odds_history
 import uvicorn
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi.middleware.cors import CORSMiddleware
 from api.src.register import register_user
+from api.src.odds_client import close_odds_client
+from api.src.passwords import PasswordHasherBusy, get_password_hasher
+from fastapi.responses import JSONResponse
+from api.src.odds_refresher import get_odds_refresher
+from api.src.league_index import get_league_index
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from shared.database import dispose_async_engines
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if ML_WARMUP_ENABLED:
+        # Runs off the event loop so the server starts meanwhile; /ready waits for it
+        warmup = asyncio.create_task(asyncio.to_thread(get_mlb_model_service().warmup))
+    if ML_MODEL_WATCH_ENABLED:
+        get_mlb_model_watcher().start()
+    if ML_SHADOW_MODELS:
+        get_shadow_scorer().start()
+    if LEAGUE_INDEX_ENABLED:
+        await get_league_index().refresh()
+        get_league_index().start()
+    if ODDS_REFRESH_ENABLED:
+        get_odds_refresher().start()
+    yield
+    if ML_SHADOW_MODELS:
+        await get_shadow_scorer().stop()
+    if ML_MODEL_WATCH_ENABLED:
+        await get_mlb_model_watcher().stop()
+    if ODDS_REFRESH_ENABLED:
+        await get_odds_refresher().stop()
+    if LEAGUE_INDEX_ENABLED:
+        await get_league_index().stop()
+    await close_odds_client()
+    await dispose_async_engines()
+    get_password_hasher().shutdown()
+    if ML_WARMUP_ENABLED:
+        # Last, so a failed warmup can't skip the cleanup above
+        try:
+            await warmup
+        except Exception as e:
+            logger.error(f"MLB model warmup failed: {e}")
+
+app = FastAPI(lifespan=lifespan)
 __all__ = ["app"]
 
 def configure(app):
@@ -31,13 +83,21 @@ def configure(app):
         allow_headers=["*"],
     )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 @app.post("/register", response_model=RegisterResponse)
 async def register(register_request: RegisterRequest):
     username = register_request.username
-    user = get_user_by_username(username)
+    user = await get_user_by_username(username)
     if user:
         raise HTTPException(status_code=403, detail="User already exists")
-    register_user(username, register_request.first_name, register_request.last_name, register_request.email, register_request.password)
+    await register_user(username, register_request.first_name, register_request.last_name, register_request.email, register_request.password)
 
     access_token = create_access_token(data={"sub": username}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     response = RegisterResponse(access_token=access_token)
@@ -45,7 +105,7 @@ async def register(register_request: RegisterRequest):
 
 @app.post("/login", response_model=LoginResponse)
 async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -58,11 +118,11 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
 
 @app.post("/settings", response_model=SettingsResponse)
 async def update_settings(settings_request: SettingsRequest, current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]):
-    return update_user_settings(settings_request)
+    return await update_user_settings(settings_request)
 
 @app.get("/settings", response_model=SettingsResponse)
 async def get_settings(current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]):
-    return get_user_settings(current_user.username)
+    return await get_user_settings(current_user.username)
 
 @app.get("/users/me", response_model=User)
 async def read_users_me(current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]):
@@ -96,19 +156,43 @@ async def nhl_games(
 ):
     return await get_games_for_sport(date, "NHL", "icehockey_nhl")
 
+@app.get("/odds/history", response_model=OddsHistoryResponse)
+async def odds_history(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    id: str = Query(..., description="Game ID")
+):
+    return await get_odds_history(id)
+
 @app.get("/analytics/mlb/game", response_model=MlbAnalyticsResponse)
 async def mlb_game_analytics(
     current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
-    id: str = Query(..., description="Game ID")
+    id: str = Query(..., description="Game ID"),
+    model: Optional[str] = Query(None, description="ML model version, from /analytics/mlb/models; defaults to the production model")
+):
+    return await get_mlb_game_analytics(id, model)
+
+@app.get("/analytics/mlb/games", response_model=MlbSlateAnalyticsResponse)
+async def mlb_slate_analytics(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    date: str = Query(..., description="Date in YYYY-MM-DD format"),
+    model: Optional[str] = Query(None, description="ML model version, from /analytics/mlb/models; defaults to the production model")
 ):
-    return await get_mlb_game_analytics(id)
+    """
+    Get analytics for every MLB game on a date.
+
+    Loads all teams on the slate with a fixed number of queries and scores
+    every game with one batched model call.
+    """
+    return await get_mlb_slate_analytics(date, model)
 
 @app.get("/analytics/mlb/model-info", response_model=ModelInfoResponse)
 async def mlb_model_info(
-    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    model: Optional[str] = Query(None, description="ML model version, from /analytics/mlb/models; defaults to the production model")
 ):
     """
-    Get information about the current ML model being used for predictions.
+    Get information about the current ML model being used for predictions,
+    or about the requested model version.
 
     Returns model metadata including:
     - Model type and version
@@ -117,11 +201,89 @@ async def mlb_model_info(
     - Feature count
     - Load status
     """
-    ml_service = get_mlb_model_service()
-    model_info = ml_service.get_model_info()
+    # The registry lookup may rescan the models directory and get_model_info
+    # loads the model on first use, so both run off the event loop
+    if model is None:
+        ml_service = get_mlb_model_service()
+    else:
+        ml_service = await asyncio.to_thread(get_mlb_model_version_service, model)
+    model_info = await asyncio.to_thread(ml_service.get_model_info)
 
     return ModelInfoResponse(**model_info)
 
+@app.get("/analytics/mlb/models", response_model=MlbModelListResponse)
+async def mlb_models(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+):
+    """
+    List the ML model versions that analytics can be requested with.
+
+    Every model in the MLB models directory is listed, with whether it is the
+    production model and whether it is currently loaded.
+    """
+    return get_mlb_models()
+
+@app.get("/metrics")
+async def metrics(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+):
+    """
+    Get runtime counters for odds refreshing and caching.
+
+    Returns:
+    - odds_refresh: leader/coalesced Odds API refreshes and stale responses served during a refresh
+    - odds_refresher: background refresher counts, quota usage and schedule
+    - games_cache: games response cache hits, misses and evictions
+    - user_cache: authenticated user cache hits, misses and evictions
+    - mlb_analytics_cache: game analytics cache hits, misses and evictions
+    - ml_model: model load and warmup timings
+    - ml_model_watcher: model file checks, hot reloads and the current model version
+    - ml_model_registry: resident model versions, their size and LRU loads and evictions
+    - ml_shadow: challenger models, rows queued, dropped and pending, and predictions recorded
+    - password_hasher: pending, completed and rejected bcrypt operations
+    """
+    return {
+        "password_hasher": get_password_hasher().get_stats(),
+        "games_cache": get_games_cache_stats(),
+        "user_cache": get_user_cache_stats(),
+        "mlb_analytics_cache": get_analytics_cache_stats(),
+        "odds_refresh": get_odds_refresh_stats(),
+        "odds_refresher": get_odds_refresher().get_stats(),
+        "ml_model": get_mlb_model_service().get_warmup_stats(),
+        "ml_model_watcher": get_mlb_model_watcher().get_stats(),
+        "ml_model_registry": get_mlb_model_registry().get_stats(),
+        "ml_shadow": get_shadow_scorer().get_stats()
+    }
+
+@app.get("/ready")
+async def ready():
+    """
+    Report whether this worker is ready to serve traffic.
+
+    Returns 503 until the startup model warmup has finished, when
+    ML_WARMUP_ENABLED is set, and 200 otherwise. The body includes the
+    model's cold-start timings (see /metrics ml_model).
+    """
+    ml_model = get_mlb_model_service().get_warmup_stats()
+    is_ready = ml_model['warmed_up'] or not ML_WARMUP_ENABLED
+    return JSONResponse(status_code=200 if is_ready else 503, content={"ready": is_ready, "ml_model": ml_model})
+
+@app.get("/admin/league-index")
+async def league_index_stats(
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+):
+    """
+    Get the state of the in-memory MLB league index.
+
+    Returns:
+    - loaded, polling and the MLB data version currently held
+    - teams, games and stat rows indexed
+    - memory_bytes: approximate memory held by the index
+    - last_refresh_seconds and last_refreshed_at: duration and time of the last reload
+    - refreshes and failures: reload counters
+    """
+    return get_league_index().get_stats()
+
 def main():
     configure(app)
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -23,6 +23,16 @@ MLB_MODEL_CONFIG = {
     "model_type": "RandomForestClassifier",  # also supported: "LogisticRegression", "XGBoostClassifier"
 }
 
+# Training scripts record model_type in metadata under these names
+MODEL_TYPE_NAMES = {
+    "random_forest": "RandomForestClassifier",
+    "logistic_regression": "LogisticRegression",
+    "xgboost": "XGBoostClassifier",
+}
+
+# Suffix of the metadata file saved next to each model
+METADATA_SUFFIX = "_metadata.json"
+
 # Model feature configuration
 MLB_REQUIRED_FEATURES = [
     'home_rolling_win_pct',
@@ -118,3 +128,28 @@ def get_model_version_string(model_config: Optional[Dict] = None) -> str:
         model_config = MLB_MODEL_CONFIG
 
     return f"{model_config['model_type']}-v{model_config['version']}"
+
+
+def model_config_from_metadata(metadata_path: Path, metadata: Dict) -> Dict:
+    """
+    Build a model configuration for a model saved by the training scripts.
+
+    Args:
+        metadata_path: Path to the model's metadata file
+        metadata: Parsed contents of the metadata file
+
+    Returns:
+        Model configuration dict in the same shape as MLB_MODEL_CONFIG
+    """
+    # e.g. mlb_predictor_v3.0-xgb_metadata.json -> mlb_predictor_v3.0-xgb
+    stem = metadata_path.name[:-len(METADATA_SUFFIX)]
+    model_name, _, stem_version = stem.rpartition("_v")
+    model_type = metadata.get("model_type", "unknown")
+
+    return {
+        "model_name": model_name or stem,
+        "version": str(metadata.get("version") or stem_version),
+        "model_file": metadata.get("model_filename") or f"{stem}.joblib",
+        "metadata_file": metadata_path.name,
+        "model_type": MODEL_TYPE_NAMES.get(model_type, model_type),
+    }
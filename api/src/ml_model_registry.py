@@ -0,0 +1,224 @@
+"""
+MLB Model Registry
+
+Indexes every model saved in the MLB models directory (one *_metadata.json per
+trained model) so a request can be scored with any of them, e.g. to compare
+versions live from one API deployment.
+
+The production model (MLB_MODEL_CONFIG) is served by the global MLModelService,
+which is warmed up and hot-reloaded as usual. Other versions get their own
+MLModelService, loaded on first use. Only the most recently used ones stay
+resident, bounded by a count and by their total size on disk, which is a
+cheap stand-in for their size in memory.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from api.src.config import (
+    ML_MODEL_REGISTRY_MAX_RESIDENT,
+    ML_MODEL_REGISTRY_MEMORY_MB,
+    ML_MODEL_REGISTRY_REFRESH_INTERVAL,
+)
+from api.src.ml_config import (
+    MLB_MODEL_CONFIG,
+    MLB_MODELS_DIR,
+    METADATA_SUFFIX,
+    get_model_version_string,
+    model_config_from_metadata,
+)
+from api.src.ml_model_service import MLModelService, get_mlb_model_service
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownModelError(KeyError):
+    """Raised when a requested model version is not in the models directory."""
+
+
+class MLModelRegistry:
+    """
+    Serves any indexed model version, keeping the most recently used loaded.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path = MLB_MODELS_DIR,
+        max_resident: int = ML_MODEL_REGISTRY_MAX_RESIDENT,
+        memory_budget_mb: int = ML_MODEL_REGISTRY_MEMORY_MB,
+        refresh_interval: float = ML_MODEL_REGISTRY_REFRESH_INTERVAL
+    ):
+        """
+        Initialize the registry. The directory is indexed on first use.
+
+        Args:
+            models_dir: Directory holding model and metadata files
+            max_resident: Most non-production models kept loaded at once
+            memory_budget_mb: Most MB of model files kept loaded at once
+            refresh_interval: Fewest seconds between rescans for unknown versions
+        """
+        self.models_dir = models_dir
+        self.max_resident = max_resident
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.refresh_interval = refresh_interval
+        self._configs: Optional[Dict[str, Dict]] = None
+        self._refreshed_at: Optional[float] = None
+        # Loaded services by version, least recently used first, with their file sizes
+        self._resident: "OrderedDict[str, MLModelService]" = OrderedDict()
+        self._resident_bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def refresh(self) -> Dict[str, Dict]:
+        """
+        Re-read the models directory.
+
+        Returns:
+            Model configuration for each indexed version
+        """
+        configs = {}
+        for metadata_path in sorted(self.models_dir.glob(f"*{METADATA_SUFFIX}")):
+            try:
+                with open(metadata_path, 'r') as f:
+                    config = model_config_from_metadata(metadata_path, json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable model metadata {metadata_path.name}: {e}")
+                continue
+            configs[config['version']] = config
+
+        self._configs = configs
+        self._refreshed_at = time.monotonic()
+        logger.info(f"Indexed {len(configs)} MLB model versions")
+        return configs
+
+    @property
+    def configs(self) -> Dict[str, Dict]:
+        """Model configuration for each indexed version."""
+        if self._configs is None:
+            return self.refresh()
+        return self._configs
+
+    def _is_production(self, config: Dict) -> bool:
+        return config['model_file'] == MLB_MODEL_CONFIG['model_file']
+
+    def get_service(self, version: str) -> MLModelService:
+        """
+        Get the model service for a version, evicting others if over budget.
+
+        The model itself loads lazily on the service's first prediction.
+
+        Args:
+            version: Model version as recorded in its metadata, e.g. "3.0-xgb"
+
+        Returns:
+            MLModelService for the version
+
+        Raises:
+            UnknownModelError: If no model with this version is in the directory, as
+                of the last scan if that was within the refresh interval
+        """
+        config = self.configs.get(version)
+        if config is None:
+            # Maybe a model trained since the last scan. Requests name any version they
+            # like, so the directory is rescanned at most once per refresh interval
+            if time.monotonic() - self._refreshed_at < self.refresh_interval:
+                raise UnknownModelError(version)
+            config = self.refresh().get(version)
+            if config is None:
+                raise UnknownModelError(version)
+
+        if self._is_production(config):
+            return get_mlb_model_service()
+
+        with self._lock:
+            service = self._resident.get(version)
+            if service is not None:
+                self._resident.move_to_end(version)
+                self.hits += 1
+                return service
+
+            service = MLModelService(model_config=config)
+            self._resident[version] = service
+            model_path = self.models_dir / config['model_file']
+            self._resident_bytes[version] = model_path.stat().st_size if model_path.exists() else 0
+            self.loads += 1
+            self._evict()
+            return service
+
+    def _evict(self):
+        """Drop least recently used services until within budget; called with the lock held."""
+        # The newest service always stays, even if it alone is over budget
+        while len(self._resident) > 1 and (
+            len(self._resident) > self.max_resident
+            or sum(self._resident_bytes.values()) > self.memory_budget_bytes
+        ):
+            version, _ = self._resident.popitem(last=False)
+            del self._resident_bytes[version]
+            self.evictions += 1
+            # Predictions already holding the service finish with it
+            logger.info(f"Evicted MLB model {version} from memory")
+
+    def list_models(self) -> List[Dict]:
+        """
+        Describe every indexed model version.
+
+        Returns:
+            One dictionary per version with its name, type, file availability,
+            whether it is the production model and whether it is resident
+        """
+        models = []
+        for version, config in self.configs.items():
+            production = self._is_production(config)
+            models.append({
+                'version': version,
+                'ml_model_name': get_model_version_string(config),
+                'ml_model_type': config['model_type'],
+                'is_available': (self.models_dir / config['model_file']).exists(),
+                'is_production': production,
+                'is_resident': get_mlb_model_service().is_loaded if production else version in self._resident
+            })
+        return models
+
+    def get_stats(self) -> Dict:
+        """
+        Get registry counters.
+
+        Returns:
+            Dictionary with indexed and resident model counts, resident file
+            bytes and budget, and service hits, loads and evictions
+        """
+        return {
+            'indexed': len(self._configs or {}),
+            'resident': list(self._resident),
+            'resident_bytes': sum(self._resident_bytes.values()),
+            'max_resident': self.max_resident,
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'hits': self.hits,
+            'loads': self.loads,
+            'evictions': self.evictions
+        }
+
+
+_mlb_model_registry: Optional[MLModelRegistry] = None
+
+
+def get_mlb_model_registry() -> MLModelRegistry:
+    """
+    Get the global MLB model registry.
+
+    Returns:
+        MLModelRegistry instance
+    """
+    global _mlb_model_registry
+
+    if _mlb_model_registry is None:
+        _mlb_model_registry = MLModelRegistry()
+
+    return _mlb_model_registry
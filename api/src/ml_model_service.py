@@ -4,11 +4,20 @@ ML Model Service
 This module provides a service for loading, caching, and serving predictions
 from trained machine learning models.
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Optional, Tuple
+import threading
+import time
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import joblib
+import numpy as np
 
+from api.src.compiled_model import CompiledEnsemble, get_compiled_path, matches_pipeline
+from api.src.config import ML_COMPILED_MAX_ROWS, ML_COMPILED_MODEL_ENABLED, ML_MODEL_WATCH_INTERVAL
 from api.src.ml_config import (
     get_model_path,
     get_metadata_path,
@@ -21,14 +30,74 @@ from api.src.ml_config import (
 
 logger = logging.getLogger(__name__)
 
+_REQUIRED_FEATURES = frozenset(MLB_REQUIRED_FEATURES)
+# Reads every required feature from a row in MLB_REQUIRED_FEATURES order in one call
+_feature_values = itemgetter(*MLB_REQUIRED_FEATURES)
+
+
+def _drop_feature_names(model):
+    """
+    Check the feature names a model was fitted with and remove them.
+
+    Models fitted on a DataFrame remember its column names and warn on every
+    call when scored with the float32 arrays predict_array builds. The columns
+    must be MLB_REQUIRED_FEATURES in order, which is the order of those arrays.
+
+    Args:
+        model: Fitted estimator or Pipeline; modified in place
+
+    Raises:
+        ValueError: If the model was fitted with other features or another order
+    """
+    names = getattr(model, 'feature_names_in_', None)
+    if names is not None and list(names) != MLB_REQUIRED_FEATURES:
+        raise ValueError(f"Model was fitted on features {list(names)}, expected MLB_REQUIRED_FEATURES in order")
+
+    # Only the first step of a pipeline sees the input columns, but any step may have been fitted on a frame
+    estimators = [model]
+    while estimators:
+        estimator = estimators.pop()
+        estimators.extend(step for _, step in getattr(estimator, 'steps', []))
+        if 'feature_names_in_' in getattr(estimator, '__dict__', {}):
+            del estimator.feature_names_in_
+
+
+class LoadedModel(NamedTuple):
+    """
+    A model and everything derived from it at load time.
+
+    Never mutated: a reload builds a new instance and swaps it in with a single
+    assignment, so a prediction that has read it sees one consistent model.
+    """
+    model: object
+    metadata: Dict
+    feature_importance: Optional[Dict[str, float]]
+    version: int
+    files: Tuple  # _file_signature() of the model, metadata and compiled files when read
+    compiled: Optional[CompiledEnsemble] = None  # Compiled arrays of a tree ensemble, if saved and matching
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """A file's (mtime_ns, size), or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 
 class MLModelService:
     """
     Service for loading and serving ML model predictions.
 
     This class handles:
-    - Lazy loading of models (loaded on first use)
+    - Lazy loading of models (loaded on first use), or eager loading and
+      warmup at startup
     - Model caching (kept in memory after first load)
+    - Hot reload when the model files change, swapping the new model in
+      atomically (see ModelWatcher)
+    - Scoring small batches with a tree ensemble's compiled arrays, when
+      saved next to the model (see compiled_model)
     - Graceful fallback when models are unavailable
     - Metadata management
     """
@@ -41,20 +110,35 @@ class MLModelService:
             model_config: Optional model configuration dict. Uses MLB_MODEL_CONFIG if not provided.
         """
         self.model_config = model_config or MLB_MODEL_CONFIG
-        self._model = None
-        self._metadata = None
-        self._is_loaded = False
+        self._current: Optional[LoadedModel] = None
         self._load_error = None
+        # Model file existence, checked once and then kept current by check_for_update
+        self._available: Optional[bool] = None
+        # Files that failed to load, so an unchanged broken file isn't retried every poll
+        self._failed_files: Optional[Tuple] = None
+        self._load_count = 0
+        self._load_lock = threading.Lock()
+        self.reload_count = 0
+        self.reload_failure_count = 0
+        self.last_reloaded_at = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.warmed_up_at = None
 
     @property
     def is_available(self) -> bool:
         """
         Check if a trained model is available.
 
+        The file is only checked on first use; afterwards the answer comes from
+        memory and is updated by check_for_update.
+
         Returns:
-            True if model file exists, False otherwise
+            True if a model is loaded or the model file exists, False otherwise
         """
-        return model_exists(self.model_config)
+        if self._available is None:
+            self._available = self.is_loaded or model_exists(self.model_config)
+        return self._available
 
     @property
     def is_loaded(self) -> bool:
@@ -64,18 +148,78 @@ class MLModelService:
         Returns:
             True if model is loaded, False otherwise
         """
-        return self._is_loaded
+        return self._current is not None
 
-    def _load_model(self) -> bool:
+    @property
+    def model_version(self) -> int:
+        """
+        Number of the currently loaded model, counting every load and reload.
+
+        Results can be cached per model version; 0 if no model is loaded.
+        """
+        current = self._current
+        return current.version if current else 0
+
+    def _files_signature(self) -> Tuple:
+        """Signatures of the model, metadata and compiled files, to detect a new model on disk."""
+        model_path = get_model_path(self.model_config)
+        return (
+            _file_signature(model_path),
+            _file_signature(get_metadata_path(self.model_config)),
+            _file_signature(get_compiled_path(model_path))
+        )
+
+    def _load_model(self, wait: bool = True) -> bool:
         """
-        Load the model and metadata from disk.
+        Load the model and metadata from disk, unless already loaded.
+
+        Args:
+            wait: Whether to wait for a load already running in another thread,
+                such as the startup warmup. Predictions pass False so a request
+                arriving meanwhile falls back to rule-based analytics instead of
+                blocking until the model is deserialized.
 
         Returns:
             True if loading successful, False otherwise
         """
-        if self._is_loaded:
+        if self._current is not None:
             return True
 
+        if not self._load_lock.acquire(blocking=wait):
+            logger.info("Model is still loading, skipping ML prediction")
+            return False
+        try:
+            if self._current is not None:
+                return True
+            return self._install(self._read_model())
+        finally:
+            self._load_lock.release()
+
+    def _install(self, loaded: Optional[LoadedModel]) -> bool:
+        """
+        Swap in a newly read model; called with the load lock held.
+
+        Args:
+            loaded: The model read by _read_model, or None if reading failed
+
+        Returns:
+            True if a model was installed
+        """
+        if loaded is None:
+            return False
+        self._current = loaded
+        self._available = True
+        return True
+
+    def _read_model(self) -> Optional[LoadedModel]:
+        """
+        Read the model and metadata from disk without touching the current model.
+
+        Returns:
+            The new LoadedModel, or None if reading failed
+        """
+        start = time.perf_counter()
+        files = self._files_signature()
         try:
             model_path = get_model_path(self.model_config)
             metadata_path = get_metadata_path(self.model_config)
@@ -83,39 +227,159 @@ class MLModelService:
             if not model_path.exists():
                 self._load_error = f"Model file not found: {model_path}"
                 logger.warning(self._load_error)
-                return False
+                return None
 
             # Load model
             logger.info(f"Loading ML model from: {model_path}")
-            self._model = joblib.load(model_path)
+            model = joblib.load(model_path)
+            _drop_feature_names(model)
 
             # Load metadata if available
             if metadata_path.exists():
                 with open(metadata_path, 'r') as f:
-                    self._metadata = json.load(f)
-                logger.info(f"Loaded model metadata: {self._metadata.get('model_type')} v{self._metadata.get('version')}")
+                    metadata = json.load(f)
+                logger.info(f"Loaded model metadata: {metadata.get('model_type')} v{metadata.get('version')}")
             else:
                 logger.warning(f"Metadata file not found: {metadata_path}")
-                self._metadata = {
+                metadata = {
                     'model_type': self.model_config['model_type'],
                     'version': self.model_config['version'],
                     'trained_date': 'unknown'
                 }
 
-            self._is_loaded = True
-            self._load_error = None
-            logger.info("Model loaded successfully")
-            return True
+            compiled = self._read_compiled(model_path, model)
+
+            # A file still being written is picked up on a later check instead
+            if self._files_signature() != files:
+                raise RuntimeError("Model files changed while loading")
+
+            self._load_count += 1
+            loaded = LoadedModel(
+                model, metadata, self._top_feature_importance(model), self._load_count, files, compiled
+            )
 
         except Exception as e:
             self._load_error = f"Failed to load model: {str(e)}"
+            self._failed_files = files
             logger.error(self._load_error, exc_info=True)
+            return None
+
+        self._load_error = None
+        self.load_seconds = time.perf_counter() - start
+        logger.info(f"Model loaded in {self.load_seconds:.3f}s")
+        return loaded
+
+    def _read_compiled(self, model_path: Path, model) -> Optional[CompiledEnsemble]:
+        """
+        Read a model's compiled arrays, if saved next to it.
+
+        The arrays are checked against the model before use, so a stale or
+        corrupt file only costs the speedup.
+
+        Args:
+            model_path: Path to the joblib model file
+            model: Pipeline loaded from model_path
+
+        Returns:
+            CompiledEnsemble, or None if disabled, missing or not matching the model
+        """
+        compiled_path = get_compiled_path(model_path)
+        if not ML_COMPILED_MODEL_ENABLED or not compiled_path.exists():
+            return None
+
+        try:
+            compiled = CompiledEnsemble.load(compiled_path)
+            if not matches_pipeline(compiled, model):
+                logger.warning(f"Compiled model {compiled_path.name} does not match {model_path.name}, ignoring it")
+                return None
+        except Exception as e:
+            logger.warning(f"Failed to load compiled model {compiled_path.name}: {str(e)}")
+            return None
+
+        logger.info(f"Loaded compiled model: {compiled.n_trees} trees")
+        return compiled
+
+    def check_for_update(self) -> bool:
+        """
+        Reload the model if its files have changed on disk.
+
+        Only stats the files unless they changed. Refreshes the cached
+        availability. Before any model is loaded there is nothing to reload:
+        the warmup or the first prediction loads the files as they are then.
+        Meant to run off the event loop, from ModelWatcher.
+
+        Returns:
+            True if a new model was swapped in
+        """
+        files = self._files_signature()
+        current = self._current
+        self._available = current is not None or files[0] is not None
+
+        if files[0] is None or files == self._failed_files:
+            return False
+        if current is None or current.files == files:
             return False
 
+        with self._load_lock:
+            # A load that finished while we waited for the lock may have read these files already
+            current = self._current
+            if current is None or current.files == self._files_signature():
+                return False
+            logger.info("Model files changed, loading the new model")
+            return self._reload()
+
+    def warmup(self) -> Dict:
+        """
+        Load the model and run one synthetic prediction.
+
+        The first real prediction otherwise pays for deserializing the model
+        and for sklearn's first-call setup. Meant to run once at startup, off
+        the event loop; warmup is finished even if no model could be loaded,
+        since predictions then fall back to rule-based analytics.
+
+        Returns:
+            The warmup stats, as returned by get_warmup_stats()
+        """
+        start = time.perf_counter()
+        if self._load_model():
+            self.predict_many([dict.fromkeys(MLB_REQUIRED_FEATURES, 0.0)])
+            self.warmup_seconds = time.perf_counter() - start
+            logger.info(
+                f"Model warmed up in {self.warmup_seconds:.3f}s (load {self.load_seconds or 0.0:.3f}s)"
+            )
+        else:
+            logger.warning(f"Model warmup skipped: {self._load_error}")
+        self.warmed_up_at = datetime.now()
+        return self.get_warmup_stats()
+
+    def get_warmup_stats(self) -> Dict:
+        """
+        Get cold-start timings for the model.
+
+        Returns:
+            Dictionary with warmed_up, loaded, compiled (whether small batches
+            are scored with compiled arrays), load_seconds (disk load),
+            warmup_seconds (load plus synthetic prediction), warmed_up_at
+            and the load error, if any
+        """
+        current = self._current
+        return {
+            'warmed_up': self.warmed_up_at is not None,
+            'loaded': current is not None,
+            'compiled': current is not None and current.compiled is not None,
+            'load_seconds': self.load_seconds,
+            'warmup_seconds': self.warmup_seconds,
+            'warmed_up_at': self.warmed_up_at.isoformat() if self.warmed_up_at else None,
+            'error': self._load_error
+        }
+
     def predict(self, features: Dict[str, float]) -> Optional[Tuple[str, float, Dict]]:
         """
         Make a prediction using the loaded model.
 
+        A one-row predict_many; callers scoring several games should call
+        predict_many directly so the model runs once for all of them.
+
         Args:
             features: Dictionary of feature names to values
 
@@ -125,77 +389,181 @@ class MLModelService:
             - win_probability: float between 0 and 1
             - metadata: dict with additional info (confidence, model_name, feature_importance, etc.)
         """
-        # Try to load model if not already loaded
-        if not self._is_loaded:
-            if not self._load_model():
-                logger.warning("Cannot make prediction: model not loaded")
-                return None
+        return self.predict_many([features])[0]
+
+    @staticmethod
+    def feature_vector(features: Dict[str, float], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Pack a feature dictionary into a float32 vector in MLB_REQUIRED_FEATURES order.
+
+        Args:
+            features: Dictionary of feature names to values; must contain every required feature
+            out: Optional preallocated float32 array of length len(MLB_REQUIRED_FEATURES) to fill
+
+        Returns:
+            The filled vector, with missing values (None or NaN) as NaN
+        """
+        if out is None:
+            out = np.empty(len(MLB_REQUIRED_FEATURES), dtype=np.float32)
+        out[:] = _feature_values(features)
+        return out
+
+    def predict_array(self, feature_matrix: np.ndarray) -> List[Tuple[str, float, Dict]]:
+        """
+        Make predictions from feature values already in MLB_REQUIRED_FEATURES order.
+
+        The predicted class is the more probable one, so the model is evaluated
+        with a single predict_proba call and predict() is never needed. Batches
+        of up to ML_COMPILED_MAX_ROWS rows use the model's compiled arrays when
+        loaded; they return the same probabilities faster.
+
+        Args:
+            feature_matrix: float32 vector of one game's features, or an
+                (n_games, len(MLB_REQUIRED_FEATURES)) matrix. NaN values are
+                replaced with 0 in place.
+
+        Returns:
+            One predict()-shaped result per row, in order
+
+        Raises:
+            RuntimeError: If the model cannot be loaded, or is still loading in another thread
+        """
+        # Read once, so a concurrent reload can't mix two models in one call
+        current = self._current
+        if current is None:
+            if not self._load_model(wait=False):
+                raise RuntimeError(self._load_error or "Model not loaded")
+            current = self._current
+
+        feature_matrix = np.atleast_2d(feature_matrix)
+        np.nan_to_num(feature_matrix, copy=False)
+
+        if current.compiled is not None and len(feature_matrix) <= ML_COMPILED_MAX_ROWS:
+            prediction_proba = current.compiled.predict_proba(feature_matrix).tolist()
+        else:
+            prediction_proba = current.model.predict_proba(feature_matrix).tolist()
+        return [
+            self._build_result(
+                home_win_prob, away_win_prob, home_win_prob > away_win_prob, current.feature_importance
+            )
+            for away_win_prob, home_win_prob in prediction_proba
+        ]
+
+    def predict_many(self, feature_rows: List[Dict[str, float]]) -> List[Optional[Tuple[str, float, Dict]]]:
+        """
+        Make predictions for many games with a single predict_proba call.
+
+        Rows are validated together: each row's keys are checked against the
+        required feature set in one set comparison, and the valid rows are
+        packed into one float32 matrix.
+
+        Args:
+            feature_rows: One dictionary of feature names to values per game
+
+        Returns:
+            One entry per row, in order, shaped like predict()'s result; None for
+            rows missing required features, or for every row if prediction fails
+        """
+        if not feature_rows:
+            return []
+
+        if not self.is_loaded:
+            if not self._load_model(wait=False):
+                logger.warning("Cannot make predictions: model not loaded")
+                return [None] * len(feature_rows)
 
+        results: List[Optional[Tuple[str, float, Dict]]] = [None] * len(feature_rows)
         try:
-            # Validate features
-            missing_features = set(MLB_REQUIRED_FEATURES) - set(features.keys())
-            if missing_features:
-                logger.warning(f"Missing required features: {missing_features}")
-                return None
+            complete = np.fromiter(
+                (features.keys() >= _REQUIRED_FEATURES for features in feature_rows),
+                dtype=bool, count=len(feature_rows)
+            )
+            for i in np.flatnonzero(~complete):
+                missing_features = _REQUIRED_FEATURES - feature_rows[i].keys()
+                logger.warning(f"Missing required features for row {i}: {set(missing_features)}")
 
-            # Prepare feature vector in correct order
-            import pandas as pd
-            feature_vector = pd.DataFrame([features])[MLB_REQUIRED_FEATURES]
-
-            # Handle any NaN values
-            feature_vector = feature_vector.fillna(0)
-
-            # Make prediction
-            prediction_proba = self._model.predict_proba(feature_vector)[0]
-            prediction = self._model.predict(feature_vector)[0]
-
-            # Extract probabilities
-            away_win_prob = prediction_proba[0]  # Class 0 = away team wins
-            home_win_prob = prediction_proba[1]  # Class 1 = home team wins
-
-            # Determine winner and probability
-            if prediction == 1:  # Home team wins
-                predicted_winner = 'home'
-                win_probability = home_win_prob
-            else:  # Away team wins
-                predicted_winner = 'away'
-                win_probability = away_win_prob
-
-            # Determine confidence level
-            confidence_margin = abs(home_win_prob - away_win_prob)
-            if confidence_margin > 0.3:
-                confidence_level = "High"
-            elif confidence_margin > 0.15:
-                confidence_level = "Medium"
-            else:
-                confidence_level = "Low"
-
-            # Get feature importances if available
-            feature_importance = None
-            if hasattr(self._model.named_steps['model'], 'feature_importances_'):
-                importances = self._model.named_steps['model'].feature_importances_
-                # Get top 5 most important features for this prediction
-                importance_dict = dict(zip(MLB_REQUIRED_FEATURES, importances))
-                sorted_features = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:5]
-                feature_importance = dict(sorted_features)
-
-            # Prepare metadata
-            metadata = {
-                'ml_model_name': get_model_version_string(self.model_config),
-                'model_confidence': confidence_level,
-                'home_win_probability': round(home_win_prob, 3),
-                'away_win_probability': round(away_win_prob, 3),
-                'confidence_margin': round(confidence_margin, 3),
-                'feature_importance': feature_importance,
-                'use_ml_prediction': win_probability >= MIN_CONFIDENCE_THRESHOLD
-            }
+            valid = np.flatnonzero(complete).tolist()
+            if not valid:
+                return results
+
+            feature_matrix = np.array([_feature_values(feature_rows[i]) for i in valid], dtype=np.float32)
+
+            for i, result in zip(valid, self.predict_array(feature_matrix)):
+                results[i] = result
 
-            return predicted_winner, round(win_probability, 3), metadata
+            return results
 
         except Exception as e:
-            logger.error(f"Prediction failed: {str(e)}", exc_info=True)
+            logger.error(f"Batch prediction failed: {str(e)}", exc_info=True)
+            return [None] * len(feature_rows)
+
+    def _top_feature_importance(self, model) -> Optional[Dict[str, float]]:
+        """
+        Get a model's five most important features.
+
+        Called once per model load; predictions reuse the stored result.
+
+        Args:
+            model: Fitted pipeline with a 'model' step
+
+        Returns:
+            Mapping of feature name to importance, or None if the model has none
+        """
+        if not hasattr(model.named_steps['model'], 'feature_importances_'):
             return None
 
+        importances = model.named_steps['model'].feature_importances_
+        importance_dict = dict(zip(MLB_REQUIRED_FEATURES, importances))
+        sorted_features = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:5]
+        return dict(sorted_features)
+
+    def _build_result(
+        self,
+        home_win_prob: float,
+        away_win_prob: float,
+        home_predicted: bool,
+        feature_importance: Optional[Dict[str, float]]
+    ) -> Tuple[str, float, Dict]:
+        """
+        Turn class probabilities into a prediction tuple.
+
+        Args:
+            home_win_prob: Probability of class 1 (home team wins)
+            away_win_prob: Probability of class 0 (away team wins)
+            home_predicted: Whether the model predicts the home team
+            feature_importance: Top feature importances of the model that made the prediction
+
+        Returns:
+            Tuple of (predicted_winner, win_probability, metadata)
+        """
+        if home_predicted:
+            predicted_winner = 'home'
+            win_probability = home_win_prob
+        else:
+            predicted_winner = 'away'
+            win_probability = away_win_prob
+
+        # Determine confidence level
+        confidence_margin = abs(home_win_prob - away_win_prob)
+        if confidence_margin > 0.3:
+            confidence_level = "High"
+        elif confidence_margin > 0.15:
+            confidence_level = "Medium"
+        else:
+            confidence_level = "Low"
+
+        metadata = {
+            'ml_model_name': get_model_version_string(self.model_config),
+            'model_confidence': confidence_level,
+            'home_win_probability': round(home_win_prob, 3),
+            'away_win_probability': round(away_win_prob, 3),
+            'confidence_margin': round(confidence_margin, 3),
+            'feature_importance': feature_importance,
+            'use_ml_prediction': win_probability >= MIN_CONFIDENCE_THRESHOLD
+        }
+
+        return predicted_winner, round(win_probability, 3), metadata
+
     def get_model_info(self) -> Dict:
         """
         Get information about the current model.
@@ -203,18 +571,19 @@ class MLModelService:
         Returns:
             Dictionary containing model metadata
         """
-        if not self._is_loaded:
-            self._load_model()
+        self._load_model()
+        current = self._current
 
-        if self._metadata:
+        if current is not None:
+            metadata = current.metadata
             return {
                 'ml_model_name': get_model_version_string(self.model_config),
-                'ml_model_type': self._metadata.get('model_type', 'unknown'),
-                'version': self._metadata.get('version', 'unknown'),
-                'trained_date': self._metadata.get('trained_date', 'unknown'),
-                'metrics': self._metadata.get('metrics', {}),
-                'features_count': len(self._metadata.get('features', [])),
-                'is_loaded': self._is_loaded,
+                'ml_model_type': metadata.get('model_type', 'unknown'),
+                'version': metadata.get('version', 'unknown'),
+                'trained_date': metadata.get('trained_date', 'unknown'),
+                'metrics': metadata.get('metrics', {}),
+                'features_count': len(metadata.get('features', [])),
+                'is_loaded': True,
                 'is_available': self.is_available
             }
         else:
@@ -232,18 +601,100 @@ class MLModelService:
         """
         Force reload the model from disk.
 
-        Useful for updating to a new model version without restarting the service.
+        The new model is read in full before it replaces the current one, so
+        predictions keep using the current model meanwhile and if the reload fails.
 
         Returns:
             True if reload successful, False otherwise
         """
         logger.info("Forcing model reload...")
-        self._model = None
-        self._metadata = None
-        self._is_loaded = False
-        self._load_error = None
+        with self._load_lock:
+            return self._reload()
+
+    def _reload(self) -> bool:
+        """Read and swap in the model, counting the reload; called with the load lock held."""
+        reloaded = self._install(self._read_model())
+        if reloaded:
+            self.reload_count += 1
+            self.last_reloaded_at = datetime.now()
+        else:
+            self.reload_failure_count += 1
+        return reloaded
+
+
+class ModelWatcher:
+    """
+    Polls a model service's files and hot-reloads the model when they change.
+    """
+
+    def __init__(self, service: MLModelService, poll_interval: float = ML_MODEL_WATCH_INTERVAL):
+        """
+        Initialize the watcher.
+
+        Args:
+            service: Model service to keep up to date
+            poll_interval: Seconds between file checks
+        """
+        self.service = service
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self.check_count = 0
+
+    async def check(self) -> bool:
+        """
+        Check the model files once, loading a new model in a worker thread.
 
-        return self._load_model()
+        Returns:
+            True if a new model was swapped in
+        """
+        self.check_count += 1
+        try:
+            return await asyncio.to_thread(self.service.check_for_update)
+        except Exception as e:
+            logger.error(f"Model file check failed: {e}")
+            return False
+
+    async def run(self):
+        """Check the model files every poll interval, forever."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.check()
+
+    def start(self):
+        """Start the polling loop as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("Started model watcher")
+
+    async def stop(self):
+        """Cancel the polling loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Stopped model watcher")
+
+    def get_stats(self) -> Dict:
+        """
+        Get the watcher's counters and the model it is serving.
+
+        Returns:
+            Dictionary with polling state, check count, current model version,
+            reload and reload failure counts and the last reload time
+        """
+        service = self.service
+        return {
+            'polling': self._task is not None and not self._task.done(),
+            'poll_interval': self.poll_interval,
+            'checks': self.check_count,
+            'model_version': service.model_version,
+            'reloads': service.reload_count,
+            'reload_failures': service.reload_failure_count,
+            'last_reloaded_at': service.last_reloaded_at.isoformat() if service.last_reloaded_at else None
+        }
 
 
 # Global singleton instance for the MLB model service
@@ -267,3 +718,21 @@ def get_mlb_model_service() -> MLModelService:
         logger.info("Initialized MLB model service")
 
     return _mlb_model_service
+
+
+_mlb_model_watcher: Optional[ModelWatcher] = None
+
+
+def get_mlb_model_watcher() -> ModelWatcher:
+    """
+    Get the global watcher for the MLB model service.
+
+    Returns:
+        ModelWatcher instance
+    """
+    global _mlb_model_watcher
+
+    if _mlb_model_watcher is None:
+        _mlb_model_watcher = ModelWatcher(get_mlb_model_service())
+
+    return _mlb_model_watcher
@@ -0,0 +1,236 @@
+"""
+Shadow Scoring of Challenger Models
+
+Scores the feature rows of live MLB analytics requests with challenger model
+versions from the model registry, without touching the request path: analytics
+hand each row to the ShadowScorer after the production prediction, and a
+background task scores queued rows in batches and records the predictions to
+ml_shadow_predictions for later comparison with final results.
+
+A game is queued again only when its feature row changes, e.g. after an MLB
+data update, so how often it is requested doesn't change how many predictions
+it gets. The rows seen are kept in memory, so a restart can record a game's
+unchanged prediction again: comparisons should take the latest row per game
+and model version made before the game started.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from api.src.config import ML_SHADOW_BATCH_SIZE, ML_SHADOW_FLUSH_INTERVAL, ML_SHADOW_MAX_PENDING, ML_SHADOW_MODELS
+from api.src.ml_model_registry import UnknownModelError, get_mlb_model_registry
+from api.src.models.tables import MLShadowPrediction
+from shared.database import async_session_scope
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowGame(NamedTuple):
+    """The game a feature row was built for, as recorded with shadow predictions."""
+    game_id: str
+    game_time: datetime
+    home_team_id: int
+    away_team_id: int
+
+
+class ShadowScorer:
+    """
+    Background worker that scores queued feature rows with challenger models.
+    """
+
+    def __init__(
+        self,
+        models: List[str] = ML_SHADOW_MODELS,
+        batch_size: int = ML_SHADOW_BATCH_SIZE,
+        flush_interval: float = ML_SHADOW_FLUSH_INTERVAL,
+        max_pending: int = ML_SHADOW_MAX_PENDING
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            models: Model versions from the model registry to score with
+            batch_size: Most rows scored per model call
+            flush_interval: Seconds between scoring passes
+            max_pending: Most rows waiting to be scored; further rows are dropped
+        """
+        self.models = models
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # (ShadowGame, feature row) pairs; deque appends and pops are thread-safe
+        self._pending = deque()
+        # Feature row last queued per game id, most recent last; as many games as rows can be pending
+        self._seen: "OrderedDict[str, str]" = OrderedDict()
+        # Analytics submit from worker threads
+        self._submit_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.queued = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.recorded = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, games: List[ShadowGame], feature_rows: List[Dict[str, float]]):
+        """
+        Queue feature rows for shadow scoring. Never raises; safe to call from worker threads.
+
+        Rows are ignored while the scorer isn't running or if the game was
+        already queued with the same features, and dropped once max_pending
+        rows are waiting.
+
+        Args:
+            games: The game each feature row was built for
+            feature_rows: Feature dictionaries passed to the production model
+        """
+        if not self.running:
+            return
+        with self._submit_lock:
+            for game, features in zip(games, feature_rows):
+                fingerprint = repr(sorted(features.items()))
+                if self._seen.get(game.game_id) == fingerprint:
+                    self.duplicates += 1
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    continue
+                self._pending.append((game, features))
+                self.queued += 1
+                self._seen[game.game_id] = fingerprint
+                self._seen.move_to_end(game.game_id)
+                if len(self._seen) > self.max_pending:
+                    self._seen.popitem(last=False)
+
+    def _score(self, batch: List) -> List[MLShadowPrediction]:
+        """
+        Score a batch with every challenger model.
+
+        Args:
+            batch: (ShadowGame, feature row) pairs
+
+        Returns:
+            One prediction row per model and successfully scored feature row
+        """
+        feature_rows = [features for _, features in batch]
+        scored_at = datetime.now()
+        predictions = []
+        for version in self.models:
+            try:
+                service = get_mlb_model_registry().get_service(version)
+                # Unlike requests, shadow scoring can wait for a load already in progress
+                service._load_model()
+                results = service.predict_many(feature_rows)
+            except UnknownModelError:
+                logger.warning(f"Shadow model {version} is not in the model registry")
+                self.failures += 1
+                continue
+
+            for (game, _), result in zip(batch, results):
+                if result is None:
+                    continue
+                metadata = result[2]
+                predictions.append(MLShadowPrediction(
+                    game_id=game.game_id,
+                    game_time=game.game_time,
+                    home_team_id=game.home_team_id,
+                    away_team_id=game.away_team_id,
+                    model_version=version,
+                    ml_model_name=metadata['ml_model_name'],
+                    home_win_probability=metadata['home_win_probability'],
+                    scored_at=scored_at
+                ))
+        return predictions
+
+    async def flush(self) -> int:
+        """
+        Score and record every pending row, a batch at a time.
+
+        Returns:
+            Number of predictions recorded
+        """
+        recorded = 0
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            try:
+                # Model loads and scoring run in a worker thread, off the event loop
+                predictions = await asyncio.to_thread(self._score, batch)
+                if predictions:
+                    async with async_session_scope() as session:
+                        session.add_all(predictions)
+                        await session.commit()
+            except Exception as e:
+                logger.error(f"Shadow scoring failed for {len(batch)} rows: {e}")
+                self.failures += 1
+                continue
+            recorded += len(predictions)
+        self.recorded += recorded
+        return recorded
+
+    async def run(self):
+        """Score pending rows every flush interval, forever."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        """Start the scoring loop as a background task."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+            logger.info(f"Started shadow scoring with models: {', '.join(self.models)}")
+
+    async def stop(self):
+        """Cancel the scoring loop, then score what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.flush()
+            logger.info("Stopped shadow scoring")
+
+    def get_stats(self) -> Dict:
+        """
+        Get shadow scoring counters.
+
+        Returns:
+            Dictionary with the challenger models, rows queued, skipped as
+            duplicates, dropped and pending, predictions recorded and failed batches
+        """
+        return {
+            'running': self.running,
+            'models': self.models,
+            'queued': self.queued,
+            'duplicates': self.duplicates,
+            'dropped': self.dropped,
+            'pending': len(self._pending),
+            'recorded': self.recorded,
+            'failures': self.failures
+        }
+
+
+_shadow_scorer: Optional[ShadowScorer] = None
+
+
+def get_shadow_scorer() -> ShadowScorer:
+    """
+    Get the global shadow scorer.
+
+    Returns:
+        ShadowScorer instance
+    """
+    global _shadow_scorer
+
+    if _shadow_scorer is None:
+        _shadow_scorer = ShadowScorer()
+
+    return _shadow_scorer
@@ -1,8 +1,22 @@
-from api.src.models.mlb_analytics import MlbAnalyticsResponse
-from api.src.enhanced_mlb_analytics import get_enhanced_mlb_game_analytics
+from datetime import datetime
+from typing import Optional
 
+from fastapi import HTTPException
 
-async def get_mlb_game_analytics(game_id: str):
+from api.src.models.mlb_analytics import MlbAnalyticsResponse, MlbModelListResponse, MlbSlateAnalyticsResponse
+from api.src.enhanced_mlb_analytics import get_enhanced_mlb_game_analytics, get_enhanced_mlb_slate_analytics, get_ml_service
+from api.src.ml_model_registry import UnknownModelError, get_mlb_model_registry
+from api.src.ml_model_service import MLModelService
+
+
+def _unknown_model(model_version: str) -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail=f"Unknown model version: {model_version}. See /analytics/mlb/models for available versions."
+    )
+
+
+async def get_mlb_game_analytics(game_id: str, model_version: Optional[str] = None):
     """
     Get MLB game analytics using the enhanced analytics service.
     
@@ -14,8 +28,69 @@ async def get_mlb_game_analytics(game_id: str):
     
     Args:
         game_id: ID of the game to analyze
+        model_version: Version of the ML model to use, or None for the production model
         
     Returns:
         Enhanced MlbAnalyticsResponse with detailed insights
+
+    Raises:
+        HTTPException: 404 if the model version is unknown
+    """
+    try:
+        return await get_enhanced_mlb_game_analytics(game_id, model_version)
+    except UnknownModelError:
+        raise _unknown_model(model_version)
+
+
+async def get_mlb_slate_analytics(date: str, model_version: Optional[str] = None) -> MlbSlateAnalyticsResponse:
+    """
+    Get MLB analytics for every game on a date in one pass.
+
+    Args:
+        date: Date in YYYY-MM-DD format
+        model_version: Version of the ML model to use, or None for the production model
+
+    Returns:
+        MlbSlateAnalyticsResponse with one analytics entry per game
+
+    Raises:
+        HTTPException: 400 if the date is not in YYYY-MM-DD format, 404 if the model version is unknown
+    """
+    try:
+        parsed_date = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format. Please use YYYY-MM-DD format. Error: {str(e)}")
+
+    try:
+        return await get_enhanced_mlb_slate_analytics(parsed_date, model_version)
+    except UnknownModelError:
+        raise _unknown_model(model_version)
+
+
+def get_mlb_model_version_service(model_version: str) -> MLModelService:
+    """
+    Get the model service for a model version from the model registry.
+
+    Args:
+        model_version: Version of the ML model
+
+    Returns:
+        MLModelService for the version
+
+    Raises:
+        HTTPException: 404 if the model version is unknown
+    """
+    try:
+        return get_ml_service(model_version)
+    except UnknownModelError:
+        raise _unknown_model(model_version)
+
+
+def get_mlb_models() -> MlbModelListResponse:
+    """
+    List every MLB model version that can be requested.
+
+    Returns:
+        MlbModelListResponse with one entry per model version
     """
-    return await get_enhanced_mlb_game_analytics(game_id)
\ No newline at end of file
+    return MlbModelListResponse(list=get_mlb_model_registry().list_models())
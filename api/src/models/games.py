@@ -1,5 +1,19 @@
+from typing import Optional
 from pydantic import BaseModel
 
+class BestLine(BaseModel):
+    odds: str
+    bookmaker: str
+    point: Optional[float] = None
+
+class BestLines(BaseModel):
+    home: Optional[BestLine] = None
+    away: Optional[BestLine] = None
+    homeSpread: Optional[BestLine] = None
+    awaySpread: Optional[BestLine] = None
+    over: Optional[BestLine] = None
+    under: Optional[BestLine] = None
+
 class Game(BaseModel):
     id: str
     sport: str
@@ -8,6 +22,7 @@ class Game(BaseModel):
     time: str
     homeOdds: str
     awayOdds: str
+    bestLines: Optional[BestLines] = None
 
 class GamesResponse(BaseModel):
     list: list[Game]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import List, Optional, Dict
 
 class TeamAnalytics(BaseModel):
     """Analytics for a single team"""
@@ -32,6 +32,11 @@ class MlbAnalyticsResponse(BaseModel):
     prediction_method: Optional[str] = None  # "machine_learning" or "rule_based"
     feature_importance: Optional[Dict[str, float]] = None
 
+class MlbSlateAnalyticsResponse(BaseModel):
+    """Response model for /analytics/mlb/games endpoint"""
+    date: str
+    list: List[MlbAnalyticsResponse]
+
 class ModelInfoResponse(BaseModel):
     """Response model for /analytics/mlb/model-info endpoint"""
     ml_model_name: str
@@ -43,3 +48,16 @@ class ModelInfoResponse(BaseModel):
     metrics: Optional[Dict] = None
     features_count: Optional[int] = None
     error: Optional[str] = None
+
+class MlbModelVersion(BaseModel):
+    """A model version that analytics can be requested with"""
+    version: str
+    ml_model_name: str
+    ml_model_type: str
+    is_available: bool
+    is_production: bool
+    is_resident: bool
+
+class MlbModelListResponse(BaseModel):
+    """Response model for /analytics/mlb/models endpoint"""
+    list: List[MlbModelVersion]
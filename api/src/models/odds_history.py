@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class OddsSnapshot(BaseModel):
+    capturedAt: str
+    homeOdds: Optional[int] = None
+    awayOdds: Optional[int] = None
+    homeProbability: Optional[float] = None
+    awayProbability: Optional[float] = None
+
+class OddsHistoryResponse(BaseModel):
+    id: str
+    list: list[OddsSnapshot]
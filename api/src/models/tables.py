@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, DateTime, LargeBinary
+from sqlalchemy import Boolean, Column, String, DateTime, Float, Index, Integer, JSON, LargeBinary
 
 from shared.database import Base
 
@@ -12,8 +12,23 @@ class Odds(Base):
     away_odds = Column(String)
     home_team = Column(String)
     away_team = Column(String)
+    best_lines = Column(JSON)
     expires = Column(DateTime)
 
+    __table_args__ = (
+        Index('ix_odds_sport_time', 'sport', 'time'),
+        Index('ix_odds_sport_expires', 'sport', 'expires'),
+    )
+
+class OddsHistory(Base):
+    """Append-only line snapshots; the (game_id, captured_at) key doubles as the range-scan index."""
+    __tablename__ = 'odds_history'
+
+    game_id = Column(String, primary_key=True)
+    captured_at = Column(DateTime, primary_key=True)
+    home_odds = Column(Integer)
+    away_odds = Column(Integer)
+
 class Users(Base):
     __tablename__ = 'users'
 
@@ -23,3 +38,35 @@ class Users(Base):
     email = Column(String)
     password = Column(LargeBinary)
     email_notifications_enabled = Column(Boolean, default=False)
+
+class DataVersion(Base):
+    """Counter bumped whenever a dataset is reloaded, so in-memory copies know to refresh."""
+    __tablename__ = 'data_versions'
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+class MLShadowPrediction(Base):
+    """
+    A challenger model's prediction for a game served with the production model.
+
+    Team ids and the game date match mlb_schedule, so predictions can be joined
+    with final results to compare model accuracy.
+    """
+    __tablename__ = 'ml_shadow_predictions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    game_id = Column(String, nullable=False)
+    game_time = Column(DateTime, nullable=False)
+    home_team_id = Column(Integer, nullable=False)
+    away_team_id = Column(Integer, nullable=False)
+    model_version = Column(String, nullable=False)
+    ml_model_name = Column(String)
+    home_win_probability = Column(Float, nullable=False)
+    scored_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('ix_ml_shadow_predictions_model_version_game_time', 'model_version', 'game_time'),
+        Index('ix_ml_shadow_predictions_game_id', 'game_id'),
+    )
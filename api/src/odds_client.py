@@ -0,0 +1,184 @@
+"""
+Odds API HTTP Client
+
+A shared, non-blocking client for The Odds API. Connections are kept alive and
+reused across requests, responses are requested gzip-compressed, every call is
+bounded by a timeout, and transient failures (network errors, 429 and 5xx
+responses) are retried with exponential backoff.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+import httpx
+
+from api.src.config import (
+    ODDS_API_URL,
+    ODDS_API_TIMEOUT,
+    ODDS_API_MAX_RETRIES,
+    ODDS_API_BACKOFF,
+    ODDS_API_MAX_BACKOFF,
+    ODDS_API_MAX_CONNECTIONS
+)
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and upstream/server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class OddsApiClient:
+    """
+    Async client for The Odds API backed by a pooled httpx.AsyncClient.
+
+    The underlying httpx client is created lazily on first use and recreated if
+    the running event loop changes, since pooled connections belong to the loop
+    that opened them.
+    """
+
+    def __init__(
+        self,
+        url_template: Optional[str] = None,
+        timeout: float = ODDS_API_TIMEOUT,
+        max_retries: int = ODDS_API_MAX_RETRIES,
+        backoff: float = ODDS_API_BACKOFF,
+        max_backoff: float = ODDS_API_MAX_BACKOFF,
+        max_connections: int = ODDS_API_MAX_CONNECTIONS
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url_template: Odds endpoint URL with a {sport} placeholder. Uses ODDS_API_URL if not provided.
+            timeout: Per-request timeout in seconds (connect, read, write and pool)
+            max_retries: Number of retries after the first attempt for transient failures
+            backoff: Base delay in seconds; attempt n waits backoff * 2**n
+            max_backoff: Longest delay in seconds between attempts, whatever the server asks for
+            max_connections: Maximum pooled connections (all kept alive between requests)
+        """
+        self.url_template = url_template or ODDS_API_URL
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_connections = max_connections
+        self.requests_remaining: Optional[int] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled httpx client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                headers={'Accept-Encoding': 'gzip'}
+            )
+            self._loop = loop
+        return self._client
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        A numeric Retry-After header on the response takes precedence over the
+        exponential backoff. Either is capped at max_backoff.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            response: Failed response, if the server answered
+
+        Returns:
+            Delay in seconds
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+    async def get_odds(self, sport: str) -> Any:
+        """
+        Fetch current odds for a sport.
+
+        Args:
+            sport: Odds API sport key (e.g., 'baseball_mlb')
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status (after retries for transient ones)
+            httpx.TransportError: If the request still fails after all retries
+        """
+        url = self.url_template.format(sport=sport)
+        client = self._get_client()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.get(url)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Odds API request for {sport} failed ({e!r}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"Odds API returned {response.status_code} for {sport}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            # The Odds API reports the account's remaining request quota on every response
+            remaining = response.headers.get('x-requests-remaining')
+            if remaining is not None and remaining.isdigit():
+                self.requests_remaining = int(remaining)
+
+            response.raise_for_status()
+            return response.json()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+# Global client instance (singleton pattern)
+_odds_client: Optional[OddsApiClient] = None
+
+
+def get_odds_client() -> OddsApiClient:
+    """
+    Get the global Odds API client instance.
+
+    A single instance is shared so that connections to the Odds API stay
+    alive and are reused across requests.
+
+    Returns:
+        OddsApiClient instance
+    """
+    global _odds_client
+
+    if _odds_client is None:
+        _odds_client = OddsApiClient()
+        logger.info("Initialized Odds API client")
+
+    return _odds_client
+
+
+async def close_odds_client():
+    """Close the global Odds API client, if one was created."""
+    global _odds_client
+
+    if _odds_client is not None:
+        await _odds_client.aclose()
+        _odds_client = None
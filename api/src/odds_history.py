@@ -0,0 +1,56 @@
+from datetime import datetime
+from sqlalchemy import insert, select
+from api.src.models.odds_history import OddsHistoryResponse, OddsSnapshot
+from api.src.models.tables import Odds, OddsHistory
+from api.src.utils import implied_probability, parse_american_odds
+from shared.database import async_session_scope
+
+async def append_odds_snapshots(session, games, captured_at: datetime):
+    """
+    Append a history snapshot for every game whose line is new or has moved.
+
+    Must run before the ingest overwrites odds, since the stored line is what
+    a new snapshot is compared against. Returns the number of snapshots written.
+    """
+    result = await session.execute(
+        select(Odds.id, Odds.home_odds, Odds.away_odds).filter(Odds.id.in_([game.id for game in games]))
+    )
+    current_lines = {row.id: (row.home_odds, row.away_odds) for row in result}
+
+    snapshots = [
+        {
+            'game_id': game.id,
+            'captured_at': captured_at,
+            'home_odds': parse_american_odds(game.homeOdds),
+            'away_odds': parse_american_odds(game.awayOdds)
+        }
+        for game in games
+        if current_lines.get(game.id) != (game.homeOdds, game.awayOdds)
+    ]
+
+    if snapshots:
+        await session.execute(insert(OddsHistory).values(snapshots))
+    return len(snapshots)
+
+async def get_odds_history(game_id: str) -> OddsHistoryResponse:
+    """
+    Get a game's line movement, oldest snapshot first.
+    """
+    async with async_session_scope() as session:
+        result = await session.execute(
+            select(OddsHistory.captured_at, OddsHistory.home_odds, OddsHistory.away_odds)
+            .filter(OddsHistory.game_id == game_id)
+            .order_by(OddsHistory.captured_at)
+        )
+        snapshots = [
+            OddsSnapshot(
+                capturedAt=row.captured_at.strftime("%Y-%m-%d %H:%M:%S"),
+                homeOdds=row.home_odds,
+                awayOdds=row.away_odds,
+                homeProbability=implied_probability(row.home_odds),
+                awayProbability=implied_probability(row.away_odds)
+            )
+            for row in result
+        ]
+
+    return OddsHistoryResponse(id=game_id, list=snapshots)
@@ -0,0 +1,122 @@
+"""
+Bookmaker Line Parsing
+
+Parses an Odds API game in a single pass over its bookmakers and markets into
+compact per-market line lists, and picks the best available line for each side
+across books. Best lines are computed once at ingest and stored with the game.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from api.src.models.games import BestLine, BestLines
+from api.src.utils import format_american_odds
+
+
+class Line(NamedTuple):
+    """One bookmaker's prices for a market: (home, away) for h2h/spreads, (over, under) for totals."""
+    bookmaker: str
+    first_price: Optional[float]
+    second_price: Optional[float]
+    first_point: Optional[float] = None
+    second_point: Optional[float] = None
+
+
+def parse_game_lines(game_data: Dict, bookmakers: Iterable[str], markets: Iterable[str]) -> Dict[str, List[Line]]:
+    """
+    Collect every configured bookmaker's lines for the configured markets.
+
+    Args:
+        game_data: One game from the Odds API response
+        bookmakers: Bookmaker keys to keep (e.g., {'fanduel', 'draftkings'})
+        markets: Market keys to keep ('h2h', 'spreads', 'totals')
+
+    Returns:
+        Mapping of market key to lines, in the order bookmakers appear in the response
+    """
+    bookmakers = set(bookmakers)
+    markets = set(markets)
+    home_team = game_data['home_team']
+    away_team = game_data['away_team']
+    lines: Dict[str, List[Line]] = {}
+
+    for bookmaker in game_data.get('bookmakers', []):
+        if bookmaker['key'] not in bookmakers:
+            continue
+
+        for market in bookmaker.get('markets', []):
+            market_key = market['key']
+            if market_key not in markets:
+                continue
+
+            first = second = None
+            for outcome in market.get('outcomes', []):
+                name = outcome['name']
+                if name == home_team or name == 'Over':
+                    first = outcome
+                elif name == away_team or name == 'Under':
+                    second = outcome
+
+            lines.setdefault(market_key, []).append(Line(
+                bookmaker=bookmaker['key'],
+                first_price=first['price'] if first else None,
+                second_price=second['price'] if second else None,
+                first_point=first.get('point') if first else None,
+                second_point=second.get('point') if second else None
+            ))
+
+    return lines
+
+
+def _best(lines: List[Line], side: int, point_order: int = 0) -> Optional[BestLine]:
+    """
+    Pick the best line for one side of a market.
+
+    Args:
+        lines: Lines for the market
+        side: 0 for the first side (home/over), 1 for the second (away/under)
+        point_order: 1 if a higher point is better (spreads, unders), -1 if lower
+            is better (overs), 0 to compare on price only (h2h)
+
+    Returns:
+        Best line, or None if no book prices the side
+    """
+    candidates = [
+        (line.bookmaker, line[1 + side], line[3 + side])
+        for line in lines
+        if line[1 + side] is not None
+    ]
+    if not candidates:
+        return None
+
+    bookmaker, price, point = max(
+        candidates,
+        key=lambda c: ((c[2] or 0) * point_order, c[1])
+    )
+    return BestLine(odds=format_american_odds(price), bookmaker=bookmaker, point=point)
+
+
+def best_lines(lines: Dict[str, List[Line]]) -> BestLines:
+    """
+    Compute the best available line for each side of each market across books.
+
+    Moneylines take the highest price; spreads the most points, then price;
+    overs the lowest total and unders the highest total, then price.
+
+    Args:
+        lines: Output of parse_game_lines
+
+    Returns:
+        BestLines with None for sides no book prices
+    """
+    h2h = lines.get('h2h', [])
+    spreads = lines.get('spreads', [])
+    totals = lines.get('totals', [])
+
+    return BestLines(
+        home=_best(h2h, 0),
+        away=_best(h2h, 1),
+        homeSpread=_best(spreads, 0, point_order=1),
+        awaySpread=_best(spreads, 1, point_order=1),
+        over=_best(totals, 0, point_order=-1),
+        under=_best(totals, 1, point_order=1)
+    )
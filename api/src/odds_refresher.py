@@ -0,0 +1,216 @@
+"""
+Background Odds Refresher
+
+Keeps stored odds for every sport fresh ahead of their Odds.expires boundary,
+so request handlers only read from the database. Refreshes are spread with
+random jitter and bounded by an hourly call budget and a reserve of the Odds
+API account quota.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+from api.src.config import (
+    ODDS_REFRESH_LEAD,
+    ODDS_REFRESH_MIN_INTERVAL,
+    ODDS_REFRESH_MAX_INTERVAL,
+    ODDS_REFRESH_JITTER,
+    ODDS_REFRESH_MAX_CALLS_PER_HOUR,
+    ODDS_API_MIN_REMAINING
+)
+from api.src.games import get_next_expiry, odds_refreshes, refresh_odds
+from api.src.odds_client import get_odds_client
+
+logger = logging.getLogger(__name__)
+
+# Sport name stored on Odds rows -> Odds API sport key
+SPORTS = {
+    'NBA': 'basketball_nba',
+    'MLB': 'baseball_mlb',
+    'NFL': 'americanfootball_nfl',
+    'NHL': 'icehockey_nhl',
+}
+
+QUOTA_WINDOW = 3600
+
+
+class OddsRefresher:
+    """
+    Scheduler that refreshes each sport's odds shortly before they expire.
+    """
+
+    def __init__(
+        self,
+        sports: Dict[str, str] = SPORTS,
+        lead: float = ODDS_REFRESH_LEAD,
+        min_interval: float = ODDS_REFRESH_MIN_INTERVAL,
+        max_interval: float = ODDS_REFRESH_MAX_INTERVAL,
+        jitter: float = ODDS_REFRESH_JITTER,
+        max_calls_per_hour: int = ODDS_REFRESH_MAX_CALLS_PER_HOUR,
+        min_remaining: int = ODDS_API_MIN_REMAINING
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            sports: Mapping of sport name to Odds API sport key
+            lead: Seconds before the next expiry to refresh
+            min_interval: Minimum seconds between refreshes of one sport
+            max_interval: Maximum seconds between refreshes of one sport
+            jitter: Upper bound of random seconds added to each schedule
+            max_calls_per_hour: Odds API calls allowed per rolling hour across all sports
+            min_remaining: Account quota to keep in reserve; refreshes stop below it
+        """
+        self.sports = sports
+        self.lead = lead
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.max_calls_per_hour = max_calls_per_hour
+        self.min_remaining = min_remaining
+
+        # Monotonic time at which each sport is next due; all are due at start
+        self.next_run: Dict[str, float] = {sport: 0.0 for sport in sports}
+        self._calls = deque()
+        self._task: Optional[asyncio.Task] = None
+
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.skipped_count = 0
+
+    def _within_budget(self, now: float) -> bool:
+        """Check the hourly call budget and the remaining account quota."""
+        while self._calls and now - self._calls[0] >= QUOTA_WINDOW:
+            self._calls.popleft()
+
+        if len(self._calls) >= self.max_calls_per_hour:
+            return False
+
+        remaining = get_odds_client().requests_remaining
+        return remaining is None or remaining > self.min_remaining
+
+    async def _seconds_until_due(self, sport: str) -> float:
+        """
+        Compute how long to wait before refreshing a sport again.
+
+        Args:
+            sport: Sport name
+
+        Returns:
+            Delay in seconds, clamped to [min_interval, max_interval] plus jitter
+        """
+        next_expiry = await get_next_expiry(sport)
+        if next_expiry is None:
+            delay = self.max_interval
+        else:
+            delay = (next_expiry - datetime.now()).total_seconds() - self.lead
+
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        return delay + random.uniform(0, self.jitter)
+
+    async def refresh_sport(self, sport: str):
+        """
+        Refresh one sport if the budget allows, then schedule its next run.
+
+        The refresh goes through the same single-flight group as request
+        handlers, so it never duplicates a refresh already in progress.
+
+        Args:
+            sport: Sport name
+        """
+        now = time.monotonic()
+
+        if not self._within_budget(now):
+            self.skipped_count += 1
+            retry_at = self._calls[0] + QUOTA_WINDOW if len(self._calls) >= self.max_calls_per_hour else now + self.max_interval
+            self.next_run[sport] = retry_at + random.uniform(0, self.jitter)
+            logger.warning(f"Odds refresh for {sport} skipped: API budget exhausted")
+            return
+
+        self._calls.append(now)
+        try:
+            await odds_refreshes.do(sport, lambda: refresh_odds(sport, self.sports[sport]))
+            self.refresh_count += 1
+        except Exception as e:
+            self.failure_count += 1
+            delay = self.min_interval + random.uniform(0, self.jitter)
+            logger.error(f"Odds refresh for {sport} failed: {e}")
+        else:
+            try:
+                delay = await self._seconds_until_due(sport)
+            except Exception as e:
+                # The refresh succeeded; only the expiry lookup failed
+                delay = self.min_interval + random.uniform(0, self.jitter)
+                logger.warning(f"Could not schedule the next odds refresh for {sport} from cache expiry: {e}")
+
+        self.next_run[sport] = time.monotonic() + delay
+        logger.info(f"Next odds refresh for {sport} in {delay:.0f}s")
+
+    async def run(self):
+        """Refresh due sports forever, sleeping until the next one is due."""
+        while True:
+            now = time.monotonic()
+            for sport in [s for s, due in self.next_run.items() if due <= now]:
+                await self.refresh_sport(sport)
+
+            await asyncio.sleep(max(min(self.next_run.values()) - time.monotonic(), 1.0))
+
+    def start(self):
+        """Start the refresh loop as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info("Started background odds refresher")
+
+    async def stop(self):
+        """Cancel the refresh loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Stopped background odds refresher")
+
+    def get_stats(self) -> Dict:
+        """
+        Get refresher counters.
+
+        Returns:
+            Dictionary with refresh, failure and skip counts, calls in the current
+            quota window, remaining account quota and seconds until each sport is due
+        """
+        now = time.monotonic()
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'refreshes': self.refresh_count,
+            'failures': self.failure_count,
+            'skipped': self.skipped_count,
+            'calls_last_hour': sum(1 for t in self._calls if now - t < QUOTA_WINDOW),
+            'requests_remaining': get_odds_client().requests_remaining,
+            'next_run_in': {sport: max(due - now, 0.0) for sport, due in self.next_run.items()}
+        }
+
+
+# Global refresher instance (singleton pattern)
+_odds_refresher: Optional[OddsRefresher] = None
+
+
+def get_odds_refresher() -> OddsRefresher:
+    """
+    Get the global background odds refresher.
+
+    Returns:
+        OddsRefresher instance
+    """
+    global _odds_refresher
+
+    if _odds_refresher is None:
+        _odds_refresher = OddsRefresher()
+
+    return _odds_refresher
@@ -0,0 +1,154 @@
+"""
+Password Hashing Worker Pool
+
+bcrypt hashing and verification are deliberately slow (100-300 ms of CPU per
+call). Running them inside async handlers stalls the event loop, so they run
+on a small thread pool instead (bcrypt releases the GIL while hashing). The
+number of pending operations is bounded; once the limit is reached callers get
+PasswordHasherBusy, which the API turns into HTTP 503 with Retry-After.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Union
+
+import bcrypt
+
+from api.src.config import (
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_RETRY_AFTER
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password operations are already pending."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing is at capacity, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt operations.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        retry_after: int = PASSWORD_HASH_RETRY_AFTER
+    ):
+        """
+        Initialize the hasher.
+
+        Args:
+            workers: Number of worker threads hashing concurrently
+            max_pending: Maximum running plus queued operations before rejecting
+            retry_after: Seconds clients are told to wait when rejected
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+        self.completed_count = 0
+        self.failed_count = 0
+        self.rejected_count = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    async def _run(self, fn: Callable, *args):
+        """Run fn(*args) on the pool, rejecting when the pending limit is reached."""
+        if self._pending >= self.max_pending:
+            self.rejected_count += 1
+            logger.warning(f"Rejected password operation: {self._pending} already pending")
+            raise PasswordHasherBusy(self.retry_after)
+
+        self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self.failed_count += 1
+            raise
+        finally:
+            self._pending -= 1
+        self.completed_count += 1
+        return result
+
+    async def hash(self, password: str) -> bytes:
+        """
+        Hash a password with a fresh salt.
+
+        Args:
+            password: Plain-text password
+
+        Returns:
+            bcrypt hash
+        """
+        return await self._run(lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()))
+
+    async def verify(self, password: str, hashed_password: Union[str, bytes]) -> bool:
+        """
+        Check a password against a stored bcrypt hash.
+
+        Args:
+            password: Plain-text password
+            hashed_password: Stored hash
+
+        Returns:
+            True if the password matches
+
+        Raises:
+            ValueError: If the stored hash is malformed
+        """
+        if isinstance(hashed_password, str):
+            hashed_password = hashed_password.encode('utf-8')
+        return await self._run(lambda: bcrypt.checkpw(password.encode('utf-8'), hashed_password))
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get hasher counters.
+
+        Returns:
+            Dictionary with pending, completed, failed and rejected operation counts
+        """
+        return {
+            'pending': self._pending,
+            'completed': self.completed_count,
+            'failed': self.failed_count,
+            'rejected': self.rejected_count
+        }
+
+
+# Global hasher instance (singleton pattern)
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """
+    Get the global password hasher.
+
+    Returns:
+        PasswordHasher instance
+    """
+    global _password_hasher
+
+    if _password_hasher is None:
+        _password_hasher = PasswordHasher()
+
+    return _password_hasher
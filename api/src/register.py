@@ -1,12 +1,13 @@
+from api.src.login import invalidate_cached_user
 from api.src.models.tables import Users
-from shared.database import connect_to_db
-import bcrypt
+from shared.database import async_session_scope
+from api.src.passwords import get_password_hasher
 
-def register_user(username: str, first_name: str, last_name: str, email: str, password: str):
-    session = connect_to_db()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+async def register_user(username: str, first_name: str, last_name: str, email: str, password: str):
+    hashed = await get_password_hasher().hash(password)
     user = Users(username=username, first_name=first_name, last_name=last_name, email=email, password=hashed)
-    session.add(user)
-    session.commit()
-    session.close()
+    async with async_session_scope() as session:
+        session.add(user)
+        await session.commit()
+    invalidate_cached_user(username)
     return user
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Single-flight Call Coalescing
+
+Ensures that at most one call per key is in flight at a time. The first caller
+for a key (the leader) runs the work; callers arriving while it is running are
+coalesced onto the same task and receive its result (or exception) instead of
+repeating the work.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Per-key call coalescing for async work, with leader/coalesced counters.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the group.
+
+        Args:
+            name: Name used in log messages
+        """
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.leader_count = 0
+        self.coalesced_count = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Check whether a call for a key is currently running.
+
+        Args:
+            key: Call key
+
+        Returns:
+            True if a leader is running for the key
+        """
+        task = self._in_flight.get(key)
+        return task is not None and not task.done()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for a key, or join the call already running for it.
+
+        The work runs in its own task, so a caller that is cancelled (e.g. a
+        client disconnect) does not cancel the work other callers are waiting on.
+
+        Args:
+            key: Call key
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._in_flight.get(key)
+        if task is not None and not task.done():
+            self.coalesced_count += 1
+            logger.debug(f"{self.name}: joined in-flight call for {key}")
+        else:
+            self.leader_count += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Drop a finished task from the in-flight map."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved; it was delivered to every awaiting caller
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get call counters.
+
+        Returns:
+            Dictionary with leader, coalesced and in-flight counts
+        """
+        return {
+            'leader': self.leader_count,
+            'coalesced': self.coalesced_count,
+            'in_flight': sum(1 for task in self._in_flight.values() if not task.done())
+        }
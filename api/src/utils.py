@@ -6,4 +6,26 @@ def format_american_odds(decimal_odds):
         return f"+{underdog_odds}"
     else:
         favorite_odds = round(100 / (decimal_odds - 1))
-        return f"-{favorite_odds}"
\ No newline at end of file
+        return f"-{favorite_odds}"
+
+def parse_american_odds(formatted_odds):
+    """
+    Parse odds formatted by format_american_odds (e.g. "+150", "-200") to an integer.
+    Returns None when no line is available.
+    """
+    try:
+        return int(formatted_odds)
+    except (TypeError, ValueError):
+        return None
+
+
+def implied_probability(american_odds):
+    """
+    Convert integer American odds to the implied win probability (0-1).
+    Returns None when no line is available.
+    """
+    if not american_odds:
+        return None
+    if american_odds > 0:
+        return 100 / (american_odds + 100)
+    return -american_odds / (-american_odds + 100)
@@ -0,0 +1,122 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import api.src.models.tables  # noqa: F401 - registers the API tables on Base.metadata
+from api.src.enhanced_mlb_analytics import analytics_cache
+from api.src.login import user_cache
+from api.src.models.tables import Odds
+from shared.database import Base
+from api.tests.helpers import StubOddsServer
+from machine_learning.data.models.mlb_models import (
+    MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule
+)
+from machine_learning.data.processing.mlb_feature_store import MLBFeatureStore
+
+SLATE_DATE = datetime(2024, 6, 15)
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Start every test without cached users from earlier tests."""
+    user_cache.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    """Start every test without cached game analytics from earlier tests."""
+    analytics_cache.invalidate()
+
+
+@pytest.fixture
+def odds_stub_server():
+    """Run a local stand-in for The Odds API for the duration of a test."""
+    server = StubOddsServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+async def sqlite_async_db(tmp_path, monkeypatch):
+    """
+    Point async_session_scope() at a fresh SQLite database with the API tables created.
+
+    Yields the async session factory so tests can inspect what was written.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr('shared.database.connect_to_async_db', factory)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def mlb_slate_db(sqlite_async_db):
+    """Seed teams, two weeks of results, stats and a three-game slate on 2024-06-15."""
+    async with sqlite_async_db() as session:
+        session.add_all([
+            MLBTeam(id=1, name='Red Sox', winning_percentage=0.600),
+            MLBTeam(id=2, name='Yankees', winning_percentage=0.500),
+            MLBTeam(id=3, name='Orioles', winning_percentage=0.550),
+            MLBTeam(id=4, name='Rays', winning_percentage=0.450),
+        ])
+
+        game_number = 0
+        for day in range(1, 15):
+            for first, second in [(1, 2), (3, 4), (1, 3), (2, 4)]:
+                if (day + first) % 3 == 0:
+                    continue
+                game_number += 1
+                home, away = (first, second) if day % 2 else (second, first)
+                session.add(MLBSchedule(
+                    id=game_number, game_id=f's{game_number}', date=date(2024, 6, day),
+                    home_team_id=home, away_team_id=away,
+                    home_score=(day * first) % 7, away_score=(day * second + 1) % 6, status='Final'
+                ))
+        # Not final, and on the slate date itself: both ignored
+        session.add_all([
+            MLBSchedule(id=900, game_id='postponed', date=date(2024, 6, 14), home_team_id=1,
+                        away_team_id=2, home_score=9, away_score=0, status='Postponed'),
+            MLBSchedule(id=901, game_id='same-day', date=date(2024, 6, 15), home_team_id=1,
+                        away_team_id=2, home_score=9, away_score=0, status='Final'),
+        ])
+
+        for team_id in range(1, 5):
+            for day, offset in [(1, 0.0), (10, 0.01), (20, 0.05)]:
+                session.add(MLBOffensiveStats(
+                    team_id=team_id, date=date(2024, 6, day), team_batting_average=0.24 + team_id * 0.005 + offset,
+                    on_base_percentage=0.31 + offset, slugging_percentage=0.40 + team_id * 0.01 + offset
+                ))
+                session.add(MLBDefensiveStats(
+                    team_id=team_id, date=date(2024, 6, day), team_era=3.5 + team_id * 0.2 + offset,
+                    whip=1.2 + offset, strikeouts=150 + team_id * 10
+                ))
+
+        expires = SLATE_DATE + timedelta(days=2)
+        session.add_all([
+            Odds(id='g1', sport='MLB', time=datetime(2024, 6, 15, 19, 10), home_team='Red Sox',
+                 away_team='Yankees', home_odds='-130', away_odds='+110', expires=expires),
+            Odds(id='g2', sport='MLB', time=datetime(2024, 6, 15, 13, 5), home_team='Orioles',
+                 away_team='Rays', home_odds='-120', away_odds='+100', expires=expires),
+            Odds(id='g3', sport='MLB', time=datetime(2024, 6, 15, 20, 0), home_team='Mariners',
+                 away_team='Red Sox', home_odds='+105', away_odds='-125', expires=expires),
+            Odds(id='other-day', sport='MLB', time=datetime(2024, 6, 16, 19, 0), home_team='Yankees',
+                 away_team='Red Sox', home_odds='-110', away_odds='-110', expires=expires),
+            Odds(id='other-sport', sport='NBA', time=datetime(2024, 6, 15, 19, 0), home_team='Celtics',
+                 away_team='Knicks', home_odds='-110', away_odds='-110', expires=expires),
+        ])
+        await session.commit()
+
+    yield sqlite_async_db
+
+
+@pytest.fixture
+async def mlb_feature_store_db(mlb_slate_db):
+    """The seeded slate database with the MLB feature store built from its schedule."""
+    async with mlb_slate_db() as session:
+        await session.run_sync(MLBFeatureStore().refresh)
+
+    yield mlb_slate_db
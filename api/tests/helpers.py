@@ -0,0 +1,140 @@
+"""
+Shared test doubles for the async database layer, the Odds API and saved models.
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy import event
+
+from api.src.ml_config import MLB_REQUIRED_FEATURES
+
+
+def make_async_session(result=None):
+    """
+    Create an AsyncSession double.
+
+    execute() is awaitable and returns `result` (a MagicMock by default), so tests
+    can configure scalar(), scalars().first() and scalars().all() on it.
+    add() and add_all() stay synchronous, matching AsyncSession.
+    """
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.add_all = MagicMock()
+    session.execute.return_value = result if result is not None else MagicMock()
+    return session
+
+
+def async_session_for(sync_session):
+    """
+    Wrap a mocked synchronous Session in an AsyncSession double whose
+    run_sync() calls straight through to it.
+    """
+    session = make_async_session()
+    session.run_sync.side_effect = lambda fn, *args, **kwargs: fn(sync_session, *args, **kwargs)
+    return session
+
+
+def count_queries(session_factory):
+    """
+    Record every SQL statement executed through an async session factory's engine.
+
+    Returns the list the statements are appended to; clear() it between phases.
+    """
+    statements = []
+    event.listen(
+        session_factory.kw['bind'].sync_engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    return statements
+
+
+class StubOddsServer:
+    """
+    Local HTTP server standing in for The Odds API.
+
+    Serves JSON (gzip-compressed when the client accepts it) over HTTP/1.1 with
+    keep-alive. Tests can add a per-request delay, queue status codes for the
+    next responses, and inspect the requests and client connections it saw.
+    """
+
+    def __init__(self, body=None):
+        self.body = body if body is not None else []
+        self.delay = 0.0
+        self.statuses = []
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url_template(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v4/sports/{{sport}}/odds/?apiKey=test"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append({'path': self.path, 'headers': dict(self.headers)})
+                    stub.connections.add(self.client_address)
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+
+                if stub.delay:
+                    time.sleep(stub.delay)
+
+                payload = json.dumps(stub.body if status == 200 else {'message': 'error'}).encode('utf-8')
+                compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+                if compress:
+                    payload = gzip.compress(payload)
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if compress:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def save_model(models_dir, version, model_type='logistic_regression', model_filename=None):
+    """Save a small trained pipeline and its metadata the way the training scripts do."""
+    model_filename = model_filename or f'mlb_predictor_v{version}.joblib'
+    X = pd.DataFrame(np.random.rand(50, len(MLB_REQUIRED_FEATURES)), columns=MLB_REQUIRED_FEATURES)
+    y = np.random.randint(0, 2, 50)
+    pipeline = Pipeline([('scaler', StandardScaler()), ('model', LogisticRegression())]).fit(X, y)
+    joblib.dump(pipeline, models_dir / model_filename)
+    metadata = {'model_type': model_type, 'version': version, 'model_filename': model_filename}
+    with open(models_dir / f'mlb_predictor_v{version}_metadata.json', 'w') as f:
+        json.dump(metadata, f)
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from api.src.cache import TTLCache
+
+def test_get_returns_value_until_ttl_expires():
+    cache = TTLCache('test', default_ttl=10)
+
+    with patch('api.src.cache.time.monotonic', return_value=100.0):
+        cache.set('key', b'value')
+        assert cache.get('key') == b'value'
+
+    with patch('api.src.cache.time.monotonic', return_value=111.0):
+        assert cache.get('key') is None
+
+    assert cache.get_stats() == {'entries': 0, 'hits': 1, 'misses': 1, 'evictions': 0, 'hit_rate': 0.5}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache('test', max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.get_stats()['evictions'] == 1
+
+def test_non_positive_ttl_is_not_stored():
+    cache = TTLCache('test')
+
+    assert cache.set('key', 1, ttl=0) is False
+    assert cache.get('key') is None
+
+def test_invalidate_by_predicate():
+    cache = TTLCache('test')
+    cache.set(('NBA', '2023-08-18'), 1)
+    cache.set(('MLB', '2023-08-18'), 2)
+
+    assert cache.invalidate(lambda key: key[0] == 'NBA') == 1
+    assert cache.get(('NBA', '2023-08-18')) is None
+    assert cache.get(('MLB', '2023-08-18')) == 2
+
+def test_invalidate_all():
+    cache = TTLCache('test')
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    assert cache.invalidate() == 2
+    assert cache.get_stats()['entries'] == 0
+
+def test_set_with_stale_generation_is_dropped():
+    cache = TTLCache('test')
+    generation = cache.generation
+    cache.invalidate()
+
+    assert cache.set('key', 1, generation=generation) is False
+    assert cache.set('key', 1, generation=cache.generation) is True
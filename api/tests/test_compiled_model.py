@@ -0,0 +1,134 @@
+"""
+Tests for compiled tree-ensemble inference.
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from api.src.compiled_model import (
+    MATCH_TOLERANCE,
+    CompiledEnsemble,
+    compile_pipeline,
+    export_compiled_model,
+    get_compiled_path,
+    matches_pipeline,
+)
+
+N_FEATURES = 8
+
+
+def training_data(seed=0, rows=400):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((rows, N_FEATURES)) * 3 + 1
+    X[rng.random(X.shape) < 0.1] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + rng.standard_normal(rows) > 1).astype(int)
+    return X, y
+
+
+def scoring_rows(rows=2000):
+    X, _ = training_data(seed=1, rows=rows)
+    return X
+
+
+def pipeline(model):
+    """A pipeline shaped like train_mlb_model.py's, with nested preprocessing."""
+    X, y = training_data()
+    return Pipeline([
+        ('preprocessor', Pipeline([('imputer', SimpleImputer(strategy='mean')), ('scaler', StandardScaler())])),
+        ('model', model)
+    ]).fit(X, y)
+
+
+@pytest.mark.parametrize('model', [
+    RandomForestClassifier(n_estimators=30, max_depth=8, random_state=42),
+    ExtraTreesClassifier(n_estimators=30, random_state=42),
+], ids=['random_forest', 'extra_trees'])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_forest_matches_pipeline(model, dtype):
+    fitted = pipeline(model)
+    X = scoring_rows().astype(dtype)
+
+    compiled = compile_pipeline(fitted)
+
+    assert np.abs(compiled.predict_proba(X) - fitted.predict_proba(X)).max() <= MATCH_TOLERANCE
+
+
+def test_forest_without_imputer_routes_missing_values_like_sklearn():
+    X, y = training_data()
+    fitted = Pipeline([('model', RandomForestClassifier(n_estimators=20, random_state=42))]).fit(X, y)
+    X = scoring_rows()
+
+    compiled = compile_pipeline(fitted)
+
+    assert np.abs(compiled.predict_proba(X) - fitted.predict_proba(X)).max() <= MATCH_TOLERANCE
+
+
+def test_single_row():
+    fitted = pipeline(RandomForestClassifier(n_estimators=10, random_state=42))
+    row = scoring_rows()[0].astype(np.float32)
+
+    probabilities = compile_pipeline(fitted).predict_proba(row)
+
+    assert probabilities.shape == (1, 2)
+    assert probabilities == pytest.approx(fitted.predict_proba(row.reshape(1, -1)), abs=MATCH_TOLERANCE)
+
+
+def test_xgboost_matches_pipeline():
+    XGBClassifier = pytest.importorskip("xgboost", reason="xgboost not installed").XGBClassifier
+    fitted = pipeline(XGBClassifier(n_estimators=50, max_depth=4, random_state=42, verbosity=0))
+    X = scoring_rows()
+
+    compiled = compile_pipeline(fitted)
+
+    assert np.abs(compiled.predict_proba(X) - fitted.predict_proba(X)).max() <= MATCH_TOLERANCE
+    assert matches_pipeline(compiled, fitted)
+
+
+def test_xgboost_early_stopping_uses_best_iteration():
+    XGBClassifier = pytest.importorskip("xgboost", reason="xgboost not installed").XGBClassifier
+    X, y = training_data()
+    model = XGBClassifier(n_estimators=200, early_stopping_rounds=3, eval_metric='logloss', verbosity=0)
+    fitted = Pipeline([('scaler', StandardScaler()), ('model', model)]).fit(
+        X, y, model__eval_set=[(X[:100], 1 - y[:100])]
+    )
+    X = scoring_rows()
+
+    compiled = compile_pipeline(fitted)
+
+    assert compiled.n_trees == model.best_iteration + 1
+    assert np.abs(compiled.predict_proba(X) - fitted.predict_proba(X)).max() <= MATCH_TOLERANCE
+
+
+@pytest.mark.parametrize('steps', [
+    [('scaler', StandardScaler()), ('model', LogisticRegression())],
+    [('scaler', MinMaxScaler()), ('model', RandomForestClassifier(n_estimators=5))],
+], ids=['unsupported_model', 'unsupported_step'])
+def test_unsupported_pipelines_are_rejected(steps):
+    X, y = training_data()
+    fitted = Pipeline([('imputer', SimpleImputer())] + steps).fit(X, y)
+
+    with pytest.raises(ValueError, match='Unsupported'):
+        compile_pipeline(fitted)
+
+
+def test_export_saves_next_to_model_and_round_trips(tmp_path):
+    fitted = pipeline(RandomForestClassifier(n_estimators=10, random_state=42))
+    model_path = tmp_path / 'mlb_predictor_v1.0.joblib'
+    X = scoring_rows()
+
+    compiled_path = export_compiled_model(fitted, model_path)
+    loaded = CompiledEnsemble.load(compiled_path)
+
+    assert compiled_path == get_compiled_path(model_path) == tmp_path / 'mlb_predictor_v1.0.compiled.npz'
+    assert np.array_equal(loaded.predict_proba(X), compile_pipeline(fitted).predict_proba(X))
+
+
+def test_compiled_model_of_another_pipeline_does_not_match():
+    compiled = compile_pipeline(pipeline(RandomForestClassifier(n_estimators=10, random_state=1)))
+
+    assert not matches_pipeline(compiled, pipeline(RandomForestClassifier(n_estimators=10, random_state=2)))
@@ -2,13 +2,29 @@
 Tests for the enhanced MLB analytics service.
 """
 
+import threading
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, date
-import pandas as pd
+from datetime import datetime, date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
-from api.src.enhanced_mlb_analytics import EnhancedMLBAnalytics
+from api.src.enhanced_mlb_analytics import EnhancedMLBAnalytics, TeamSnapshot, analytics_cache, get_enhanced_mlb_game_analytics
+from api.src.league_index import TeamForm, bump_data_version
 from api.src.models.mlb_analytics import MlbAnalyticsResponse, TeamAnalytics
+from api.tests.helpers import async_session_for, count_queries
+from machine_learning.data.models.mlb_models import MLBSchedule, MLBTeam
+from machine_learning.data.processing.mlb_feature_store import MLBFeatureStore
+from shared.database import Base
+
+NO_MEETINGS = {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
+
+
+def _stub_snapshots(session, teams, pairs, cutoff):
+    """Stand-in for _load_team_snapshots: every team rested two days with a .600 rolling record."""
+    form = TeamForm(cutoff - timedelta(days=2), 10, 0.6, 4.5, 3.5)
+    return {team.id: TeamSnapshot(team, state=form) for team in teams}, {pair: NO_MEETINGS for pair in pairs}
 
 
 class TestEnhancedMLBAnalytics:
@@ -50,73 +66,18 @@ class TestEnhancedMLBAnalytics:
         stats.whip = 1.35
         return stats
     
-    def test_calculate_rolling_win_percentage_sufficient_data(self, analytics_service):
-        """Test rolling win percentage calculation with sufficient data."""
-        # Create sample games data
-        games_data = []
-        for i in range(10):  # More than rolling_window (5)
-            games_data.append({
-                'date': date.today(),
-                'home_team_id': 1,
-                'away_team_id': 2,
-                'home_score': 5 if i < 7 else 3,  # Win 7 out of 10 games
-                'away_score': 3 if i < 7 else 5
-            })
-        
-        games_df = pd.DataFrame(games_data)
-        
-        # Calculate rolling win percentage for team 1 (home team)
-        rolling_pct = analytics_service._calculate_rolling_win_percentage(games_df, 1)
-        
-        # Should be 7/10 = 0.7 for the most recent 5 games
-        assert rolling_pct is not None
-        assert isinstance(rolling_pct, float)
-    
-    def test_calculate_rolling_win_percentage_insufficient_data(self, analytics_service):
-        """Test rolling win percentage calculation with insufficient data."""
-        # Create sample games data with less than rolling_window games
-        games_data = []
-        for i in range(3):  # Less than rolling_window (5)
-            games_data.append({
-                'date': date.today(),
-                'home_team_id': 1,
-                'away_team_id': 2,
-                'home_score': 5,
-                'away_score': 3
-            })
-        
-        games_df = pd.DataFrame(games_data)
-        
-        # Calculate rolling win percentage
-        rolling_pct = analytics_service._calculate_rolling_win_percentage(games_df, 1)
-        
-        # Should return None due to insufficient data
-        assert rolling_pct is None
-    
-    def test_calculate_offensive_rating(self, analytics_service, mock_session, sample_offensive_stats):
+    def test_offensive_rating_from_stats(self, analytics_service, sample_offensive_stats):
         """Test offensive rating calculation."""
-        # Mock the database query
-        mock_session.query.return_value.filter.return_value.order_by.return_value.first.return_value = sample_offensive_stats
-        
-        # Calculate offensive rating
-        offensive_rating = analytics_service._calculate_offensive_rating(
-            mock_session, 1, datetime.now()
-        )
+        offensive_rating = analytics_service._offensive_rating_from_stats(sample_offensive_stats)
         
         # Should calculate weighted average
         expected_rating = (0.250 * 0.3 + 0.320 * 0.4 + 0.420 * 0.3)
         assert offensive_rating is not None
         assert abs(offensive_rating - expected_rating) < 0.001
     
-    def test_calculate_defensive_rating(self, analytics_service, mock_session, sample_defensive_stats):
+    def test_defensive_rating_from_stats(self, analytics_service, sample_defensive_stats):
         """Test defensive rating calculation."""
-        # Mock the database query
-        mock_session.query.return_value.filter.return_value.order_by.return_value.first.return_value = sample_defensive_stats
-        
-        # Calculate defensive rating
-        defensive_rating = analytics_service._calculate_defensive_rating(
-            mock_session, 1, datetime.now()
-        )
+        defensive_rating = analytics_service._defensive_rating_from_stats(sample_defensive_stats)
         
         # Should calculate normalized defensive metrics
         assert defensive_rating is not None
@@ -220,12 +181,12 @@ class TestEnhancedMLBAnalytics:
         assert len(key_factors) > 0
     
     @pytest.mark.asyncio
-    @patch('api.src.enhanced_mlb_analytics.connect_to_db')
+    @patch('shared.database.connect_to_async_db')
     async def test_get_enhanced_game_analytics_success(self, mock_connect, analytics_service):
         """Test successful enhanced analytics retrieval."""
         # Mock database setup
         mock_session = Mock()
-        mock_connect.return_value = mock_session
+        mock_connect.return_value = async_session_for(mock_session)
         
         # Mock game odds
         mock_game = Mock()
@@ -251,31 +212,29 @@ class TestEnhancedMLBAnalytics:
         ]
         
         # Mock the internal methods to return sample data
-        with patch.object(analytics_service, '_get_recent_team_games', return_value=pd.DataFrame()):
-            with patch.object(analytics_service, '_calculate_rolling_win_percentage', return_value=0.6):
-                with patch.object(analytics_service, '_calculate_offensive_rating', return_value=0.7):
-                    with patch.object(analytics_service, '_calculate_defensive_rating', return_value=0.6):
-                        with patch.object(analytics_service, '_calculate_days_rest', return_value=2):
-                            with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
-                                
-                                result = await analytics_service.get_enhanced_game_analytics("test_game_1")
-                                
-                                assert isinstance(result, MlbAnalyticsResponse)
-                                assert result.id == "test_game_1"
-                                assert result.home_team == "Home Team"
-                                assert result.away_team == "Away Team"
-                                assert result.home_analytics is not None
-                                assert result.away_analytics is not None
-                                assert result.key_factors is not None
-                                assert result.confidence_level is not None
-    
+        with patch.object(analytics_service, '_load_team_snapshots', side_effect=_stub_snapshots):
+            with patch.object(analytics_service, '_offensive_rating_from_stats', return_value=0.7):
+                with patch.object(analytics_service, '_defensive_rating_from_stats', return_value=0.6):
+                    with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
+                        
+                        result = await analytics_service.get_enhanced_game_analytics("test_game_1")
+                        
+                        assert isinstance(result, MlbAnalyticsResponse)
+                        assert result.id == "test_game_1"
+                        assert result.home_team == "Home Team"
+                        assert result.away_team == "Away Team"
+                        assert result.home_analytics is not None
+                        assert result.away_analytics is not None
+                        assert result.key_factors is not None
+                        assert result.confidence_level is not None
+
     @pytest.mark.asyncio
-    @patch('api.src.enhanced_mlb_analytics.connect_to_db')
+    @patch('shared.database.connect_to_async_db')
     async def test_get_enhanced_game_analytics_game_not_found(self, mock_connect, analytics_service):
         """Test enhanced analytics when game is not found."""
         # Mock database setup
         mock_session = Mock()
-        mock_connect.return_value = mock_session
+        mock_connect.return_value = async_session_for(mock_session)
 
         # Mock empty game query
         mock_session.query.return_value.filter_by.return_value.first.return_value = None
@@ -285,12 +244,12 @@ class TestEnhancedMLBAnalytics:
             await analytics_service.get_enhanced_game_analytics("test_game_not_found")
 
     @pytest.mark.asyncio
-    @patch('api.src.enhanced_mlb_analytics.connect_to_db')
+    @patch('shared.database.connect_to_async_db')
     async def test_get_enhanced_game_analytics_missing_team_data(self, mock_connect, analytics_service):
         """Test enhanced analytics when team data is missing (fallback to basic response)."""
         # Mock database setup
         mock_session = Mock()
-        mock_connect.return_value = mock_session
+        mock_connect.return_value = async_session_for(mock_session)
 
         # Mock game odds
         mock_game = Mock()
@@ -325,11 +284,6 @@ class TestEnhancedMLBAnalyticsMLIntegration:
         """Create an instance of the analytics service for testing."""
         return EnhancedMLBAnalytics(rolling_window=5)
 
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return Mock()
-
     @pytest.fixture
     def sample_ml_features(self):
         """Create sample ML features dictionary."""
@@ -362,7 +316,7 @@ class TestEnhancedMLBAnalyticsMLIntegration:
             momentum_score=0.600
         )
 
-    def test_try_ml_prediction_success(self, analytics_service, mock_session, sample_ml_features, sample_home_analytics, sample_away_analytics):
+    def test_try_ml_prediction_success(self, analytics_service, sample_ml_features, sample_home_analytics, sample_away_analytics):
         """Test successful ML prediction attempt."""
         # Mock ML service and prediction
         mock_ml_service = Mock()
@@ -381,13 +335,13 @@ class TestEnhancedMLBAnalyticsMLIntegration:
         )
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
-            with patch.object(analytics_service, '_prepare_ml_features', return_value=sample_ml_features):
+            with patch.object(analytics_service, '_features_from_snapshots', return_value=sample_ml_features):
                 result = analytics_service._try_ml_prediction(
-                    session=mock_session,
-                    home_team=Mock(id=1, name='Home Team'),
-                    away_team=Mock(id=2, name='Away Team'),
+                    home=Mock(team=Mock(id=1, name='Home Team')),
+                    away=Mock(team=Mock(id=2, name='Away Team')),
                     home_analytics=sample_home_analytics,
                     away_analytics=sample_away_analytics,
+                    h2h_stats=NO_MEETINGS,
                     game_time=datetime.now()
                 )
 
@@ -398,7 +352,7 @@ class TestEnhancedMLBAnalyticsMLIntegration:
                 assert win_prob == 0.65
                 assert metadata['ml_model_name'] == 'RandomForest-v1.0'
 
-    def test_try_ml_prediction_low_confidence(self, analytics_service, mock_session, sample_ml_features, sample_home_analytics, sample_away_analytics):
+    def test_try_ml_prediction_low_confidence(self, analytics_service, sample_ml_features, sample_home_analytics, sample_away_analytics):
         """Test ML prediction with low confidence falls back to None."""
         # Mock ML service with low confidence prediction
         mock_ml_service = Mock()
@@ -416,20 +370,20 @@ class TestEnhancedMLBAnalyticsMLIntegration:
         )
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
-            with patch.object(analytics_service, '_prepare_ml_features', return_value=sample_ml_features):
+            with patch.object(analytics_service, '_features_from_snapshots', return_value=sample_ml_features):
                 result = analytics_service._try_ml_prediction(
-                    session=mock_session,
-                    home_team=Mock(id=1, name='Home Team'),
-                    away_team=Mock(id=2, name='Away Team'),
+                    home=Mock(team=Mock(id=1, name='Home Team')),
+                    away=Mock(team=Mock(id=2, name='Away Team')),
                     home_analytics=sample_home_analytics,
                     away_analytics=sample_away_analytics,
+                    h2h_stats=NO_MEETINGS,
                     game_time=datetime.now()
                 )
 
                 # Should return None due to low confidence
                 assert result is None
 
-    def test_try_ml_prediction_model_unavailable(self, analytics_service, mock_session, sample_home_analytics, sample_away_analytics):
+    def test_try_ml_prediction_model_unavailable(self, analytics_service, sample_home_analytics, sample_away_analytics):
         """Test ML prediction when model is unavailable."""
         # Mock ML service that is not available
         mock_ml_service = Mock()
@@ -437,41 +391,42 @@ class TestEnhancedMLBAnalyticsMLIntegration:
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
             result = analytics_service._try_ml_prediction(
-                session=mock_session,
-                home_team=Mock(id=1, name='Home Team'),
-                away_team=Mock(id=2, name='Away Team'),
+                home=Mock(team=Mock(id=1, name='Home Team')),
+                away=Mock(team=Mock(id=2, name='Away Team')),
                 home_analytics=sample_home_analytics,
                 away_analytics=sample_away_analytics,
+                h2h_stats=NO_MEETINGS,
                 game_time=datetime.now()
             )
 
             assert result is None
 
-    def test_try_ml_prediction_feature_preparation_fails(self, analytics_service, mock_session, sample_home_analytics, sample_away_analytics):
+    def test_try_ml_prediction_feature_preparation_fails(self, analytics_service, sample_home_analytics, sample_away_analytics):
         """Test ML prediction when feature preparation fails."""
         mock_ml_service = Mock()
         mock_ml_service.is_available = True
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
-            with patch.object(analytics_service, '_prepare_ml_features', return_value=None):
+            with patch.object(analytics_service, '_features_from_snapshots', side_effect=AttributeError("no stats")):
                 result = analytics_service._try_ml_prediction(
-                    session=mock_session,
-                    home_team=Mock(id=1, name='Home Team'),
-                    away_team=Mock(id=2, name='Away Team'),
+                    home=Mock(team=Mock(id=1, name='Home Team')),
+                    away=Mock(team=Mock(id=2, name='Away Team')),
                     home_analytics=sample_home_analytics,
                     away_analytics=sample_away_analytics,
+                    h2h_stats=NO_MEETINGS,
                     game_time=datetime.now()
                 )
 
                 assert result is None
+                mock_ml_service.predict.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch('api.src.enhanced_mlb_analytics.connect_to_db')
+    @patch('shared.database.connect_to_async_db')
     async def test_enhanced_analytics_with_ml_prediction(self, mock_connect, analytics_service):
         """Test enhanced analytics using ML prediction."""
         # Mock database setup
         mock_session = Mock()
-        mock_connect.return_value = mock_session
+        mock_connect.return_value = async_session_for(mock_session)
 
         # Mock game
         mock_game = Mock()
@@ -508,30 +463,57 @@ class TestEnhancedMLBAnalyticsMLIntegration:
                 'feature_importance': {'home_rolling_win_pct': 0.15}
             }
         )):
-            with patch.object(analytics_service, '_get_recent_team_games', return_value=pd.DataFrame()):
-                with patch.object(analytics_service, '_calculate_rolling_win_percentage', return_value=0.6):
-                    with patch.object(analytics_service, '_calculate_offensive_rating', return_value=0.7):
-                        with patch.object(analytics_service, '_calculate_defensive_rating', return_value=0.6):
-                            with patch.object(analytics_service, '_calculate_days_rest', return_value=2):
-                                with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
-                                    result = await analytics_service.get_enhanced_game_analytics("test_game_ml")
-
-                                    assert isinstance(result, MlbAnalyticsResponse)
-                                    assert result.prediction_method == 'machine_learning'
-                                    assert result.ml_model_name == 'RandomForest-v1.0'
-                                    assert result.ml_confidence == 'High'
-                                    assert result.home_win_probability == 0.65
-                                    assert result.away_win_probability == 0.35
-                                    assert result.predicted_winner == 'Home Team'  # Converted from 'home' to team name
-                                    assert result.win_probability == 0.65
+            with patch.object(analytics_service, '_load_team_snapshots', side_effect=_stub_snapshots):
+                with patch.object(analytics_service, '_offensive_rating_from_stats', return_value=0.7):
+                    with patch.object(analytics_service, '_defensive_rating_from_stats', return_value=0.6):
+                        with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
+                            result = await analytics_service.get_enhanced_game_analytics("test_game_ml")
+
+                            assert isinstance(result, MlbAnalyticsResponse)
+                            assert result.prediction_method == 'machine_learning'
+                            assert result.ml_model_name == 'RandomForest-v1.0'
+                            assert result.ml_confidence == 'High'
+                            assert result.home_win_probability == 0.65
+                            assert result.away_win_probability == 0.35
+                            assert result.predicted_winner == 'Home Team'  # Converted from 'home' to team name
+                            assert result.win_probability == 0.65
 
     @pytest.mark.asyncio
-    @patch('api.src.enhanced_mlb_analytics.connect_to_db')
+    @patch('shared.database.connect_to_async_db')
+    async def test_ml_prediction_runs_off_the_event_loop(self, mock_connect, analytics_service):
+        """Only the queries run on the event loop; scoring runs in a worker thread."""
+        mock_session = Mock()
+        mock_connect.return_value = async_session_for(mock_session)
+        mock_game = Mock(id="test_game_thread", home_team="Home Team", away_team="Away Team", time=datetime.now())
+        home_team = Mock(id=1, winning_percentage=0.600)
+        home_team.name = "Home Team"
+        away_team = Mock(id=2, winning_percentage=0.500)
+        away_team.name = "Away Team"
+        mock_session.query.return_value.filter_by.return_value.first.side_effect = [
+            mock_game, home_team, away_team
+        ]
+        scoring_threads = []
+
+        def record_thread(*args, **kwargs):
+            scoring_threads.append(threading.get_ident())
+            return None
+
+        with patch.object(analytics_service, '_try_ml_prediction', side_effect=record_thread), \
+                patch.object(analytics_service, '_load_team_snapshots', side_effect=_stub_snapshots), \
+                patch.object(analytics_service, '_offensive_rating_from_stats', return_value=0.7), \
+                patch.object(analytics_service, '_defensive_rating_from_stats', return_value=0.6):
+            result = await analytics_service.get_enhanced_game_analytics("test_game_thread")
+
+        assert result.prediction_method == 'rule_based'
+        assert scoring_threads and scoring_threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    @patch('shared.database.connect_to_async_db')
     async def test_enhanced_analytics_fallback_to_rule_based(self, mock_connect, analytics_service):
         """Test enhanced analytics falls back to rule-based when ML unavailable."""
         # Mock database setup
         mock_session = Mock()
-        mock_connect.return_value = mock_session
+        mock_connect.return_value = async_session_for(mock_session)
 
         # Mock game
         mock_game = Mock()
@@ -558,22 +540,20 @@ class TestEnhancedMLBAnalyticsMLIntegration:
 
         # Mock ML prediction returning None (unavailable)
         with patch.object(analytics_service, '_try_ml_prediction', return_value=None):
-            with patch.object(analytics_service, '_get_recent_team_games', return_value=pd.DataFrame()):
-                with patch.object(analytics_service, '_calculate_rolling_win_percentage', return_value=0.6):
-                    with patch.object(analytics_service, '_calculate_offensive_rating', return_value=0.7):
-                        with patch.object(analytics_service, '_calculate_defensive_rating', return_value=0.6):
-                            with patch.object(analytics_service, '_calculate_days_rest', return_value=2):
-                                with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
-                                    result = await analytics_service.get_enhanced_game_analytics("test_game_rules")
+            with patch.object(analytics_service, '_load_team_snapshots', side_effect=_stub_snapshots):
+                with patch.object(analytics_service, '_offensive_rating_from_stats', return_value=0.7):
+                    with patch.object(analytics_service, '_defensive_rating_from_stats', return_value=0.6):
+                        with patch.object(analytics_service, '_calculate_momentum_score', return_value=0.65):
+                            result = await analytics_service.get_enhanced_game_analytics("test_game_rules")
 
-                                    assert isinstance(result, MlbAnalyticsResponse)
-                                    assert result.prediction_method == 'rule_based'
-                                    assert result.ml_model_name is None
-                                    assert result.predicted_winner is not None
+                            assert isinstance(result, MlbAnalyticsResponse)
+                            assert result.prediction_method == 'rule_based'
+                            assert result.ml_model_name is None
+                            assert result.predicted_winner is not None
 
 
-class TestGetRecentTeamGames:
-    """Test cases for _get_recent_team_games method."""
+class TestGetTeamForms:
+    """Test cases for the windowed team form and head-to-head query."""
 
     @pytest.fixture
     def analytics_service(self):
@@ -581,84 +561,104 @@ class TestGetRecentTeamGames:
         return EnhancedMLBAnalytics(rolling_window=5)
 
     @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return Mock()
-
-    def test_get_recent_team_games_with_custom_limit(self, analytics_service, mock_session):
-        """Test getting recent games with a custom limit."""
-        # Mock schedule records
-        mock_games = []
-        for i in range(3):
-            game = Mock()
-            game.date = date(2024, 1, i + 1)
-            game.home_team_id = 1
-            game.away_team_id = 2
-            game.home_score = 5
-            game.away_score = 3
-            mock_games.append(game)
-
-        # Mock query chain
-        mock_query = Mock()
-        mock_query.filter.return_value.union.return_value.order_by.return_value.limit.return_value.all.return_value = mock_games
-        mock_session.query.return_value = mock_query
-
-        result = analytics_service._get_recent_team_games(
-            mock_session, 1, datetime(2024, 2, 1), limit=3
+    def session(self):
+        """A sqlite session with three teams and no games."""
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all([MLBTeam(id=team_id, name=f'Team {team_id}', winning_percentage=0.5) for team_id in [1, 2, 3]])
+        session.commit()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def _add_games(self, session, games):
+        """Add final games as (day of January 2024, home_id, away_id, home_score, away_score)."""
+        session.add_all([
+            MLBSchedule(game_id=f'{day}-{home}-{away}-{index}', date=date(2024, 1, day), home_team_id=home,
+                        away_team_id=away, home_score=home_score, away_score=away_score, status='Final')
+            for index, (day, home, away, home_score, away_score) in enumerate(games)
+        ])
+        session.commit()
+
+    def test_rolling_form_over_the_most_recent_games(self, analytics_service, session):
+        """Only the last rolling_window games count, whether the team was home or away."""
+        # Team 1 loses the first three, then wins seven in a row, alternating home and away
+        self._add_games(session, [
+            (day, 1, 2, 5 if day > 3 else 2, 3) if day % 2 else (day, 2, 1, 3, 5 if day > 3 else 2)
+            for day in range(1, 11)
+        ])
+
+        forms, _ = analytics_service._get_team_forms(session, [1, 2], set(), date(2024, 1, 20))
+
+        assert forms[1].games_played == 10
+        assert forms[1].rolling_win_pct == 1.0
+        assert forms[2].rolling_win_pct == 0.0
+        assert forms[1].rolling_runs_scored == 5.0
+        assert forms[1].rolling_runs_allowed == 3.0
+        assert forms[1].date == date(2024, 1, 10)
+
+    def test_partial_window_has_no_rolling_values(self, analytics_service, session):
+        """Teams that haven't played a full window get a last game date but no rolling stats."""
+        self._add_games(session, [(day, 1, 2, 5, 3) for day in range(1, 4)])
+
+        forms, _ = analytics_service._get_team_forms(session, [1, 3], set(), date(2024, 1, 20))
+
+        assert forms[1].games_played == 3
+        assert forms[1].rolling_win_pct is None
+        assert forms[1].rolling_runs_scored is None
+        assert 3 not in forms
+
+    def test_games_on_or_after_cutoff_and_unfinished_games_are_ignored(self, analytics_service, session):
+        self._add_games(session, [(day, 1, 2, 5, 3) for day in range(1, 8)])
+        session.add(MLBSchedule(game_id='postponed', date=date(2024, 1, 2), home_team_id=1, away_team_id=2,
+                                home_score=None, away_score=None, status='Postponed'))
+        session.commit()
+
+        forms, _ = analytics_service._get_team_forms(session, [1], set(), date(2024, 1, 6))
+
+        assert forms[1].games_played == 5
+        assert forms[1].date == date(2024, 1, 5)
+
+    def test_head_to_head_over_last_meetings(self, analytics_service, session):
+        """The last five meetings either way round count, and ties count for neither team."""
+        self._add_games(session, [
+            (1, 1, 2, 9, 0),  # Outside the window
+            (2, 1, 2, 5, 2),
+            (3, 2, 1, 5, 2),
+            (4, 1, 2, 4, 4),
+            (5, 2, 1, 1, 6),
+            (6, 1, 3, 1, 6),  # Different opponent
+            (7, 1, 2, 2, 3),
+        ])
+
+        _, h2h = analytics_service._get_team_forms(session, [], {(1, 2), (2, 1), (1, 3), (2, 3)}, date(2024, 1, 20))
+
+        assert h2h[(1, 2)] == {'home_win_pct': 0.4, 'away_win_pct': 0.4, 'games_played': 5}
+        assert h2h[(2, 1)] == {'home_win_pct': 0.4, 'away_win_pct': 0.4, 'games_played': 5}
+        assert h2h[(1, 3)] == {'home_win_pct': 0.0, 'away_win_pct': 1.0, 'games_played': 1}
+        assert h2h[(2, 3)] == NO_MEETINGS
+
+    def test_no_teams_or_pairs_runs_no_query(self, analytics_service):
+        session = Mock()
+
+        assert analytics_service._get_team_forms(session, [], set(), date(2024, 1, 20)) == ({}, {})
+        session.execute.assert_not_called()
+
+    def test_days_rest_from_last_game(self, analytics_service, session):
+        self._add_games(session, [(28, 1, 2, 5, 3)])
+        forms, _ = analytics_service._get_team_forms(session, [1], set(), date(2024, 2, 1))
+
+        analytics = analytics_service._team_analytics_from_snapshot(
+            TeamSnapshot(session.get(MLBTeam, 1), state=forms[1]), datetime(2024, 2, 1)
         )
-
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
-        assert 'date' in result.columns
-        assert 'home_team_id' in result.columns
-        assert 'away_team_id' in result.columns
-        assert 'home_score' in result.columns
-        assert 'away_score' in result.columns
-
-    def test_get_recent_team_games_default_limit(self, analytics_service, mock_session):
-        """Test getting recent games with default limit."""
-        mock_games = []
-
-        # Mock query chain
-        mock_query = Mock()
-        mock_query.filter.return_value.union.return_value.order_by.return_value.limit.return_value.all.return_value = mock_games
-        mock_session.query.return_value = mock_query
-
-        result = analytics_service._get_recent_team_games(
-            mock_session, 1, datetime(2024, 2, 1)
+        no_games = analytics_service._team_analytics_from_snapshot(
+            TeamSnapshot(session.get(MLBTeam, 3)), datetime(2024, 2, 1)
         )
 
-        # Should use rolling_window * 2 as default limit (5 * 2 = 10)
-        assert isinstance(result, pd.DataFrame)
-
-
-class TestRollingWinPercentageAwayTeam:
-    """Test cases for rolling win percentage with away team scenarios."""
-
-    @pytest.fixture
-    def analytics_service(self):
-        """Create an instance of the analytics service for testing."""
-        return EnhancedMLBAnalytics(rolling_window=5)
-
-    def test_calculate_rolling_win_percentage_away_team_wins(self, analytics_service):
-        """Test rolling win percentage when team plays as away team and wins."""
-        games_data = []
-        for i in range(10):
-            games_data.append({
-                'date': date.today(),
-                'home_team_id': 2,  # Team 1 is away
-                'away_team_id': 1,
-                'home_score': 3 if i < 7 else 5,  # Away team (1) wins 7 out of 10
-                'away_score': 5 if i < 7 else 3
-            })
-
-        games_df = pd.DataFrame(games_data)
-
-        rolling_pct = analytics_service._calculate_rolling_win_percentage(games_df, 1)
-
-        assert rolling_pct is not None
-        assert isinstance(rolling_pct, float)
-        assert 0 <= rolling_pct <= 1
+        assert analytics.days_rest == 4  # Feb 1 - Jan 28 = 4 days
+        assert no_games.days_rest is None
+        assert no_games.rolling_win_percentage is None
 
 
 class TestMissingStats:
@@ -669,64 +669,13 @@ class TestMissingStats:
         """Create an instance of the analytics service for testing."""
         return EnhancedMLBAnalytics(rolling_window=5)
 
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return Mock()
-
-    def test_calculate_offensive_rating_no_stats(self, analytics_service, mock_session):
+    def test_offensive_rating_no_stats(self, analytics_service):
         """Test offensive rating when no stats are found."""
-        # Mock query returning None
-        mock_session.query.return_value.filter.return_value.order_by.return_value.first.return_value = None
+        assert analytics_service._offensive_rating_from_stats(None) is None
 
-        offensive_rating = analytics_service._calculate_offensive_rating(
-            mock_session, 1, datetime.now()
-        )
-
-        assert offensive_rating is None
-
-    def test_calculate_defensive_rating_no_stats(self, analytics_service, mock_session):
+    def test_defensive_rating_no_stats(self, analytics_service):
         """Test defensive rating when no stats are found."""
-        # Mock query returning None
-        mock_session.query.return_value.filter.return_value.order_by.return_value.first.return_value = None
-
-        defensive_rating = analytics_service._calculate_defensive_rating(
-            mock_session, 1, datetime.now()
-        )
-
-        assert defensive_rating is None
-
-
-class TestCalculateDaysRest:
-    """Test cases for _calculate_days_rest method."""
-
-    @pytest.fixture
-    def analytics_service(self):
-        """Create an instance of the analytics service for testing."""
-        return EnhancedMLBAnalytics(rolling_window=5)
-
-    def test_calculate_days_rest_empty_dataframe(self, analytics_service):
-        """Test days rest calculation with empty DataFrame."""
-        empty_df = pd.DataFrame()
-
-        days_rest = analytics_service._calculate_days_rest(empty_df, datetime(2024, 2, 1))
-
-        assert days_rest is None
-
-    def test_calculate_days_rest_with_recent_game(self, analytics_service):
-        """Test days rest calculation with recent game."""
-        games_data = [{
-            'date': date(2024, 1, 28),
-            'home_team_id': 1,
-            'away_team_id': 2,
-            'home_score': 5,
-            'away_score': 3
-        }]
-        games_df = pd.DataFrame(games_data)
-
-        days_rest = analytics_service._calculate_days_rest(games_df, datetime(2024, 2, 1))
-
-        assert days_rest == 4  # Feb 1 - Jan 28 = 4 days
+        assert analytics_service._defensive_rating_from_stats(None) is None
 
 
 class TestMLPredictionEdgeCases:
@@ -763,19 +712,18 @@ class TestMLPredictionEdgeCases:
 
     def test_try_ml_prediction_returns_none(self, analytics_service, sample_home_analytics, sample_away_analytics):
         """Test when ML prediction returns None."""
-        mock_session = Mock()
         mock_ml_service = Mock()
         mock_ml_service.is_available = True
         mock_ml_service.predict.return_value = None
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
-            with patch.object(analytics_service, '_prepare_ml_features', return_value={'home_rolling_win_pct': 0.5}):
+            with patch.object(analytics_service, '_features_from_snapshots', return_value={'home_rolling_win_pct': 0.5}):
                 result = analytics_service._try_ml_prediction(
-                    session=mock_session,
-                    home_team=Mock(id=1, name='Home Team'),
-                    away_team=Mock(id=2, name='Away Team'),
+                    home=Mock(team=Mock(id=1, name='Home Team')),
+                    away=Mock(team=Mock(id=2, name='Away Team')),
                     home_analytics=sample_home_analytics,
                     away_analytics=sample_away_analytics,
+                    h2h_stats=NO_MEETINGS,
                     game_time=datetime.now()
                 )
 
@@ -783,38 +731,32 @@ class TestMLPredictionEdgeCases:
 
     def test_try_ml_prediction_exception_handling(self, analytics_service, sample_home_analytics, sample_away_analytics):
         """Test exception handling in ML prediction."""
-        mock_session = Mock()
         mock_ml_service = Mock()
         mock_ml_service.is_available = True
         mock_ml_service.predict.side_effect = Exception("Model error")
 
         with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=mock_ml_service):
-            with patch.object(analytics_service, '_prepare_ml_features', return_value={'home_rolling_win_pct': 0.5}):
+            with patch.object(analytics_service, '_features_from_snapshots', return_value={'home_rolling_win_pct': 0.5}):
                 result = analytics_service._try_ml_prediction(
-                    session=mock_session,
-                    home_team=Mock(id=1, name='Home Team'),
-                    away_team=Mock(id=2, name='Away Team'),
+                    home=Mock(team=Mock(id=1, name='Home Team')),
+                    away=Mock(team=Mock(id=2, name='Away Team')),
                     home_analytics=sample_home_analytics,
                     away_analytics=sample_away_analytics,
+                    h2h_stats=NO_MEETINGS,
                     game_time=datetime.now()
                 )
 
                 assert result is None
 
 
-class TestPrepareMLFeatures:
-    """Test cases for _prepare_ml_features method."""
+class TestFeaturesFromSnapshots:
+    """Test cases for _features_from_snapshots method."""
 
     @pytest.fixture
     def analytics_service(self):
         """Create an instance of the analytics service for testing."""
         return EnhancedMLBAnalytics(rolling_window=5)
 
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return Mock()
-
     @pytest.fixture
     def sample_home_analytics(self):
         return TeamAnalytics(
@@ -839,26 +781,11 @@ class TestPrepareMLFeatures:
             momentum_score=0.600
         )
 
-    def test_prepare_ml_features_complete(self, analytics_service, mock_session, sample_home_analytics, sample_away_analytics):
+    def test_features_from_snapshots_complete(self, analytics_service, sample_home_analytics, sample_away_analytics):
         """Test complete feature preparation with all stats."""
-        # Mock recent games
-        home_games_data = [{
-            'date': date(2024, 1, i),
-            'home_team_id': 1,
-            'away_team_id': 2,
-            'home_score': 5,
-            'away_score': 3
-        } for i in range(1, 11)]
-        home_games_df = pd.DataFrame(home_games_data)
-
-        away_games_data = [{
-            'date': date(2024, 1, i),
-            'home_team_id': 2,
-            'away_team_id': 1,
-            'home_score': 3,
-            'away_score': 5
-        } for i in range(1, 11)]
-        away_games_df = pd.DataFrame(away_games_data)
+        # Recent form over the rolling window
+        home_form = TeamForm(date(2024, 1, 30), 10, 0.65, 5.0, 3.0)
+        away_form = TeamForm(date(2024, 1, 31), 10, 0.48, 3.0, 5.0)
 
         # Mock offensive stats
         mock_home_offensive = Mock()
@@ -889,114 +816,69 @@ class TestPrepareMLFeatures:
             'games_played': 5
         }
 
-        with patch.object(analytics_service, '_get_recent_team_games', side_effect=[home_games_df, away_games_df]):
-            with patch.object(analytics_service, '_get_head_to_head_stats', return_value=h2h_stats):
-                # Mock database queries for offensive and defensive stats
-                mock_session.query.return_value.filter.return_value.order_by.return_value.first.side_effect = [
-                    mock_home_offensive, mock_away_offensive, mock_home_defensive, mock_away_defensive
-                ]
-
-                features = analytics_service._prepare_ml_features(
-                    session=mock_session,
-                    home_team=Mock(id=1),
-                    away_team=Mock(id=2),
-                    home_analytics=sample_home_analytics,
-                    away_analytics=sample_away_analytics,
-                    game_time=datetime(2024, 2, 1, 19, 0)
-                )
-
-                assert features is not None
-                assert 'home_rolling_win_pct' in features
-                assert 'away_rolling_win_pct' in features
-                assert 'home_rolling_runs_scored' in features
-                assert 'away_rolling_runs_scored' in features
-                assert 'home_rolling_runs_allowed' in features
-                assert 'away_rolling_runs_allowed' in features
-                assert 'home_days_rest' in features
-                assert 'away_days_rest' in features
-                assert 'home_batting_avg' in features
-                assert 'away_batting_avg' in features
-                assert 'home_obp' in features
-                assert 'away_obp' in features
-                assert 'home_slg' in features
-                assert 'away_slg' in features
-                assert 'home_era' in features
-                assert 'away_era' in features
-                assert 'home_whip' in features
-                assert 'away_whip' in features
-                assert 'home_strikeouts' in features
-                assert 'away_strikeouts' in features
-                assert 'h2h_home_win_pct' in features
-                assert 'h2h_away_win_pct' in features
-                assert 'h2h_games_played' in features
-                assert 'month' in features
-                assert 'day_of_week' in features
-                assert 'is_weekend' in features
-                assert features['month'] == 2.0
-                assert features['day_of_week'] == 3.0  # Thursday
-                assert features['is_weekend'] == 0.0
-
-    def test_prepare_ml_features_exception(self, analytics_service, mock_session, sample_home_analytics, sample_away_analytics):
-        """Test exception handling in feature preparation."""
-        with patch.object(analytics_service, '_get_recent_team_games', side_effect=Exception("Database error")):
-            features = analytics_service._prepare_ml_features(
-                session=mock_session,
-                home_team=Mock(id=1),
-                away_team=Mock(id=2),
-                home_analytics=sample_home_analytics,
-                away_analytics=sample_away_analytics,
-                game_time=datetime.now()
-            )
-
-            assert features is None
-
-
-class TestGetHeadToHeadStats:
-    """Test cases for _get_head_to_head_stats method."""
-
-    @pytest.fixture
-    def analytics_service(self):
-        """Create an instance of the analytics service for testing."""
-        return EnhancedMLBAnalytics(rolling_window=5)
-
-    @pytest.fixture
-    def mock_session(self):
-        """Create a mock database session."""
-        return Mock()
-
-    def test_get_head_to_head_stats_no_games(self, analytics_service, mock_session):
-        """Test head-to-head stats when no games found."""
-        # Mock empty query result
-        mock_session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+        home = TeamSnapshot(Mock(id=1), mock_home_offensive, mock_home_defensive, home_form)
+        away = TeamSnapshot(Mock(id=2), mock_away_offensive, mock_away_defensive, away_form)
 
-        h2h_stats = analytics_service._get_head_to_head_stats(
-            mock_session, 1, 2, datetime.now()
+        features = analytics_service._features_from_snapshots(
+            home=home,
+            away=away,
+            home_analytics=sample_home_analytics,
+            away_analytics=sample_away_analytics,
+            h2h_stats=h2h_stats,
+            game_time=datetime(2024, 2, 1, 19, 0)
         )
 
-        assert h2h_stats == {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
-
-    def test_get_head_to_head_stats_with_games(self, analytics_service, mock_session):
-        """Test head-to-head stats calculation."""
-        # Create mock games where home team (id=1) wins 3 out of 5
-        mock_games = []
-        for i in range(5):
-            game = Mock()
-            game.home_team_id = 1
-            game.away_team_id = 2
-            game.home_score = 5 if i < 3 else 2
-            game.away_score = 2 if i < 3 else 5
-            mock_games.append(game)
-
-        mock_session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = mock_games
-
-        h2h_stats = analytics_service._get_head_to_head_stats(
-            mock_session, 1, 2, datetime.now()
+        assert features is not None
+        assert 'home_rolling_win_pct' in features
+        assert 'away_rolling_win_pct' in features
+        assert 'home_rolling_runs_scored' in features
+        assert 'away_rolling_runs_scored' in features
+        assert 'home_rolling_runs_allowed' in features
+        assert 'away_rolling_runs_allowed' in features
+        assert 'home_days_rest' in features
+        assert 'away_days_rest' in features
+        assert 'home_batting_avg' in features
+        assert 'away_batting_avg' in features
+        assert 'home_obp' in features
+        assert 'away_obp' in features
+        assert 'home_slg' in features
+        assert 'away_slg' in features
+        assert 'home_era' in features
+        assert 'away_era' in features
+        assert 'home_whip' in features
+        assert 'away_whip' in features
+        assert 'home_strikeouts' in features
+        assert 'away_strikeouts' in features
+        assert 'h2h_home_win_pct' in features
+        assert 'h2h_away_win_pct' in features
+        assert 'h2h_games_played' in features
+        assert 'month' in features
+        assert 'day_of_week' in features
+        assert 'is_weekend' in features
+        assert features['month'] == 2.0
+        assert features['day_of_week'] == 3.0  # Thursday
+        assert features['is_weekend'] == 0.0
+        assert features['home_batting_avg'] == 0.270
+        assert features['away_era'] == 4.05
+        assert features['home_rolling_runs_scored'] == 5.0
+        assert features['away_rolling_runs_allowed'] == 5.0
+
+    def test_features_from_snapshots_without_form_or_stats(self, analytics_service, sample_home_analytics, sample_away_analytics):
+        """Teams that haven't played or have no stats get league-typical defaults."""
+        features = analytics_service._features_from_snapshots(
+            home=TeamSnapshot(Mock(id=1)),
+            away=TeamSnapshot(Mock(id=2), state=TeamForm(date(2024, 1, 31), 3, None, None, None)),
+            home_analytics=sample_home_analytics,
+            away_analytics=sample_away_analytics,
+            h2h_stats=NO_MEETINGS,
+            game_time=datetime(2024, 2, 1, 19, 0)
         )
 
-        assert h2h_stats['games_played'] == 5
-        assert h2h_stats['home_win_pct'] == 0.600
-        assert h2h_stats['away_win_pct'] == 0.400
-
+        assert features['home_rolling_runs_scored'] == 0.0
+        assert features['away_rolling_runs_allowed'] == 0.0
+        assert features['home_batting_avg'] == 0.25
+        assert features['away_era'] == 4.5
+        assert features['h2h_games_played'] == 0.0
 
 class TestRuleBasedPredictionEdgeCases:
     """Test cases for rule-based prediction edge cases."""
@@ -1285,3 +1167,157 @@ class TestCreateBasicResponse:
 
 if __name__ == "__main__":
     pytest.main([__file__])
+
+
+class TestPerGameQueryCount:
+    """Query budget for the per-game analytics path against a seeded database."""
+
+    @pytest.fixture
+    def ml_service(self):
+        ml_service = Mock(is_available=True)
+        ml_service.predict.return_value = None
+        with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=ml_service):
+            yield ml_service
+
+    @pytest.mark.asyncio
+    async def test_each_team_is_loaded_once(self, mlb_feature_store_db, ml_service):
+        """Analytics and ML features share one snapshot per team, read from the feature store."""
+        statements = count_queries(mlb_feature_store_db)
+
+        result = await EnhancedMLBAnalytics().get_enhanced_game_analytics('g1')
+
+        ml_service.predict.assert_called_once()
+        assert result.home_analytics.offensive_rating is not None
+        assert result.away_analytics.days_rest == 1
+
+        # Game, two team records, then feature store states, offensive stats,
+        # defensive stats and the head-to-head record for both teams at once
+        assert len(statements) == 7
+        assert not any('mlb_schedule' in s for s in statements)
+        assert sum('FROM mlb_team_state' in s for s in statements) == 1
+        assert sum('FROM mlb_head_to_head' in s for s in statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_schedule_without_feature_store(self, mlb_slate_db, ml_service):
+        """Without a feature store, form and head-to-head for both teams come from one schedule query."""
+        statements = count_queries(mlb_slate_db)
+
+        await EnhancedMLBAnalytics().get_enhanced_game_analytics('g1')
+
+        ml_service.predict.assert_called_once()
+        # The empty store lookups are replaced by one windowed schedule query
+        assert len(statements) == 7
+        assert sum('mlb_schedule' in s for s in statements) == 1
+        assert sum('FROM mlb_offensive_stats' in s for s in statements) == 1
+        assert sum('FROM mlb_defensive_stats' in s for s in statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_feature_store_matches_schedule(self, mlb_slate_db, ml_service):
+        """Store-backed analytics and features agree with the raw schedule calculation."""
+        analytics = EnhancedMLBAnalytics()
+        raw = await analytics.get_enhanced_game_analytics('g1')
+        raw_features = ml_service.predict.call_args.args[0]
+
+        async with mlb_slate_db() as session:
+            await session.run_sync(MLBFeatureStore().refresh)
+        stored = await analytics.get_enhanced_game_analytics('g1')
+        stored_features = ml_service.predict.call_args.args[0]
+
+        assert stored == raw
+        assert stored_features == raw_features
+
+
+class TestAnalyticsCache:
+    """Game analytics are cached per (game_id, data version, model version)."""
+
+    @pytest.fixture
+    def ml_service(self):
+        ml_service = Mock(is_available=True, model_version=1)
+        ml_service.predict.return_value = None
+        with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=ml_service):
+            yield ml_service
+
+    @pytest.mark.asyncio
+    async def test_repeat_views_are_served_from_cache(self, mlb_slate_db, ml_service):
+        first = await get_enhanced_mlb_game_analytics('g1')
+        statements = count_queries(mlb_slate_db)
+
+        second = await get_enhanced_mlb_game_analytics('g1')
+
+        assert second is first
+        # Only the data version is read
+        assert len(statements) == 1
+        assert 'data_versions' in statements[0]
+        assert ml_service.predict.call_count == 1
+        assert analytics_cache.get_stats()['hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_data_version_bump_recomputes(self, mlb_slate_db, ml_service):
+        first = await get_enhanced_mlb_game_analytics('g1')
+
+        async with mlb_slate_db() as session:
+            await session.run_sync(bump_data_version)
+        second = await get_enhanced_mlb_game_analytics('g1')
+
+        assert second == first
+        assert second is not first
+        assert ml_service.predict.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_model_reload_recomputes(self, mlb_slate_db, ml_service):
+        await get_enhanced_mlb_game_analytics('g1')
+
+        ml_service.model_version = 2
+        await get_enhanced_mlb_game_analytics('g1')
+
+        assert ml_service.predict.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_requested_model_is_cached_separately(self, mlb_slate_db, ml_service):
+        other_service = Mock(is_available=True, model_version=1)
+        other_service.predict.return_value = None
+        registry = Mock()
+        registry.get_service.return_value = other_service
+
+        with patch('api.src.enhanced_mlb_analytics.get_mlb_model_registry', return_value=registry):
+            await get_enhanced_mlb_game_analytics('g1')
+            await get_enhanced_mlb_game_analytics('g1', '3.0-xgb')
+            await get_enhanced_mlb_game_analytics('g1', '3.0-xgb')
+
+        assert ml_service.predict.call_count == 1
+        assert other_service.predict.call_count == 1
+        registry.get_service.assert_called_with('3.0-xgb')
+
+    @pytest.mark.asyncio
+    async def test_requested_model_is_loaded_off_the_event_loop(self, mlb_slate_db, ml_service):
+        calls = []
+        other_service = Mock(is_available=True, model_version=1)
+        other_service._load_model.side_effect = lambda: calls.append(('load', threading.get_ident()))
+        other_service.predict.side_effect = lambda features: calls.append(('predict', threading.get_ident()))
+        registry = Mock()
+        registry.get_service.side_effect = lambda version: calls.append(('lookup', threading.get_ident())) or other_service
+
+        with patch('api.src.enhanced_mlb_analytics.get_mlb_model_registry', return_value=registry):
+            await get_enhanced_mlb_game_analytics('g1', '3.0-xgb')
+
+        assert [name for name, _ in calls[:2]] == ['lookup', 'load']
+        assert 'predict' in [name for name, _ in calls]
+        assert threading.get_ident() not in {thread for _, thread in calls}
+
+    @pytest.mark.asyncio
+    async def test_result_is_not_cached_when_the_model_loads_during_the_request(self, mlb_slate_db, ml_service):
+        def load_model(features):
+            ml_service.model_version = 2
+            return None
+        ml_service.predict.side_effect = load_model
+
+        await get_enhanced_mlb_game_analytics('g1')
+
+        assert analytics_cache.get_stats()['entries'] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_game_is_not_cached(self, mlb_slate_db, ml_service):
+        with pytest.raises(ValueError):
+            await get_enhanced_mlb_game_analytics('missing')
+
+        assert analytics_cache.get_stats()['entries'] == 0
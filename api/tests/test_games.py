@@ -1,13 +1,18 @@
+import asyncio
 from fastapi import HTTPException
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 from datetime import datetime, timedelta
-from api.src.games import get_games_by_date, get_games_for_sport, is_data_expired, parse_response_and_store_games, store_odds, update_existing_odds_in_db
+from api.src import games
+from api.src.games import get_games_by_date, get_games_for_sport, is_data_expired, parse_response_and_store_games, upsert_odds, get_next_expiry, get_games_cache_ttl, get_stored_games, games_on_date_query
 from api.src.main import app
 from api.src.models.games import Game, GamesResponse
 from api.src.login import get_current_user
 from api.src.models.tables import Odds
+from api.tests.helpers import make_async_session
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 
 @pytest.fixture
 def client():
@@ -30,7 +35,7 @@ def client():
     app.dependency_overrides.clear()
 
 @pytest.mark.parametrize("endpoint", ["/nba/games", "/mlb/games", "/nfl/games", "/nhl/games"])
-def test_games(endpoint, client):
+def test_games(endpoint, client, games_cache):
     mock_game = Game(
         id='test_game_id',
         sport='TEST',
@@ -41,7 +46,8 @@ def test_games(endpoint, client):
         awayOdds='+150'
     )
 
-    with patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[mock_game])):
+    with patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[mock_game])), \
+         patch('api.src.games.get_games_cache_ttl', return_value=300):
         today = datetime.now().strftime("%Y-%m-%d")
         response = client.get(f"{endpoint}?date={today}")
         
@@ -60,14 +66,15 @@ def test_games_no_date_provided(endpoint, client):
     assert response.status_code == 422
 
 @pytest.mark.asyncio
-async def test_get_games_for_sport_500_error():
+async def test_get_games_for_sport_500_error(games_cache):
     with patch('api.src.games.get_games_by_date', side_effect=Exception("Unexpected error")):
         with pytest.raises(HTTPException) as exc_info:
             await get_games_for_sport("2023-08-18", "NBA", "basketball_nba")
         assert exc_info.value.status_code == 500
         assert "An error occurred while processing the request" in str(exc_info.value.detail)
 
-def test_parse_response_and_store_games():
+@pytest.mark.asyncio
+async def test_parse_response_and_store_games():
     mock_odds_response = [
         {
             'id': 'test_game_id',
@@ -91,51 +98,77 @@ def test_parse_response_and_store_games():
         }
     ]
     
-    with patch('api.src.games.update_existing_odds_in_db', return_value=False), \
-         patch('api.src.games.store_odds') as mock_store_odds:
-        games = parse_response_and_store_games(mock_odds_response, 'NBA')
+    with patch('api.src.games.upsert_odds') as mock_upsert_odds:
+        games = await parse_response_and_store_games(mock_odds_response, 'NBA')
         assert len(games) == 1
         assert games[0].id == 'test_game_id'
         assert games[0].sport == 'NBA'
         assert games[0].homeTeam == 'Home Team'
         assert games[0].awayTeam == 'Away Team'
-        mock_store_odds.assert_called_once()
+        mock_upsert_odds.assert_awaited_once_with(games)
 
-def test_update_existing_odds_in_db():
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter_by.return_value.first.return_value = MagicMock(spec=Odds)
-    
-    with patch('api.src.games.connect_to_db', return_value=mock_session):
-        result = update_existing_odds_in_db('test_game_id', '-150', '+130')
-        assert result is True
-        mock_session.commit.assert_called_once()
+def _slate(count, home_odds='-150', away_odds='+130'):
+    return [
+        Game(id=f'game_{i}', sport='MLB', homeTeam=f'Home {i}', awayTeam=f'Away {i}',
+             time='2023-08-18 20:00', homeOdds=home_odds, awayOdds=away_odds)
+        for i in range(count)
+    ]
 
-def test_store_odds():
-    mock_session = MagicMock()
-    mock_game = Game(
-        id='test_game_id',
-        sport='NBA',
-        homeTeam='Home Team',
-        awayTeam='Away Team',
-        time='2023-08-18 20:00',
-        homeOdds='-150',
-        awayOdds='+130'
-    )
-    
-    with patch('api.src.games.connect_to_db', return_value=mock_session):
-        store_odds(mock_game)
-        mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
-
-def test_is_data_expired():
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter.return_value.scalar.return_value = datetime.now() - timedelta(hours=2)
+@pytest.mark.asyncio
+async def test_upsert_odds_inserts_new_games(sqlite_async_db):
+    await upsert_odds(_slate(15))
+
+    async with sqlite_async_db() as session:
+        rows = (await session.execute(select(Odds))).scalars().all()
+    assert len(rows) == 15
+    assert rows[0].home_odds == '-150'
+    assert rows[0].expires == datetime(2023, 8, 18, 21, 12)
+
+@pytest.mark.asyncio
+async def test_upsert_odds_updates_existing_games(sqlite_async_db):
+    await upsert_odds(_slate(3))
+    await upsert_odds(_slate(3, home_odds='-110', away_odds='-110'))
+
+    async with sqlite_async_db() as session:
+        rows = (await session.execute(select(Odds))).scalars().all()
+    assert len(rows) == 3
+    assert {(r.home_odds, r.away_odds) for r in rows} == {('-110', '-110')}
+    # Updated rows expire relative to now, not to the game time
+    assert all(r.expires > datetime.now() for r in rows)
+
+@pytest.mark.asyncio
+async def test_upsert_odds_uses_one_transaction():
+    mock_session = make_async_session()
+    mock_session.bind.dialect.name = 'postgresql'
+
+    with patch('shared.database.connect_to_async_db', return_value=mock_session), \
+         patch('api.src.games.append_odds_snapshots') as mock_append:
+        await upsert_odds(_slate(15))
+
+    assert mock_append.await_args.args[0] is mock_session
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    statement = mock_session.execute.await_args.args[0]
+    assert 'ON CONFLICT (id) DO UPDATE' in str(statement.compile(dialect=postgresql.dialect()))
+
+@pytest.mark.asyncio
+async def test_upsert_odds_skips_empty_slate():
+    with patch('shared.database.connect_to_async_db') as mock_connect:
+        await upsert_odds([])
+
+    mock_connect.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_is_data_expired():
+    mock_session = make_async_session()
+    mock_session.execute.return_value.scalar.return_value = datetime.now() - timedelta(hours=2)
     
-    with patch('api.src.games.connect_to_db', return_value=mock_session):
-        result = is_data_expired('NBA')
+    with patch('shared.database.connect_to_async_db', return_value=mock_session):
+        result = await is_data_expired('NBA')
         assert result is True
 
-def test_get_games_by_date_expired_data():
+@pytest.mark.asyncio
+async def test_get_games_by_date_expired_data():
     mock_odds_response = [
         {
             'id': 'test_game_id',
@@ -161,14 +194,14 @@ def test_get_games_by_date_expired_data():
     
     with patch('api.src.games.is_data_expired', return_value=True), \
          patch('api.src.games.call_odds_api', return_value=mock_odds_response), \
-         patch('api.src.games.update_existing_odds_in_db', return_value=False), \
-         patch('api.src.games.store_odds'):
-        result = get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
+         patch('api.src.games.upsert_odds'):
+        result = await get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
         assert isinstance(result, GamesResponse)
         assert len(result.list) == 1
         assert result.list[0].id == 'test_game_id'
 
-def test_get_games_by_date_non_expired_data():
+@pytest.mark.asyncio
+async def test_get_games_by_date_non_expired_data():
     mock_db_games = [
         MagicMock(
             id='test_game_id',
@@ -177,16 +210,17 @@ def test_get_games_by_date_non_expired_data():
             away_team='Away Team',
             time=datetime(2023, 8, 18, 20, 0),
             home_odds='-150',
-            away_odds='+130'
+            away_odds='+130',
+            best_lines=None
         )
     ]
     
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter.return_value.all.return_value = mock_db_games
+    mock_session = make_async_session()
+    mock_session.execute.return_value.scalars.return_value.all.return_value = mock_db_games
     
     with patch('api.src.games.is_data_expired', return_value=False), \
-         patch('api.src.games.connect_to_db', return_value=mock_session):
-        result = get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
+         patch('shared.database.connect_to_async_db', return_value=mock_session):
+        result = await get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
         assert isinstance(result, GamesResponse)
         assert len(result.list) == 1
         assert result.list[0].id == 'test_game_id'
@@ -194,4 +228,216 @@ def test_get_games_by_date_non_expired_data():
 @pytest.fixture(scope="module", autouse=True)
 def cleanup_override():
     yield
-    app.dependency_overrides.pop(get_current_user, None)
\ No newline at end of file
+    app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def odds_refreshes(monkeypatch):
+    group = games.SingleFlight('odds-refresh')
+    monkeypatch.setattr(games, 'odds_refreshes', group)
+    monkeypatch.setattr(games, '_stale_served', 0)
+    return group
+
+def _stored_game():
+    return Game(id='stored_game_id', sport='NBA', homeTeam='Home Team', awayTeam='Away Team',
+                time='2023-08-18 20:00', homeOdds='-150', awayOdds='+130')
+
+def _fresh_game():
+    return Game(id='fresh_game_id', sport='NBA', homeTeam='Home Team', awayTeam='Away Team',
+                time='2023-08-18 20:00', homeOdds='-140', awayOdds='+120')
+
+@pytest.mark.asyncio
+async def test_concurrent_expired_requests_share_one_refresh(odds_refreshes):
+    async def slow_refresh(*args):
+        await asyncio.sleep(0.05)
+        return [_fresh_game()]
+
+    with patch('api.src.games.is_data_expired', return_value=True), \
+         patch('api.src.games.get_stored_games', return_value=GamesResponse(list=[])), \
+         patch('api.src.games.refresh_odds', side_effect=slow_refresh) as mock_refresh:
+        results = await asyncio.gather(*(
+            get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba') for _ in range(10)
+        ))
+
+    mock_refresh.assert_called_once_with('NBA', 'basketball_nba')
+    assert all(r.list[0].id == 'fresh_game_id' for r in results)
+    assert games.get_odds_refresh_stats() == {'leader': 1, 'coalesced': 9, 'in_flight': 0, 'stale_served': 0}
+
+@pytest.mark.asyncio
+async def test_stale_games_served_while_refresh_in_flight(odds_refreshes):
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def blocked_refresh(*args):
+        refresh_started.set()
+        await release_refresh.wait()
+        return [_fresh_game()]
+
+    with patch('api.src.games.is_data_expired', return_value=True), \
+         patch('api.src.games.get_stored_games', return_value=GamesResponse(list=[_stored_game()])), \
+         patch('api.src.games.refresh_odds', side_effect=blocked_refresh):
+        leader = asyncio.create_task(get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba'))
+        await refresh_started.wait()
+
+        stale = await get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
+        release_refresh.set()
+        fresh = await leader
+
+    assert stale.list[0].id == 'stored_game_id'
+    assert fresh.list[0].id == 'fresh_game_id'
+    assert games.get_odds_refresh_stats()['stale_served'] == 1
+
+@pytest.mark.asyncio
+async def test_waiters_join_refresh_when_nothing_stored(odds_refreshes):
+    async def slow_refresh(*args):
+        await asyncio.sleep(0.05)
+        return [_fresh_game()]
+
+    with patch('api.src.games.is_data_expired', return_value=True), \
+         patch('api.src.games.get_stored_games', return_value=GamesResponse(list=[])), \
+         patch('api.src.games.refresh_odds', side_effect=slow_refresh):
+        leader = asyncio.create_task(get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba'))
+        await asyncio.sleep(0)
+        waiter = await get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
+        await leader
+
+    assert waiter.list[0].id == 'fresh_game_id'
+    assert games.get_odds_refresh_stats()['coalesced'] == 1
+
+def test_metrics_endpoint(client, odds_refreshes):
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.json()['odds_refresh'] == {'leader': 0, 'coalesced': 0, 'in_flight': 0, 'stale_served': 0}
+    assert response.json()['odds_refresher']['running'] is False
+
+@pytest.mark.asyncio
+async def test_get_games_by_date_reads_store_when_refresher_enabled():
+    stored = GamesResponse(list=[_stored_game()])
+
+    with patch('api.src.games.ODDS_REFRESH_ENABLED', True), \
+         patch('api.src.games.is_data_expired') as mock_expired, \
+         patch('api.src.games.get_stored_games', return_value=stored), \
+         patch('api.src.games.refresh_odds') as mock_refresh:
+        result = await get_games_by_date(datetime(2023, 8, 18), 'NBA', 'basketball_nba')
+
+    assert result is stored
+    mock_expired.assert_not_called()
+    mock_refresh.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_next_expiry_ignores_started_games(sqlite_async_db):
+    now = datetime.now()
+    async with sqlite_async_db() as session:
+        session.add_all([
+            Odds(id='started', sport='MLB', time=now - timedelta(hours=3), expires=now - timedelta(hours=2)),
+            Odds(id='upcoming', sport='MLB', time=now + timedelta(hours=2), expires=now + timedelta(hours=1)),
+            Odds(id='other_sport', sport='NBA', time=now + timedelta(hours=1), expires=now + timedelta(minutes=10)),
+        ])
+        await session.commit()
+
+    assert await get_next_expiry('MLB') == now + timedelta(hours=1)
+    assert await get_next_expiry('NHL') is None
+
+@pytest.fixture
+def games_cache(monkeypatch):
+    cache = games.TTLCache('games', max_entries=16, default_ttl=300)
+    monkeypatch.setattr(games, 'games_cache', cache)
+    return cache
+
+@pytest.mark.asyncio
+async def test_get_games_for_sport_caches_serialized_response(games_cache):
+    with patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[_stored_game()])) as mock_get, \
+         patch('api.src.games.get_games_cache_ttl', return_value=300):
+        first = await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+        second = await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+
+    mock_get.assert_called_once()
+    assert first.body == second.body
+    assert GamesResponse.model_validate_json(second.body).list[0].id == 'stored_game_id'
+    assert games_cache.get_stats()['hits'] == 1
+    assert games_cache.get_stats()['misses'] == 1
+
+@pytest.mark.asyncio
+async def test_get_games_for_sport_cache_is_keyed_by_sport_and_date(games_cache):
+    with patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[])) as mock_get, \
+         patch('api.src.games.get_games_cache_ttl', return_value=300):
+        await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+        await get_games_for_sport('2023-08-19', 'NBA', 'basketball_nba')
+        await get_games_for_sport('2023-08-18', 'NHL', 'icehockey_nhl')
+
+    assert mock_get.call_count == 3
+
+@pytest.mark.asyncio
+async def test_get_games_for_sport_skips_cache_when_odds_already_expired(games_cache):
+    with patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[])) as mock_get, \
+         patch('api.src.games.get_games_cache_ttl', return_value=-5):
+        await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+        await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+
+    assert mock_get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_upsert_odds_invalidates_cached_sport(games_cache, sqlite_async_db):
+    games_cache.set(('MLB', '2023-08-18'), b'{}')
+    games_cache.set(('NBA', '2023-08-18'), b'{}')
+
+    await upsert_odds(_slate(2))
+
+    assert games_cache.get(('MLB', '2023-08-18')) is None
+    assert games_cache.get(('NBA', '2023-08-18')) == b'{}'
+
+@pytest.mark.asyncio
+async def test_response_computed_before_ingest_is_not_cached(games_cache):
+    async def get_then_ingest(*args):
+        games_cache.invalidate(lambda key: key[0] == 'NBA')
+        return GamesResponse(list=[])
+
+    with patch('api.src.games.get_games_by_date', side_effect=get_then_ingest), \
+         patch('api.src.games.get_games_cache_ttl', return_value=300):
+        await get_games_for_sport('2023-08-18', 'NBA', 'basketball_nba')
+
+    assert games_cache.get_stats()['entries'] == 0
+
+@pytest.mark.asyncio
+async def test_games_cache_ttl_follows_next_expiry():
+    with patch('api.src.games.get_next_expiry', return_value=datetime.now() + timedelta(seconds=120)):
+        assert await get_games_cache_ttl('NBA') == pytest.approx(120, abs=1)
+
+    with patch('api.src.games.get_next_expiry', return_value=datetime.now() + timedelta(hours=2)):
+        assert await get_games_cache_ttl('NBA') == games.GAMES_CACHE_TTL
+
+    with patch('api.src.games.get_next_expiry', return_value=None):
+        assert await get_games_cache_ttl('NBA') == games.GAMES_CACHE_TTL
+
+@pytest.mark.asyncio
+async def test_get_stored_games_uses_half_open_day_range(sqlite_async_db):
+    async with sqlite_async_db() as session:
+        session.add_all([
+            Odds(id='previous_day', sport='NBA', time=datetime(2023, 8, 17, 23, 59), home_odds='-150', away_odds='+130',
+                 home_team='Home', away_team='Away'),
+            Odds(id='midnight', sport='NBA', time=datetime(2023, 8, 18, 0, 0), home_odds='-150', away_odds='+130',
+                 home_team='Home', away_team='Away'),
+            Odds(id='late', sport='NBA', time=datetime(2023, 8, 18, 23, 59), home_odds='-150', away_odds='+130',
+                 home_team='Home', away_team='Away'),
+            Odds(id='next_day', sport='NBA', time=datetime(2023, 8, 19, 0, 0), home_odds='-150', away_odds='+130',
+                 home_team='Home', away_team='Away'),
+            Odds(id='other_sport', sport='NHL', time=datetime(2023, 8, 18, 12, 0), home_odds='-150', away_odds='+130',
+                 home_team='Home', away_team='Away'),
+        ])
+        await session.commit()
+
+    result = await get_stored_games(datetime(2023, 8, 18), 'NBA')
+
+    assert sorted(game.id for game in result.list) == ['late', 'midnight']
+
+@pytest.mark.asyncio
+async def test_games_on_date_query_uses_sport_time_index(sqlite_async_db):
+    compiled = games_on_date_query(datetime(2023, 8, 18), 'NBA').compile(dialect=sqlite.dialect())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    async with sqlite_async_db() as session:
+        connection = await session.connection()
+        plan = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        details = ' '.join(row[-1] for row in plan)
+
+    assert 'ix_odds_sport_time' in details
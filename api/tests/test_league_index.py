@@ -0,0 +1,146 @@
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock, Mock, patch
+from fastapi.testclient import TestClient
+
+from api.src.enhanced_mlb_analytics import EnhancedMLBAnalytics
+from api.src.league_index import LeagueIndex, bump_data_version
+from api.src.login import get_current_user
+from api.src.main import app
+from api.tests.helpers import count_queries
+
+SLATE_DATE = datetime(2024, 6, 15)
+
+
+@pytest.fixture
+def ml_service():
+    service = Mock(is_available=True)
+    service.predict.return_value = None
+    service.predict_many.side_effect = lambda rows: [None] * len(rows)
+    with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=service):
+        yield service
+
+
+@pytest.fixture
+async def league_index(mlb_feature_store_db, monkeypatch):
+    """A league index loaded from the seeded slate database and used by the analytics service."""
+    index = LeagueIndex()
+    assert await index.refresh()
+    monkeypatch.setattr('api.src.enhanced_mlb_analytics.get_league_index', lambda: index)
+    return index
+
+
+async def _store_results(analytics, ml_service):
+    """Analytics and ML feature rows computed from the database with the feature store."""
+    games = [await analytics.get_enhanced_game_analytics(game_id) for game_id in ['g1', 'g2', 'g3']]
+    slate = await analytics.get_slate_analytics(SLATE_DATE)
+    rows = [call.args[0] for call in ml_service.predict.call_args_list]
+    batch = ml_service.predict_many.call_args.args[0]
+    ml_service.reset_mock()
+    return games, slate, rows, batch
+
+
+@pytest.mark.asyncio
+async def test_index_matches_feature_store_analytics(mlb_feature_store_db, ml_service, monkeypatch):
+    analytics = EnhancedMLBAnalytics()
+    expected = await _store_results(analytics, ml_service)
+
+    index = LeagueIndex()
+    await index.refresh()
+    monkeypatch.setattr('api.src.enhanced_mlb_analytics.get_league_index', lambda: index)
+
+    assert await _store_results(analytics, ml_service) == expected
+
+
+@pytest.mark.asyncio
+async def test_game_analytics_only_query_the_game(league_index, mlb_feature_store_db, ml_service):
+    statements = count_queries(mlb_feature_store_db)
+
+    result = await EnhancedMLBAnalytics().get_enhanced_game_analytics('g1')
+
+    assert len(statements) == 1
+    assert 'FROM odds' in statements[0]
+    assert result.home_analytics.rolling_win_percentage is not None
+    ml_service.predict.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_slate_analytics_only_query_the_slate(league_index, mlb_feature_store_db, ml_service):
+    statements = count_queries(mlb_feature_store_db)
+
+    slate = await EnhancedMLBAnalytics().get_slate_analytics(SLATE_DATE)
+
+    assert len(statements) == 1
+    assert [game.id for game in slate.list] == ['g2', 'g1', 'g3']
+    # Mariners are not in the index, so the game gets a basic response
+    assert slate.list[2].home_analytics is None
+
+
+@pytest.mark.asyncio
+async def test_lookups_before_any_data(league_index):
+    league = league_index.data
+
+    assert league.team_form(1, date(2024, 6, 1), 10) is None
+    assert league.offensive_stats(1, date(2024, 5, 31)) is None
+    assert league.head_to_head(1, 2, date(2024, 6, 1)) == {'home_win_pct': 0.0, 'away_win_pct': 0.0, 'games_played': 0}
+    # Stats dated on the cutoff are included, games on the cutoff are not
+    assert league.offensive_stats(1, date(2024, 6, 10)).date == date(2024, 6, 10)
+    assert league.team_form(1, date(2024, 6, 2), 10).date == date(2024, 6, 1)
+
+
+@pytest.mark.asyncio
+async def test_form_is_partial_until_a_full_window(league_index):
+    form = league_index.data.team_form(1, date(2024, 6, 3), 10)
+
+    assert form.games_played < 10
+    assert form.rolling_win_pct is None
+    assert form.rolling_runs_scored is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_reloads_only_when_the_version_changes(league_index, mlb_feature_store_db):
+    assert league_index.data.version == 0
+    assert not await league_index.refresh()
+
+    async with mlb_feature_store_db() as session:
+        assert await session.run_sync(bump_data_version) == 1
+
+    assert await league_index.refresh()
+    assert league_index.data.version == 1
+    assert league_index.refresh_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_current_data(league_index):
+    data = league_index.data
+
+    with patch('api.src.league_index.async_session_scope', side_effect=RuntimeError('db down')):
+        assert not await league_index.refresh(force=True)
+
+    assert league_index.data is data
+    assert league_index.failure_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_report_size_and_refresh_time(league_index):
+    stats = league_index.get_stats()
+
+    assert stats['loaded']
+    assert stats['teams'] == 4
+    assert stats['games'] > 0
+    assert stats['offensive_stats'] == 12
+    assert stats['memory_bytes'] > 0
+    assert stats['last_refresh_seconds'] > 0
+
+
+def test_admin_endpoint_reports_index_stats():
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(username='testuser')
+    try:
+        with patch('api.src.main.get_league_index', return_value=LeagueIndex()):
+            response = TestClient(app).get('/admin/league-index')
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()['loaded'] is False
+    assert response.json()['memory_bytes'] == 0
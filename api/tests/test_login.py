@@ -2,17 +2,25 @@ from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 import pytest
 from api.src.config import ALGORITHM, SECRET_KEY
-from api.src.login import get_user_by_username
+from api.src.login import get_cached_user, get_user_by_username, invalidate_cached_user, user_cache
 from api.src.main import app
 from api.src.models.auth import AuthenticatedUser
 from api.src.models.tables import Users
+from api.tests.helpers import make_async_session
 import bcrypt
 import jwt
 
 client = TestClient(app)
 
-def test_get_user_by_username():
-    mock_session = MagicMock()
+def _assert_selected_user(mock_session, username):
+    mock_session.execute.assert_awaited_once()
+    statement = mock_session.execute.await_args.args[0]
+    assert statement.column_descriptions[0]['entity'] is Users
+    assert statement.compile().params == {'username_1': username}
+
+@pytest.mark.asyncio
+async def test_get_user_by_username():
+    mock_session = make_async_session()
     mock_user = MagicMock(spec=Users)
     mock_user.username = "testuser"
     mock_user.first_name = "Test"
@@ -20,15 +28,13 @@ def test_get_user_by_username():
     mock_user.email = "testuser@example.com"
     mock_user.password = "hashedpassword123"
 
-    mock_session.query.return_value.filter_by.return_value.first.return_value = mock_user
+    mock_session.execute.return_value.scalars.return_value.first.return_value = mock_user
 
-    with patch('api.src.login.connect_to_db', return_value=mock_session):
-        result = get_user_by_username("testuser")
+    with patch('shared.database.connect_to_async_db', return_value=mock_session):
+        result = await get_user_by_username("testuser")
 
-        assert mock_session.query.called
-        mock_session.query.assert_called_once_with(Users)
-        mock_session.query.return_value.filter_by.assert_called_once_with(username="testuser")
-        mock_session.query.return_value.filter_by.return_value.first.assert_called_once()
+        _assert_selected_user(mock_session, "testuser")
+        mock_session.execute.return_value.scalars.return_value.first.assert_called_once()
 
         assert isinstance(result, AuthenticatedUser)
         assert result.username == "testuser"
@@ -37,17 +43,16 @@ def test_get_user_by_username():
         assert result.email == "testuser@example.com"
         assert result.hashed_password == "hashedpassword123"
 
-def test_get_user_by_username_not_found():
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
+@pytest.mark.asyncio
+async def test_get_user_by_username_not_found():
+    mock_session = make_async_session()
+    mock_session.execute.return_value.scalars.return_value.first.return_value = None
 
-    with patch('api.src.login.connect_to_db', return_value=mock_session):
-        result = get_user_by_username("nonexistentuser")
+    with patch('shared.database.connect_to_async_db', return_value=mock_session):
+        result = await get_user_by_username("nonexistentuser")
 
-        assert mock_session.query.called
-        mock_session.query.assert_called_once_with(Users)
-        mock_session.query.return_value.filter_by.assert_called_once_with(username="nonexistentuser")
-        mock_session.query.return_value.filter_by.return_value.first.assert_called_once()
+        _assert_selected_user(mock_session, "nonexistentuser")
+        mock_session.execute.return_value.scalars.return_value.first.assert_called_once()
 
         assert result is None
 
@@ -122,4 +127,39 @@ def test_get_current_user_nonexistent_user():
         token = jwt.encode({"sub": "nonexistentuser"}, SECRET_KEY, algorithm=ALGORITHM)
         response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
         assert response.status_code == 401
-        assert response.json()["detail"] == "Could not validate credentials"
\ No newline at end of file
+        assert response.json()["detail"] == "Could not validate credentials"
+
+@pytest.mark.asyncio
+async def test_get_cached_user_reuses_lookup(mock_user):
+    with patch('api.src.login.get_user_by_username', return_value=mock_user) as mock_lookup:
+        first = await get_cached_user("testuser")
+        second = await get_cached_user("testuser")
+
+    assert first is second is mock_user
+    mock_lookup.assert_called_once_with("testuser")
+    assert user_cache.get_stats()['hits'] == 1
+
+@pytest.mark.asyncio
+async def test_get_cached_user_does_not_cache_missing_user(mock_user):
+    with patch('api.src.login.get_user_by_username', side_effect=[None, mock_user]):
+        assert await get_cached_user("testuser") is None
+        assert await get_cached_user("testuser") is mock_user
+
+@pytest.mark.asyncio
+async def test_invalidate_cached_user_forces_lookup(mock_user):
+    with patch('api.src.login.get_user_by_username', return_value=mock_user) as mock_lookup:
+        await get_cached_user("testuser")
+        invalidate_cached_user("testuser")
+        await get_cached_user("testuser")
+
+    assert mock_lookup.call_count == 2
+
+def test_authenticated_requests_share_cached_user(mock_user):
+    token = jwt.encode({"sub": "testuser"}, SECRET_KEY, algorithm=ALGORITHM)
+
+    with patch('api.src.login.get_user_by_username', return_value=mock_user) as mock_lookup:
+        for _ in range(3):
+            response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+
+    mock_lookup.assert_called_once()
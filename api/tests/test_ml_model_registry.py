@@ -0,0 +1,142 @@
+"""
+Tests for the MLB model registry.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api.src.ml_config import MLB_MODEL_CONFIG, MLB_REQUIRED_FEATURES, model_config_from_metadata
+from api.src.ml_model_registry import MLModelRegistry, UnknownModelError
+from api.src.ml_model_service import get_mlb_model_service
+from api.tests.helpers import save_model
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    """A models directory with three saved versions, used as MLB_MODELS_DIR."""
+    for version in ['1.0', '2.0', '3.0-xgb']:
+        save_model(tmp_path, version)
+    with patch('api.src.ml_config.MLB_MODELS_DIR', tmp_path):
+        yield tmp_path
+
+
+class TestModelConfigFromMetadata:
+
+    def test_config_from_training_metadata(self, tmp_path):
+        config = model_config_from_metadata(
+            tmp_path / 'mlb_predictor_v3.0-xgb_metadata.json',
+            {'model_type': 'xgboost', 'version': '3.0-xgb', 'model_filename': 'mlb_predictor_v3.0-xgb.joblib'}
+        )
+
+        assert config == {
+            'model_name': 'mlb_predictor',
+            'version': '3.0-xgb',
+            'model_file': 'mlb_predictor_v3.0-xgb.joblib',
+            'metadata_file': 'mlb_predictor_v3.0-xgb_metadata.json',
+            'model_type': 'XGBoostClassifier'
+        }
+
+    def test_config_falls_back_to_file_name(self, tmp_path):
+        config = model_config_from_metadata(tmp_path / 'mlb_predictor_v1.5_metadata.json', {})
+
+        assert config['version'] == '1.5'
+        assert config['model_file'] == 'mlb_predictor_v1.5.joblib'
+        assert config['model_type'] == 'unknown'
+
+
+class TestMLModelRegistry:
+
+    def test_indexes_every_metadata_file(self, models_dir):
+        (models_dir / 'broken_metadata.json').write_text('{not json')
+
+        registry = MLModelRegistry(models_dir=models_dir)
+
+        assert set(registry.configs) == {'1.0', '2.0', '3.0-xgb'}
+        assert registry.configs['2.0']['model_type'] == 'LogisticRegression'
+        assert registry.get_stats()['indexed'] == 3
+
+    def test_service_predicts_with_its_own_model(self, models_dir):
+        registry = MLModelRegistry(models_dir=models_dir)
+        features = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+
+        first = registry.get_service('1.0')
+        second = registry.get_service('2.0')
+
+        assert first.predict(features)[2]['ml_model_name'] == 'LogisticRegression-v1.0'
+        assert second.predict(features)[2]['ml_model_name'] == 'LogisticRegression-v2.0'
+        assert first._current.model is not second._current.model
+
+    def test_least_recently_used_model_is_evicted(self, models_dir):
+        registry = MLModelRegistry(models_dir=models_dir, max_resident=2)
+
+        one = registry.get_service('1.0')
+        registry.get_service('2.0')
+        assert registry.get_service('1.0') is one
+        registry.get_service('3.0-xgb')
+
+        stats = registry.get_stats()
+        assert stats['resident'] == ['1.0', '3.0-xgb']
+        assert stats['hits'] == 1
+        assert stats['loads'] == 3
+        assert stats['evictions'] == 1
+        assert registry.get_service('2.0') is not None
+        assert registry.get_stats()['resident'] == ['3.0-xgb', '2.0']
+
+    def test_memory_budget_keeps_only_the_newest_model(self, models_dir):
+        registry = MLModelRegistry(models_dir=models_dir, memory_budget_mb=0)
+
+        registry.get_service('1.0')
+        registry.get_service('2.0')
+
+        stats = registry.get_stats()
+        assert stats['resident'] == ['2.0']
+        assert stats['resident_bytes'] == (models_dir / 'mlb_predictor_v2.0.joblib').stat().st_size
+        assert stats['evictions'] == 1
+
+    def test_production_version_uses_global_service(self, models_dir):
+        save_model(models_dir, '3.0-rf-tw365', 'random_forest', model_filename=MLB_MODEL_CONFIG['model_file'])
+        registry = MLModelRegistry(models_dir=models_dir)
+
+        assert registry.get_service('3.0-rf-tw365') is get_mlb_model_service()
+        assert registry.get_stats()['resident'] == []
+        production = [model for model in registry.list_models() if model['is_production']]
+        assert [model['version'] for model in production] == ['3.0-rf-tw365']
+
+    def test_unknown_version_rescans_then_raises(self, models_dir):
+        registry = MLModelRegistry(models_dir=models_dir, refresh_interval=0)
+        assert '4.0' not in registry.configs
+
+        save_model(models_dir, '4.0')
+        assert registry.get_service('4.0').model_config['version'] == '4.0'
+
+        with pytest.raises(UnknownModelError):
+            registry.get_service('9.9')
+
+    def test_unknown_versions_rescan_at_most_once_per_interval(self, models_dir):
+        registry = MLModelRegistry(models_dir=models_dir, refresh_interval=60)
+        registry.configs
+        save_model(models_dir, '4.0')
+
+        with patch.object(registry, 'refresh', wraps=registry.refresh) as refresh:
+            for _ in range(3):
+                with pytest.raises(UnknownModelError):
+                    registry.get_service('4.0')
+            refresh.assert_not_called()
+
+            with patch('api.src.ml_model_registry.time.monotonic', return_value=time.monotonic() + 61):
+                assert registry.get_service('4.0').model_config['version'] == '4.0'
+            refresh.assert_called_once()
+
+    def test_list_models(self, models_dir):
+        (models_dir / 'mlb_predictor_v2.0.joblib').unlink()
+        registry = MLModelRegistry(models_dir=models_dir)
+        registry.get_service('1.0')
+
+        models = {model['version']: model for model in registry.list_models()}
+
+        assert models['1.0']['is_resident'] is True
+        assert models['2.0']['is_resident'] is False
+        assert models['2.0']['is_available'] is False
+        assert models['3.0-xgb']['ml_model_name'] == 'LogisticRegression-v3.0-xgb'
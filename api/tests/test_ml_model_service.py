@@ -3,18 +3,27 @@ Tests for the ML Model Service.
 """
 
 import pytest
+import asyncio
 import json
+import os
 import tempfile
+import threading
+import time
+import warnings
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import joblib
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
+from fastapi.testclient import TestClient
 
-from api.src.ml_model_service import MLModelService, get_mlb_model_service
+from api.src.compiled_model import export_compiled_model, get_compiled_path
+from api.src.main import app
+from api.src.ml_model_service import MLModelService, ModelWatcher, get_mlb_model_service
 from api.src.ml_config import MLB_REQUIRED_FEATURES
 
 
@@ -97,9 +106,8 @@ class TestMLModelService:
         service = MLModelService(model_config=mock_model_config)
 
         assert service.model_config == mock_model_config
-        assert service._model is None
-        assert service._metadata is None
-        assert service._is_loaded is False
+        assert service._current is None
+        assert service.model_version == 0
         assert service._load_error is None
 
     def test_is_available_no_model(self, mock_model_config):
@@ -132,8 +140,9 @@ class TestMLModelService:
 
         assert result is True
         assert service.is_loaded is True
-        assert service._model is not None
-        assert service._metadata == sample_metadata
+        assert service._current.model is not None
+        assert service._current.metadata == sample_metadata
+        assert service.model_version == 1
         assert service._load_error is None
 
     def test_load_model_file_not_found(self, temp_model_dir, mock_model_config):
@@ -146,7 +155,7 @@ class TestMLModelService:
 
         assert result is False
         assert service.is_loaded is False
-        assert service._model is None
+        assert service._current is None
         assert 'not found' in service._load_error.lower()
 
     def test_load_model_without_metadata(self, temp_model_dir, mock_model_config, sample_trained_model):
@@ -164,9 +173,43 @@ class TestMLModelService:
 
         assert result is True
         assert service.is_loaded is True
-        assert service._metadata is not None
-        assert service._metadata['model_type'] == 'RandomForestClassifier'
-        assert service._metadata['version'] == '1.0'
+        assert service._current.metadata['model_type'] == 'RandomForestClassifier'
+        assert service._current.metadata['version'] == '1.0'
+
+    def test_model_fitted_on_a_frame_scores_arrays_without_warnings(self, temp_model_dir, mock_model_config):
+        """Column names a model was fitted with are checked and dropped at load time."""
+        X = pd.DataFrame(np.random.rand(100, len(MLB_REQUIRED_FEATURES)), columns=MLB_REQUIRED_FEATURES)
+        y = np.random.randint(0, 2, 100)
+        pipeline = Pipeline([('scaler', StandardScaler()), ('model', RandomForestClassifier(n_estimators=5))]).fit(X, y)
+        model_path = temp_model_dir / mock_model_config['model_file']
+        joblib.dump(pipeline, model_path)
+
+        with patch('api.src.ml_model_service.get_model_path', return_value=model_path), \
+                patch('api.src.ml_model_service.get_metadata_path', return_value=temp_model_dir / 'metadata.json'):
+            service = MLModelService(model_config=mock_model_config)
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                result = service.predict(dict.fromkeys(MLB_REQUIRED_FEATURES, 0.5))
+
+        assert result is not None
+        assert not hasattr(service._current.model, 'feature_names_in_')
+
+    def test_model_fitted_on_other_columns_is_not_loaded(self, temp_model_dir, mock_model_config):
+        """A model fitted with the features in another order would score the wrong columns."""
+        columns = MLB_REQUIRED_FEATURES[::-1]
+        X = pd.DataFrame(np.random.rand(100, len(columns)), columns=columns)
+        y = np.random.randint(0, 2, 100)
+        pipeline = Pipeline([('scaler', StandardScaler()), ('model', RandomForestClassifier(n_estimators=5))]).fit(X, y)
+        model_path = temp_model_dir / mock_model_config['model_file']
+        joblib.dump(pipeline, model_path)
+
+        with patch('api.src.ml_model_service.get_model_path', return_value=model_path), \
+                patch('api.src.ml_model_service.get_metadata_path', return_value=temp_model_dir / 'metadata.json'):
+            service = MLModelService(model_config=mock_model_config)
+            result = service._load_model()
+
+        assert result is False
+        assert 'MLB_REQUIRED_FEATURES' in service._load_error
 
     def test_predict_success(self, ml_service_with_model):
         """Test successful prediction."""
@@ -241,6 +284,128 @@ class TestMLModelService:
 
             assert result is None
 
+    def test_predict_many_matches_predict(self, ml_service_with_model):
+        """Test batch predictions match single predictions row for row."""
+        rng = np.random.default_rng(7)
+        rows = [dict(zip(MLB_REQUIRED_FEATURES, rng.random(len(MLB_REQUIRED_FEATURES)))) for _ in range(15)]
+
+        results = ml_service_with_model.predict_many(rows)
+
+        assert len(results) == 15
+        for row, result in zip(rows, results):
+            assert result == ml_service_with_model.predict(row)
+
+    def test_predict_many_single_predict_proba_call(self, ml_service_with_model):
+        """Test a batch is scored with one predict_proba call and no predict call."""
+        ml_service_with_model._load_model()
+        model = ml_service_with_model._current.model
+        rows = [{feature: 0.1 * i for feature in MLB_REQUIRED_FEATURES} for i in range(10)]
+
+        with patch.object(model, 'predict_proba', wraps=model.predict_proba) as predict_proba, \
+                patch.object(model, 'predict', wraps=model.predict) as predict:
+            ml_service_with_model.predict_many(rows)
+
+        predict_proba.assert_called_once()
+        assert len(predict_proba.call_args.args[0]) == 10
+        predict.assert_not_called()
+
+    def test_predict_single_predict_proba_call(self, ml_service_with_model):
+        """Test a single prediction runs the model once and matches its predicted class."""
+        ml_service_with_model._load_model()
+        model = ml_service_with_model._current.model
+        features = {feature: 0.3 for feature in MLB_REQUIRED_FEATURES}
+
+        with patch.object(model, 'predict_proba', wraps=model.predict_proba) as predict_proba, \
+                patch.object(model, 'predict', wraps=model.predict) as predict:
+            predicted_winner, _, _ = ml_service_with_model.predict(features)
+
+        predict_proba.assert_called_once()
+        predict.assert_not_called()
+        assert predict_proba.call_args.args[0].dtype == np.float32
+        expected = model.predict(ml_service_with_model.feature_vector(features).reshape(1, -1))[0]
+        assert predicted_winner == ('home' if expected == 1 else 'away')
+
+    def test_predict_array_vector_and_matrix(self, ml_service_with_model):
+        """Test predict_array accepts one float32 vector or an (n, features) matrix."""
+        rng = np.random.default_rng(3)
+        matrix = rng.random((4, len(MLB_REQUIRED_FEATURES)), dtype=np.float32)
+        rows = [dict(zip(MLB_REQUIRED_FEATURES, row)) for row in matrix.tolist()]
+
+        results = ml_service_with_model.predict_array(matrix.copy())
+
+        assert results == [ml_service_with_model.predict(row) for row in rows]
+        assert ml_service_with_model.predict_array(matrix[0].copy()) == results[:1]
+
+    def test_feature_vector_fills_preallocated_array(self):
+        """Test features are packed in MLB_REQUIRED_FEATURES order, with None as NaN."""
+        features = {feature: float(i) for i, feature in enumerate(MLB_REQUIRED_FEATURES)}
+        features[MLB_REQUIRED_FEATURES[0]] = None
+        out = np.zeros(len(MLB_REQUIRED_FEATURES), dtype=np.float32)
+
+        vector = MLModelService.feature_vector(features, out=out)
+
+        assert vector is out
+        assert np.isnan(vector[0])
+        assert vector[1:].tolist() == list(range(1, len(MLB_REQUIRED_FEATURES)))
+
+    def test_feature_importance_computed_once_per_load(self, ml_service_with_model):
+        """Test top importances are cached at load time and reused by every prediction."""
+        features = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+
+        with patch.object(ml_service_with_model, '_top_feature_importance',
+                          wraps=ml_service_with_model._top_feature_importance) as top:
+            first = ml_service_with_model.predict(features)
+            ml_service_with_model.predict_many([features] * 3)
+            second = ml_service_with_model.predict(features)
+
+        top.assert_called_once()
+        assert len(first[2]['feature_importance']) == 5
+        assert second[2]['feature_importance'] is first[2]['feature_importance']
+        assert list(first[2]['feature_importance'].values()) == sorted(
+            first[2]['feature_importance'].values(), reverse=True
+        )
+
+    def test_predict_many_missing_features(self, ml_service_with_model):
+        """Test rows missing features get None without failing the batch."""
+        rows = [
+            {feature: 0.5 for feature in MLB_REQUIRED_FEATURES},
+            {'home_rolling_win_pct': 0.6},
+            {feature: 0.2 for feature in MLB_REQUIRED_FEATURES}
+        ]
+
+        results = ml_service_with_model.predict_many(rows)
+
+        assert results[0] is not None
+        assert results[1] is None
+        assert results[2] is not None
+
+    def test_predict_many_validates_rows_together(self, ml_service_with_model, caplog):
+        """Test only incomplete rows are reported, and extra keys and None values are accepted."""
+        complete = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+        rows = [
+            {**complete, 'game_id': 'g1'},
+            {**complete, MLB_REQUIRED_FEATURES[0]: None},
+            {feature: 0.5 for feature in MLB_REQUIRED_FEATURES[1:]},
+        ]
+
+        with caplog.at_level('WARNING', logger='api.src.ml_model_service'):
+            results = ml_service_with_model.predict_many(rows)
+
+        assert results[0] == ml_service_with_model.predict(complete)
+        assert results[1] == ml_service_with_model.predict({**complete, MLB_REQUIRED_FEATURES[0]: 0.0})
+        assert results[2] is None
+        warnings = [record.getMessage() for record in caplog.records]
+        assert len(warnings) == 1
+        assert 'row 2' in warnings[0] and MLB_REQUIRED_FEATURES[0] in warnings[0]
+
+    def test_predict_many_empty_and_unloaded(self, mock_model_config):
+        """Test batch prediction with no rows or no model."""
+        with patch('api.src.ml_model_service.model_exists', return_value=False):
+            service = MLModelService(model_config=mock_model_config)
+
+            assert service.predict_many([]) == []
+            assert service.predict_many([{feature: 0.5 for feature in MLB_REQUIRED_FEATURES}] * 2) == [None, None]
+
     def test_get_model_info_with_loaded_model(self, ml_service_with_model):
         """Test get_model_info with a loaded model."""
         # Force load the model
@@ -284,12 +449,91 @@ class TestMLModelService:
                 # Load initially
                 service._load_model()
                 assert service.is_loaded is True
+                assert service.model_version == 1
 
                 # Reload
                 result = service.reload_model()
 
                 assert result is True
                 assert service.is_loaded is True
+                assert service.model_version == 2
+
+    def test_warmup_loads_model_and_reports_timings(self, ml_service_with_model):
+        """Test warmup loads the model, runs one prediction and records cold-start timings."""
+        with patch.object(ml_service_with_model, 'predict_many', wraps=ml_service_with_model.predict_many) as predict_many:
+            stats = ml_service_with_model.warmup()
+
+        predict_many.assert_called_once()
+        assert ml_service_with_model.is_loaded is True
+        assert stats['warmed_up'] is True
+        assert stats['loaded'] is True
+        assert 0 < stats['load_seconds'] <= stats['warmup_seconds']
+        assert stats['error'] is None
+
+    def test_warmup_without_model_still_finishes(self, mock_model_config, temp_model_dir):
+        """Test warmup completes without a model, so readiness isn't blocked on a missing file."""
+        with patch('api.src.ml_model_service.get_model_path', return_value=temp_model_dir / 'missing.joblib'):
+            stats = MLModelService(model_config=mock_model_config).warmup()
+
+        assert stats['warmed_up'] is True
+        assert stats['loaded'] is False
+        assert stats['load_seconds'] is None
+        assert 'not found' in stats['error'].lower()
+
+    def test_concurrent_loads_read_the_model_once(self, ml_service_with_model):
+        """Test a request arriving during warmup waits for the load instead of repeating it."""
+        with patch.object(ml_service_with_model, '_read_model', wraps=ml_service_with_model._read_model) as read_model:
+            threads = [threading.Thread(target=ml_service_with_model._load_model) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        read_model.assert_called_once()
+        assert ml_service_with_model.model_version == 1
+
+    @pytest.mark.asyncio
+    async def test_request_during_slow_warmup_falls_back_without_blocking(self, ml_service_with_model):
+        """A prediction while warmup is loading returns None at once instead of waiting on the load lock."""
+        service = ml_service_with_model
+        features = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+        read_model = service._read_model
+        loading = threading.Event()
+
+        def slow_read_model():
+            loading.set()
+            time.sleep(0.5)
+            return read_model()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with patch.object(service, '_read_model', side_effect=slow_read_model):
+            warmup = asyncio.create_task(asyncio.to_thread(service.warmup))
+            await asyncio.to_thread(loading.wait, 5)
+            ticking = asyncio.create_task(ticker())
+
+            start = time.perf_counter()
+            # Called on the event loop thread, as a request handler would
+            result = service.predict(features)
+            elapsed = time.perf_counter() - start
+            await asyncio.sleep(0.1)
+
+            assert result is None
+            assert elapsed < 0.1
+            assert ticks > 0
+            assert not warmup.done()
+
+            stats = await warmup
+            ticking.cancel()
+
+        assert stats['loaded'] is True
+        assert service.predict(features) is not None
 
     def test_singleton_pattern(self):
         """Test that get_mlb_model_service returns singleton instance."""
@@ -311,6 +555,253 @@ class TestMLModelService:
 
             mock_load.assert_called_once()
 
+    def test_is_available_checks_the_file_once(self, mock_model_config):
+        """Test availability is cached instead of stat-ing the model file per prediction."""
+        with patch('api.src.ml_model_service.model_exists', return_value=True) as exists:
+            service = MLModelService(model_config=mock_model_config)
+            assert service.is_available is True
+            assert service.is_available is True
+
+        exists.assert_called_once()
+
+
+class TestModelHotReload:
+    """Tests for hot-reloading the model when its files change."""
+
+    @pytest.fixture
+    def model_files(self, tmp_path):
+        """Model and metadata files with a trained model, and a service reading them."""
+        model_path = tmp_path / 'model.joblib'
+        metadata_path = tmp_path / 'metadata.json'
+        joblib.dump(self._pipeline(10), model_path)
+        with open(metadata_path, 'w') as f:
+            json.dump({'model_type': 'RandomForestClassifier', 'version': '1.0'}, f)
+
+        with patch('api.src.ml_model_service.get_model_path', return_value=model_path), \
+                patch('api.src.ml_model_service.get_metadata_path', return_value=metadata_path), \
+                patch('api.src.ml_model_service.model_exists', side_effect=lambda config: model_path.exists()):
+            yield MLModelService(), model_path
+
+    @staticmethod
+    def _pipeline(trees):
+        X = np.random.rand(100, len(MLB_REQUIRED_FEATURES))
+        y = np.random.randint(0, 2, 100)
+        return Pipeline([
+            ('scaler', StandardScaler()),
+            ('model', RandomForestClassifier(n_estimators=trees, random_state=42))
+        ]).fit(X, y)
+
+    @staticmethod
+    def _touch(path):
+        """Move a file's mtime forward, as a retrained model written later would."""
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_unchanged_files_are_not_reloaded(self, model_files):
+        service, _ = model_files
+        service._load_model()
+
+        with patch.object(service, '_read_model') as read_model:
+            assert service.check_for_update() is False
+
+        read_model.assert_not_called()
+        assert service.model_version == 1
+
+    def test_new_model_file_is_swapped_in(self, model_files):
+        service, model_path = model_files
+        service._load_model()
+        old = service._current
+
+        joblib.dump(self._pipeline(20), model_path)
+        self._touch(model_path)
+
+        assert service.check_for_update() is True
+        assert service.model_version == 2
+        assert len(service._current.model.named_steps['model'].estimators_) == 20
+        # A prediction holding the old model still sees it whole
+        assert len(old.model.named_steps['model'].estimators_) == 10
+        assert service.reload_count == 1
+        assert service.last_reloaded_at is not None
+
+    def test_broken_model_file_keeps_current_model(self, model_files):
+        service, model_path = model_files
+        service._load_model()
+        features = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+        before = service.predict(features)
+
+        model_path.write_bytes(b'not a model')
+        self._touch(model_path)
+
+        assert service.check_for_update() is False
+        assert service.model_version == 1
+        assert service.predict(features) == before
+        assert service.reload_failure_count == 1
+
+        # The same broken file isn't retried on every poll
+        with patch.object(service, '_read_model') as read_model:
+            assert service.check_for_update() is False
+        read_model.assert_not_called()
+
+    def test_model_written_while_loading_is_not_installed(self, model_files):
+        service, model_path = model_files
+        real_load = joblib.load
+
+        def load_during_write(path):
+            model = real_load(path)
+            self._touch(model_path)
+            return model
+
+        with patch('api.src.ml_model_service.joblib.load', side_effect=load_during_write):
+            assert service._load_model() is False
+        assert 'changed while loading' in service._load_error
+
+        # The next load sees the finished file
+        assert service._load_model() is True
+        assert service.model_version == 1
+
+    def test_check_for_update_refreshes_availability(self, model_files):
+        service, model_path = model_files
+        assert service.is_available is True
+
+        model_path.unlink()
+        assert service.check_for_update() is False
+        assert service.is_available is False
+
+        joblib.dump(self._pipeline(10), model_path)
+        assert service.check_for_update() is False
+        assert service.is_available is True
+
+    def test_nothing_loaded_is_not_reloaded(self, model_files):
+        """Test the watcher leaves the first load to warmup or the first prediction."""
+        service, _ = model_files
+
+        assert service.check_for_update() is False
+        assert service.is_loaded is False
+        assert service.reload_count == 0
+
+    def test_load_while_waiting_for_the_lock_is_not_repeated(self, model_files):
+        service, model_path = model_files
+        service._load_model()
+        joblib.dump(self._pipeline(20), model_path)
+        self._touch(model_path)
+        results = []
+        checked = threading.Thread(target=lambda: results.append(service.check_for_update()))
+
+        # Another reload reads the new files while the check waits for the lock
+        with service._load_lock:
+            checked.start()
+            time.sleep(0.05)
+            service._reload()
+            read_model = patch.object(service, '_read_model').start()
+        checked.join()
+        patch.stopall()
+
+        assert results == [False]
+        read_model.assert_not_called()
+        assert service.model_version == 2
+        assert service.reload_count == 1
+
+    @pytest.mark.asyncio
+    async def test_watcher_waits_before_first_check(self, model_files):
+        service, _ = model_files
+        watcher = ModelWatcher(service, poll_interval=3600)
+
+        watcher.start()
+        await asyncio.sleep(0.01)
+        stats = watcher.get_stats()
+        await watcher.stop()
+
+        assert stats['checks'] == 0
+        assert service.is_loaded is False
+
+    @pytest.mark.asyncio
+    async def test_watcher_polls_and_reloads(self, model_files):
+        service, model_path = model_files
+        service._load_model()
+        watcher = ModelWatcher(service, poll_interval=0.01)
+
+        watcher.start()
+        joblib.dump(self._pipeline(20), model_path)
+        self._touch(model_path)
+        for _ in range(200):
+            if service.model_version == 2:
+                break
+            await asyncio.sleep(0.01)
+        stats = watcher.get_stats()
+        await watcher.stop()
+
+        assert stats['polling'] is True
+        assert stats['checks'] >= 1
+        assert stats['model_version'] == 2
+        assert stats['reloads'] == 1
+        assert stats['reload_failures'] == 0
+        assert watcher.get_stats()['polling'] is False
+
+
+class TestCompiledModelServing:
+    """Test cases for scoring with a model's compiled arrays."""
+
+    FEATURES = [{feature: 0.1 * i for i, feature in enumerate(MLB_REQUIRED_FEATURES)},
+                {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}]
+
+    @pytest.fixture
+    def model_path(self, tmp_path):
+        """A saved random forest pipeline with its compiled arrays next to it."""
+        model_path = tmp_path / 'model.joblib'
+        pipeline = TestModelHotReload._pipeline(10)
+        joblib.dump(pipeline, model_path)
+        export_compiled_model(pipeline, model_path)
+
+        with patch('api.src.ml_model_service.get_model_path', return_value=model_path), \
+                patch('api.src.ml_model_service.get_metadata_path', return_value=tmp_path / 'metadata.json'):
+            yield model_path
+
+    def test_compiled_model_scores_small_batches(self, model_path):
+        service = MLModelService()
+        service._load_model()
+        current = service._current
+
+        with patch.object(current.model, 'predict_proba', wraps=current.model.predict_proba) as model_predict:
+            results = service.predict_many(self.FEATURES)
+
+        model_predict.assert_not_called()
+        assert service.get_warmup_stats()['compiled'] is True
+        with patch('api.src.ml_model_service.ML_COMPILED_MODEL_ENABLED', False):
+            uncompiled = MLModelService()
+            assert uncompiled.predict_many(self.FEATURES) == results
+            assert uncompiled._current.compiled is None
+
+    def test_large_batches_use_the_model(self, model_path):
+        service = MLModelService()
+        service._load_model()
+
+        with patch('api.src.ml_model_service.ML_COMPILED_MAX_ROWS', 1), \
+                patch.object(service._current.compiled, 'predict_proba') as compiled_predict:
+            assert all(service.predict_many(self.FEATURES))
+
+        compiled_predict.assert_not_called()
+
+    def test_mismatched_compiled_model_is_ignored(self, model_path):
+        export_compiled_model(TestModelHotReload._pipeline(20), model_path)
+
+        service = MLModelService()
+
+        assert service._load_model() is True
+        assert service._current.compiled is None
+        assert service.get_warmup_stats()['compiled'] is False
+
+    def test_new_compiled_file_is_reloaded(self, model_path):
+        service = MLModelService()
+        compiled_path = get_compiled_path(model_path)
+        compiled_path.unlink()
+        service._load_model()
+        assert service._current.compiled is None
+
+        export_compiled_model(joblib.load(model_path), model_path)
+
+        assert service.check_for_update() is True
+        assert service._current.compiled is not None
+
 
 class TestMLModelServiceIntegration:
     """Integration tests for ML Model Service with real sklearn models."""
@@ -434,5 +925,59 @@ class TestMLModelServiceIntegration:
         assert isinstance(meta['feature_importance'], dict)
 
 
+class TestReadiness:
+    """Test cases for the startup warmup hook and /ready endpoint."""
+
+    @pytest.fixture
+    def service(self):
+        service = MLModelService()
+        with patch('api.src.main.get_mlb_model_service', return_value=service):
+            yield service
+
+    def test_not_ready_until_warmup_finishes(self, service):
+        client = TestClient(app)
+
+        with patch('api.src.main.ML_WARMUP_ENABLED', True):
+            before = client.get('/ready')
+            service.warmed_up_at = datetime.now()
+            after = client.get('/ready')
+
+        assert before.status_code == 503
+        assert before.json()['ready'] is False
+        assert after.status_code == 200
+        assert after.json()['ml_model']['warmed_up'] is True
+
+    def test_ready_without_warmup(self, service):
+        response = TestClient(app).get('/ready')
+
+        assert response.status_code == 200
+        assert response.json()['ready'] is True
+        assert response.json()['ml_model']['warmed_up'] is False
+
+    def test_lifespan_warms_up_model(self, service):
+        with patch('api.src.main.ML_WARMUP_ENABLED', True), \
+                patch('api.src.main.LEAGUE_INDEX_ENABLED', False), \
+                patch.object(service, 'warmup', side_effect=lambda: setattr(service, 'warmed_up_at', datetime.now())) as warmup:
+            with TestClient(app) as client:
+                # Warmup runs in a worker thread; shutdown waits for it
+                pass
+            response = client.get('/ready')
+
+        warmup.assert_called_once()
+        assert response.status_code == 200
+
+    def test_failed_warmup_does_not_skip_shutdown(self, service):
+        with patch('api.src.main.ML_WARMUP_ENABLED', True), \
+                patch('api.src.main.LEAGUE_INDEX_ENABLED', False), \
+                patch.object(service, 'warmup', side_effect=RuntimeError('boom')), \
+                patch('api.src.main.close_odds_client', new_callable=AsyncMock) as close_odds_client, \
+                patch('api.src.main.dispose_async_engines', new_callable=AsyncMock) as dispose_async_engines:
+            with TestClient(app):
+                pass
+
+        close_odds_client.assert_awaited_once()
+        dispose_async_engines.assert_awaited_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, '-v'])
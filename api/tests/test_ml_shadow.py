@@ -0,0 +1,199 @@
+"""
+Tests for shadow scoring of challenger models.
+"""
+
+import asyncio
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import select
+
+from api.src.enhanced_mlb_analytics import EnhancedMLBAnalytics
+from api.src.ml_config import MLB_REQUIRED_FEATURES
+from api.src.ml_model_registry import MLModelRegistry
+from api.src.ml_shadow import ShadowGame, ShadowScorer
+from api.src.models.tables import MLShadowPrediction
+from api.tests.helpers import save_model
+from machine_learning.data.models.mlb_models import MLBSchedule
+
+GAME = ShadowGame('g1', datetime(2024, 6, 15, 19, 10), 1, 2)
+FEATURES = {feature: 0.5 for feature in MLB_REQUIRED_FEATURES}
+
+
+def games(count):
+    """Distinct games between the same teams."""
+    return [GAME._replace(game_id=f'g{i}') for i in range(count)]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """A model registry over a directory with two challenger models."""
+    for version in ['3.0-xgb', '4.0']:
+        save_model(tmp_path, version)
+    registry = MLModelRegistry(models_dir=tmp_path)
+    with patch('api.src.ml_config.MLB_MODELS_DIR', tmp_path), \
+            patch('api.src.ml_shadow.get_mlb_model_registry', return_value=registry):
+        yield registry
+
+
+@pytest.fixture
+async def scorer(registry):
+    """A running scorer that only flushes when a test asks it to."""
+    scorer = ShadowScorer(models=['3.0-xgb', '4.0'], flush_interval=3600)
+    scorer.start()
+    yield scorer
+    await scorer.stop()
+
+
+async def recorded_predictions(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(MLShadowPrediction).order_by(MLShadowPrediction.model_version))
+        return result.scalars().all()
+
+
+class TestShadowScorer:
+
+    def test_submit_is_ignored_when_not_running(self):
+        scorer = ShadowScorer(models=['4.0'])
+
+        scorer.submit([GAME], [FEATURES])
+
+        assert scorer.get_stats()['queued'] == 0
+        assert scorer.get_stats()['pending'] == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_records_each_challenger_prediction(self, sqlite_async_db, registry, scorer):
+        scorer.submit([GAME], [FEATURES])
+
+        assert await scorer.flush() == 2
+
+        rows = await recorded_predictions(sqlite_async_db)
+        assert [row.model_version for row in rows] == ['3.0-xgb', '4.0']
+        assert [row.ml_model_name for row in rows] == ['LogisticRegression-v3.0-xgb', 'LogisticRegression-v4.0']
+        for row in rows:
+            assert (row.game_id, row.game_time, row.home_team_id, row.away_team_id) == GAME
+            assert 0 <= row.home_win_probability <= 1
+        expected = registry.get_service('4.0').predict(FEATURES)[2]['home_win_probability']
+        assert rows[1].home_win_probability == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    async def test_rows_are_scored_in_batches(self, sqlite_async_db, registry):
+        scorer = ShadowScorer(models=['4.0'], batch_size=2, flush_interval=3600)
+        scorer.start()
+        service = registry.get_service('4.0')
+
+        with patch.object(service, 'predict_many', wraps=service.predict_many) as predict_many:
+            scorer.submit(games(5), [FEATURES] * 5)
+            await scorer.flush()
+        await scorer.stop()
+
+        assert [len(call.args[0]) for call in predict_many.call_args_list] == [2, 2, 1]
+        assert scorer.get_stats()['recorded'] == 5
+
+    @pytest.mark.asyncio
+    async def test_rows_beyond_max_pending_are_dropped(self, sqlite_async_db, registry):
+        scorer = ShadowScorer(models=['4.0'], max_pending=2, flush_interval=3600)
+        scorer.start()
+
+        scorer.submit(games(3), [FEATURES] * 3)
+        stats = scorer.get_stats()
+        await scorer.stop()
+
+        assert (stats['queued'], stats['dropped'], stats['pending']) == (2, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_game_is_queued_again_only_when_its_features_change(self, sqlite_async_db, registry, scorer):
+        changed = {**FEATURES, MLB_REQUIRED_FEATURES[0]: 0.9}
+
+        for features in [FEATURES, FEATURES, changed, changed]:
+            scorer.submit([GAME], [features])
+            await scorer.flush()
+
+        rows = await recorded_predictions(sqlite_async_db)
+        assert len(rows) == 4  # two feature rows, each scored by both models
+        assert (scorer.get_stats()['queued'], scorer.get_stats()['duplicates']) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_does_not_stop_the_others(self, sqlite_async_db, registry):
+        scorer = ShadowScorer(models=['9.9', '4.0'], flush_interval=3600)
+        scorer.start()
+
+        scorer.submit([GAME], [FEATURES])
+        await scorer.flush()
+        await scorer.stop()
+
+        assert [row.model_version for row in await recorded_predictions(sqlite_async_db)] == ['4.0']
+        assert scorer.get_stats()['failures'] == 1
+
+    @pytest.mark.asyncio
+    async def test_background_task_flushes_and_stop_drains(self, sqlite_async_db, registry):
+        scorer = ShadowScorer(models=['4.0'], flush_interval=0.01)
+        scorer.start()
+
+        scorer.submit([GAME], [FEATURES])
+        for _ in range(200):
+            if scorer.get_stats()['recorded']:
+                break
+            await asyncio.sleep(0.01)
+        scorer.submit(games(1), [FEATURES])
+        await scorer.stop()
+
+        assert scorer.get_stats()['recorded'] == 2
+        assert scorer.get_stats()['running'] is False
+
+    @pytest.mark.asyncio
+    async def test_predictions_join_with_schedule_results(self, sqlite_async_db, registry, scorer):
+        async with sqlite_async_db() as session:
+            session.add(MLBSchedule(id=1, game_id='s1', date=date(2024, 6, 15), home_team_id=1,
+                                    away_team_id=2, home_score=5, away_score=3, status='Final'))
+            await session.commit()
+
+        scorer.submit([GAME], [FEATURES])
+        await scorer.flush()
+
+        async with sqlite_async_db() as session:
+            joined = (await session.execute(
+                select(MLShadowPrediction.model_version, MLBSchedule.home_score > MLBSchedule.away_score)
+                .join(MLBSchedule, (MLBSchedule.home_team_id == MLShadowPrediction.home_team_id)
+                      & (MLBSchedule.away_team_id == MLShadowPrediction.away_team_id)
+                      & (MLBSchedule.date == date(2024, 6, 15)))
+                .order_by(MLShadowPrediction.model_version)
+            )).all()
+        assert joined == [('3.0-xgb', True), ('4.0', True)]
+
+
+class TestAnalyticsSubmitShadowRows:
+    """Analytics hand the production feature rows to the shadow scorer."""
+
+    @pytest.fixture
+    def ml_service(self):
+        ml_service = Mock(is_available=True, model_version=1)
+        ml_service.predict.return_value = None
+        ml_service.predict_many.side_effect = lambda rows: [None] * len(rows)
+        with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=ml_service):
+            yield ml_service
+
+    @pytest.fixture
+    def shadow_scorer(self):
+        shadow_scorer = Mock(running=True)
+        with patch('api.src.enhanced_mlb_analytics.get_shadow_scorer', return_value=shadow_scorer):
+            yield shadow_scorer
+
+    @pytest.mark.asyncio
+    async def test_game_features_are_submitted(self, mlb_slate_db, ml_service, shadow_scorer):
+        await EnhancedMLBAnalytics().get_enhanced_game_analytics('g1')
+
+        shadow_scorer.submit.assert_called_once_with(
+            [ShadowGame('g1', datetime(2024, 6, 15, 19, 10), 1, 2)], [ml_service.predict.call_args.args[0]]
+        )
+
+    @pytest.mark.asyncio
+    async def test_slate_features_are_submitted_in_one_call(self, mlb_slate_db, ml_service, shadow_scorer):
+        await EnhancedMLBAnalytics().get_slate_analytics(datetime(2024, 6, 15))
+
+        shadow_scorer.submit.assert_called_once()
+        games, feature_rows = shadow_scorer.submit.call_args.args
+        # g3's home team has no data, so it has no feature row
+        assert [(game.game_id, game.home_team_id, game.away_team_id) for game in games] == [('g2', 3, 4), ('g1', 1, 2)]
+        assert feature_rows == ml_service.predict_many.call_args.args[0]
@@ -85,7 +85,7 @@ def test_get_mlb_game_analytics(client):
         assert "key_factors" in response_data
         
         # Verify the enhanced analytics service was called with the correct game_id
-        mock_analytics.assert_called_once_with(game_id)
+        mock_analytics.assert_called_once_with(game_id, None)
 
 
 def test_get_mlb_model_info_with_loaded_model(client):
@@ -315,4 +315,99 @@ def test_mlb_game_analytics_with_rule_based_fallback(client):
         # Verify fallback to rule-based
         assert response_data["prediction_method"] == "rule_based"
         assert response_data["ml_model_name"] is None
-        assert response_data["ml_confidence"] is None
\ No newline at end of file
+        assert response_data["ml_confidence"] is None
+
+def test_mlb_slate_analytics(client):
+    """
+    Test the /analytics/mlb/games?date={date} endpoint.
+    """
+    from api.src.models.mlb_analytics import MlbAnalyticsResponse, MlbSlateAnalyticsResponse
+
+    mock_response = MlbSlateAnalyticsResponse(
+        date="2024-06-15",
+        list=[
+            MlbAnalyticsResponse(id="g1", home_team="Red Sox", away_team="Yankees",
+                                 predicted_winner="Red Sox", win_probability=0.6, prediction_method="rule_based"),
+            MlbAnalyticsResponse(id="g2", home_team="Orioles", away_team="Rays",
+                                 predicted_winner="Rays", win_probability=0.55, prediction_method="rule_based")
+        ]
+    )
+
+    with patch("api.src.mlb_analytics.get_enhanced_mlb_slate_analytics") as mock_analytics:
+        mock_analytics.return_value = mock_response
+
+        response = client.get("/analytics/mlb/games?date=2024-06-15")
+        assert response.status_code == 200
+
+        response_data = response.json()
+        assert response_data["date"] == "2024-06-15"
+        assert [game["id"] for game in response_data["list"]] == ["g1", "g2"]
+
+        called_date = mock_analytics.call_args.args[0]
+        assert called_date.strftime("%Y-%m-%d") == "2024-06-15"
+
+
+def test_mlb_slate_analytics_invalid_date(client):
+    """
+    Test the /analytics/mlb/games endpoint rejects malformed dates.
+    """
+    with patch("api.src.mlb_analytics.get_enhanced_mlb_slate_analytics") as mock_analytics:
+        response = client.get("/analytics/mlb/games?date=06-15-2024")
+
+        assert response.status_code == 400
+        assert "Invalid date format" in response.json()["detail"]
+        mock_analytics.assert_not_called()
+
+
+def test_mlb_game_analytics_with_model_version(client):
+    """
+    Test the /analytics/mlb/game endpoint passes the requested model version through.
+    """
+    from api.src.models.mlb_analytics import MlbAnalyticsResponse
+
+    mock_response = MlbAnalyticsResponse(id="g1", home_team="Red Sox", away_team="Yankees",
+                                         predicted_winner="Red Sox", win_probability=0.6)
+
+    with patch("api.src.mlb_analytics.get_enhanced_mlb_game_analytics") as mock_analytics:
+        mock_analytics.return_value = mock_response
+
+        response = client.get("/analytics/mlb/game?id=g1&model=3.0-xgb")
+
+        assert response.status_code == 200
+        mock_analytics.assert_called_once_with("g1", "3.0-xgb")
+
+
+def test_mlb_analytics_unknown_model_version(client):
+    """
+    Test the analytics endpoints return 404 for a model version that isn't in the registry.
+    """
+    from api.src.ml_model_registry import UnknownModelError
+
+    with patch("api.src.mlb_analytics.get_enhanced_mlb_game_analytics", side_effect=UnknownModelError("9.9")), \
+            patch("api.src.mlb_analytics.get_enhanced_mlb_slate_analytics", side_effect=UnknownModelError("9.9")):
+        game = client.get("/analytics/mlb/game?id=g1&model=9.9")
+        slate = client.get("/analytics/mlb/games?date=2024-06-15&model=9.9")
+
+    assert game.status_code == 404
+    assert slate.status_code == 404
+    assert "9.9" in game.json()["detail"]
+
+
+def test_mlb_models_lists_model_directory(client):
+    """
+    Test the /analytics/mlb/models endpoint lists every model with metadata in the models directory.
+    """
+    from api.src.ml_config import MLB_MODEL_CONFIG
+    from api.src.ml_model_registry import MLModelRegistry
+
+    with patch("api.src.mlb_analytics.get_mlb_model_registry", return_value=MLModelRegistry()):
+        response = client.get("/analytics/mlb/models")
+
+    assert response.status_code == 200
+    models = {model["version"]: model for model in response.json()["list"]}
+    assert {"1.0", "3.0-xgb", "4.0"} <= set(models)
+    assert models["3.0-xgb"]["ml_model_type"] == "XGBoostClassifier"
+    production = [model for model in models.values() if model["is_production"]]
+    assert [model["ml_model_name"] for model in production] == [
+        f"{MLB_MODEL_CONFIG['model_type']}-v{production[0]['version']}"
+    ]
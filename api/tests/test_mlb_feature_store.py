@@ -0,0 +1,189 @@
+import pandas as pd
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from machine_learning.analysis.mlb_feature_engineering import GameFeatureGenerator
+from machine_learning.analysis.mlb_time_series import TeamTimeSeriesAnalyzer
+from machine_learning.data.models.mlb_models import MLBHeadToHead, MLBSchedule, MLBTeam, MLBTeamState
+from machine_learning.data.processing.mlb_feature_store import MLBFeatureStore
+from shared.database import Base
+
+BASE_DATE = datetime(2024, 4, 1)
+
+
+def _make_schedule() -> pd.DataFrame:
+    """Three teams over twelve days, with a doubleheader, a tie and a postponed game."""
+    games = []
+    for i in range(12):
+        home, away = [(1, 2), (2, 3), (3, 1)][i % 3]
+        games.append({
+            'date': BASE_DATE + timedelta(days=i),
+            'home_team_id': home,
+            'away_team_id': away,
+            'home_score': (i * 7) % 5,
+            'away_score': (i * 3) % 4,
+            'status': 'Final',
+        })
+    games.append({
+        'date': BASE_DATE + timedelta(days=6), 'home_team_id': 1, 'away_team_id': 2,
+        'home_score': 1, 'away_score': 6, 'status': 'Final',
+    })
+    games.append({
+        'date': BASE_DATE + timedelta(days=7), 'home_team_id': 2, 'away_team_id': 1,
+        'home_score': 4, 'away_score': 4, 'status': 'Final',
+    })
+    games.append({
+        'date': BASE_DATE + timedelta(days=8), 'home_team_id': 1, 'away_team_id': 3,
+        'home_score': None, 'away_score': None, 'status': 'Postponed',
+    })
+    return pd.DataFrame(games)
+
+
+def _state_for(states: pd.DataFrame, team_id: int, game_date: datetime) -> dict:
+    prior = states[(states['team_id'] == team_id) & (states['date'] < game_date.date())]
+    return prior.sort_values('date').iloc[-1].to_dict() if not prior.empty else {}
+
+
+class TestComputeTeamStates:
+    def test_matches_training_rolling_stats_before_every_game(self):
+        schedule = _make_schedule()
+        store = MLBFeatureStore(rolling_window=3)
+        generator = GameFeatureGenerator(rolling_window=3)
+        rolling_stats = TeamTimeSeriesAnalyzer(window_size=3).calculate_rolling_stats(
+            schedule, pd.DataFrame({'id': [1, 2, 3]})
+        )
+
+        states = store.compute_team_states(schedule)
+
+        for game_date in schedule['date'].unique():
+            game_date = pd.Timestamp(game_date).to_pydatetime()
+            for team_id in [1, 2, 3]:
+                expected = generator._get_recent_stats(team_id, game_date, rolling_stats)
+                state = _state_for(states, team_id, game_date)
+                assert bool(state) == bool(expected)
+                for column in ['games_played', 'rolling_win_pct', 'rolling_runs_scored',
+                               'rolling_runs_allowed', 'streak']:
+                    if pd.isna(expected.get(column)):
+                        assert pd.isna(state.get(column))
+                    else:
+                        assert state[column] == pytest.approx(expected[column])
+
+    def test_doubleheader_stores_state_after_second_game(self):
+        states = MLBFeatureStore(rolling_window=3).compute_team_states(_make_schedule())
+
+        doubleheader = states[(states['team_id'] == 1) & (states['date'] == date(2024, 4, 7))]
+
+        assert len(doubleheader) == 1
+        # Team 1 played on days 0, 2, 3 and 5, then twice on day 6
+        assert doubleheader.iloc[0]['games_played'] == 6
+
+    def test_empty_schedule(self):
+        schedule = _make_schedule().iloc[0:0]
+
+        assert MLBFeatureStore().compute_team_states(schedule).empty
+
+
+class TestComputeHeadToHead:
+    def test_matches_training_head_to_head_before_every_game(self):
+        schedule = _make_schedule()
+        store = MLBFeatureStore(head_to_head_window=3)
+        generator = GameFeatureGenerator(head_to_head_window=3)
+
+        records = store.compute_head_to_head(schedule)
+
+        for game_date in schedule['date'].unique():
+            game_date = pd.Timestamp(game_date).to_pydatetime()
+            for home, away in [(1, 2), (2, 1), (2, 3), (3, 1)]:
+                expected = generator._get_head_to_head_features(home, away, game_date, schedule)
+                team_a, team_b = min(home, away), max(home, away)
+                prior = records[
+                    (records['team_a_id'] == team_a) & (records['team_b_id'] == team_b) &
+                    (records['date'] < game_date.date())
+                ]
+                if prior.empty:
+                    assert expected['games_played'] == 0
+                    continue
+                record = prior.sort_values('date').iloc[-1]
+                home_wins = record['team_a_wins'] if home == team_a else record['team_b_wins']
+                away_wins = record['team_b_wins'] if home == team_a else record['team_a_wins']
+                assert record['games_played'] == expected['games_played']
+                assert round(home_wins / record['games_played'], 3) == expected['home_win_pct']
+                assert round(away_wins / record['games_played'], 3) == expected['away_win_pct']
+
+    def test_tie_counts_as_a_win_for_neither_team(self):
+        records = MLBFeatureStore().compute_head_to_head(_make_schedule())
+
+        tie_day = records[(records['team_a_id'] == 1) & (records['team_b_id'] == 2) &
+                          (records['date'] == date(2024, 4, 8))].iloc[0]
+
+        assert tie_day['team_a_wins'] + tie_day['team_b_wins'] < tie_day['games_played']
+
+
+@pytest.fixture
+def sync_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([MLBTeam(id=team_id, name=f'Team {team_id}') for team_id in [1, 2, 3]])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_games(session, schedule: pd.DataFrame):
+    session.add_all([
+        MLBSchedule(
+            game_id=f'{row.date:%Y%m%d}-{row.home_team_id}-{row.away_team_id}-{index}',
+            date=row.date.date(),
+            home_team_id=row.home_team_id,
+            away_team_id=row.away_team_id,
+            home_score=None if pd.isna(row.home_score) else int(row.home_score),
+            away_score=None if pd.isna(row.away_score) else int(row.away_score),
+            status=row.status
+        )
+        for index, row in schedule.iterrows()
+    ])
+    session.commit()
+
+
+def _stored(session, model) -> list:
+    columns = model.__table__.columns.keys()
+    return sorted(tuple(getattr(row, column) for column in columns) for row in session.query(model))
+
+
+class TestRefresh:
+    def test_incremental_refresh_matches_full_rebuild(self, sync_session):
+        schedule = _make_schedule()
+        cutoff = BASE_DATE + timedelta(days=9)
+        store = MLBFeatureStore(rolling_window=3, head_to_head_window=3)
+
+        _add_games(sync_session, schedule[schedule['date'] < cutoff])
+        first = store.refresh(sync_session)
+        _add_games(sync_session, schedule[schedule['date'] >= cutoff])
+        second = store.refresh(sync_session)
+        incremental = (_stored(sync_session, MLBTeamState), _stored(sync_session, MLBHeadToHead))
+
+        store.refresh(sync_session, since=date.min)
+        rebuilt = (_stored(sync_session, MLBTeamState), _stored(sync_session, MLBHeadToHead))
+
+        assert first['team_states'] > 0
+        # Only the lookback window and the new days are rewritten
+        assert second['team_states'] < first['team_states']
+        assert incremental == rebuilt
+
+    def test_refresh_rewrites_only_rows_since_date(self, sync_session):
+        _add_games(sync_session, _make_schedule())
+        store = MLBFeatureStore()
+        store.refresh(sync_session)
+        sync_session.query(MLBTeamState).update({MLBTeamState.games_played: -1})
+        sync_session.commit()
+
+        store.refresh(sync_session, since=date(2024, 4, 10))
+
+        kept = sync_session.query(MLBTeamState).filter(MLBTeamState.date < date(2024, 4, 10)).all()
+        rewritten = sync_session.query(MLBTeamState).filter(MLBTeamState.date >= date(2024, 4, 10)).all()
+        assert kept and all(state.games_played == -1 for state in kept)
+        assert rewritten and all(state.games_played > 0 for state in rewritten)
@@ -0,0 +1,148 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from api.src.enhanced_mlb_analytics import EnhancedMLBAnalytics
+from api.src.ml_config import MLB_REQUIRED_FEATURES
+from api.tests.helpers import count_queries
+
+# Date of the slate seeded by the mlb_slate_db fixture
+SLATE_DATE = datetime(2024, 6, 15)
+
+@pytest.fixture
+def no_model():
+    with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service') as get_service:
+        get_service.return_value = Mock(is_available=False)
+        yield get_service
+
+@pytest.mark.asyncio
+async def test_slate_matches_per_game_analytics(mlb_slate_db, no_model):
+    analytics = EnhancedMLBAnalytics()
+
+    slate = await analytics.get_slate_analytics(SLATE_DATE)
+
+    assert slate.date == '2024-06-15'
+    assert [game.id for game in slate.list] == ['g2', 'g1', 'g3']
+    for game in slate.list:
+        assert game == await analytics.get_enhanced_game_analytics(game.id)
+
+@pytest.mark.asyncio
+async def test_slate_features_match_per_game_features(mlb_slate_db):
+    analytics = EnhancedMLBAnalytics()
+    service = Mock(is_available=True)
+    service.predict_many.return_value = [None, None]
+    service.predict.return_value = None
+
+    with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=service):
+        await analytics.get_slate_analytics(SLATE_DATE)
+        for game_id in ['g2', 'g1']:
+            await analytics.get_enhanced_game_analytics(game_id)
+
+    batch_rows = service.predict_many.call_args.args[0]
+    single_rows = [call.args[0] for call in service.predict.call_args_list]
+    assert batch_rows == single_rows
+
+@pytest.mark.asyncio
+async def test_slate_query_count_does_not_grow_with_games(mlb_slate_db, no_model):
+    analytics = EnhancedMLBAnalytics()
+    statements = count_queries(mlb_slate_db)
+
+    await analytics.get_slate_analytics(SLATE_DATE)
+    slate_queries = len(statements)
+
+    statements.clear()
+    await analytics.get_enhanced_game_analytics('g1')
+    single_game_queries = len(statements)
+
+    # Slate, teams, feature store states, team form and head-to-head,
+    # offensive stats, defensive stats
+    assert slate_queries == 6
+    assert slate_queries < single_game_queries
+
+@pytest.mark.asyncio
+async def test_slate_reads_feature_store(mlb_feature_store_db, no_model):
+    statements = count_queries(mlb_feature_store_db)
+
+    await EnhancedMLBAnalytics().get_slate_analytics(SLATE_DATE)
+
+    # Slate, teams, states, offensive stats, defensive stats, stored head-to-head
+    assert len(statements) == 6
+    assert not any('mlb_schedule' in s for s in statements)
+
+@pytest.mark.asyncio
+async def test_slate_matches_per_game_analytics_with_feature_store(mlb_feature_store_db, no_model):
+    analytics = EnhancedMLBAnalytics()
+
+    slate = await analytics.get_slate_analytics(SLATE_DATE)
+
+    for game in slate.list:
+        assert game == await analytics.get_enhanced_game_analytics(game.id)
+
+@pytest.mark.asyncio
+async def test_schedule_aggregates_match_feature_store(mlb_feature_store_db):
+    service = Mock(is_available=True)
+    service.predict.return_value = None
+    service.predict_many.side_effect = lambda rows: [None] * len(rows)
+    stored, aggregated = EnhancedMLBAnalytics(), EnhancedMLBAnalytics()
+    aggregated.use_feature_store = False
+
+    results = []
+    with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=service):
+        for analytics in [stored, aggregated]:
+            games = [await analytics.get_enhanced_game_analytics(game_id) for game_id in ['g1', 'g2']]
+            slate = await analytics.get_slate_analytics(SLATE_DATE)
+            rows = [call.args[0] for call in service.predict.call_args_list]
+            results.append((games, slate, rows, service.predict_many.call_args.args[0]))
+            service.reset_mock()
+
+    assert results[0] == results[1]
+
+@pytest.mark.asyncio
+async def test_schedule_is_read_with_one_windowed_query(mlb_slate_db, no_model):
+    statements = count_queries(mlb_slate_db)
+
+    await EnhancedMLBAnalytics().get_slate_analytics(SLATE_DATE)
+
+    schedule_queries = [s for s in statements if 'mlb_schedule' in s]
+    assert len(schedule_queries) == 1
+    assert 'row_number() OVER' in schedule_queries[0]
+
+@pytest.mark.asyncio
+async def test_slate_scores_all_games_with_one_batch(mlb_slate_db):
+    service = Mock(is_available=True)
+    service.predict_many.return_value = [
+        ('away', 0.7, {
+            'ml_model_name': 'test-v1', 'model_confidence': 'High', 'home_win_probability': 0.3,
+            'away_win_probability': 0.7, 'feature_importance': None, 'use_ml_prediction': True
+        }),
+        ('home', 0.52, {
+            'ml_model_name': 'test-v1', 'model_confidence': 'Low', 'home_win_probability': 0.52,
+            'away_win_probability': 0.48, 'feature_importance': None, 'use_ml_prediction': False
+        }),
+    ]
+
+    with patch('api.src.enhanced_mlb_analytics.get_mlb_model_service', return_value=service):
+        slate = await EnhancedMLBAnalytics().get_slate_analytics(SLATE_DATE)
+
+    service.predict_many.assert_called_once()
+    service.predict.assert_not_called()
+    rows = service.predict_many.call_args.args[0]
+    assert len(rows) == 2
+    assert all(set(MLB_REQUIRED_FEATURES) <= set(row) for row in rows)
+
+    g2, g1, g3 = slate.list
+    assert g2.prediction_method == 'machine_learning'
+    assert g2.predicted_winner == 'Rays'
+    assert g2.away_win_probability == 0.7
+    # Not confident enough, so the rule-based prediction is used
+    assert g1.prediction_method == 'rule_based'
+    # Mariners have no team data, so the game gets a basic response
+    assert g3.prediction_method == 'rule_based'
+    assert g3.home_analytics is None
+
+@pytest.mark.asyncio
+async def test_slate_with_no_games(mlb_slate_db, no_model):
+    slate = await EnhancedMLBAnalytics().get_slate_analytics(datetime(2024, 7, 1))
+
+    assert slate.date == '2024-07-01'
+    assert slate.list == []
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from api.src import odds_client
+from api.src.games import call_odds_api
+from api.src.odds_client import OddsApiClient, get_odds_client
+
+SAMPLE_ODDS = [{'id': 'game1', 'home_team': 'Home Team', 'away_team': 'Away Team'}]
+
+@pytest.fixture
+def client(odds_stub_server):
+    odds_stub_server.body = SAMPLE_ODDS
+    return OddsApiClient(url_template=odds_stub_server.url_template, timeout=2, max_retries=2, backoff=0.01)
+
+@pytest.mark.asyncio
+async def test_get_odds_returns_decoded_json(client, odds_stub_server):
+    result = await client.get_odds('baseball_mlb')
+
+    assert result == SAMPLE_ODDS
+    assert odds_stub_server.requests[0]['path'].startswith('/v4/sports/baseball_mlb/odds/')
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_get_odds_requests_gzip(client, odds_stub_server):
+    await client.get_odds('baseball_mlb')
+
+    assert 'gzip' in odds_stub_server.requests[0]['headers']['Accept-Encoding']
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_sequential_requests_reuse_connection(client, odds_stub_server):
+    for _ in range(5):
+        await client.get_odds('baseball_mlb')
+
+    assert len(odds_stub_server.requests) == 5
+    assert len(odds_stub_server.connections) == 1
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_with_backoff(client, odds_stub_server):
+    odds_stub_server.statuses = [503, 429]
+
+    with patch('api.src.odds_client.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        result = await client.get_odds('baseball_mlb')
+
+    assert result == SAMPLE_ODDS
+    assert len(odds_stub_server.requests) == 3
+    assert [c.args[0] for c in mock_sleep.await_args_list] == [0.01, 0.02]
+    await client.aclose()
+
+def test_retry_delay_is_capped():
+    client = OddsApiClient(url_template='http://odds.test/{sport}', backoff=1, max_backoff=5)
+
+    assert client._retry_delay(0, httpx.Response(429, headers={'Retry-After': '2'})) == 2
+    assert client._retry_delay(0, httpx.Response(429, headers={'Retry-After': '86400'})) == 5
+    assert client._retry_delay(10) == 5
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(client, odds_stub_server):
+    odds_stub_server.statuses = [503, 503, 503]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_odds('baseball_mlb')
+
+    assert len(odds_stub_server.requests) == 3
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(client, odds_stub_server):
+    odds_stub_server.statuses = [401]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_odds('baseball_mlb')
+
+    assert len(odds_stub_server.requests) == 1
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_slow_response_times_out(odds_stub_server):
+    odds_stub_server.delay = 0.5
+    client = OddsApiClient(url_template=odds_stub_server.url_template, timeout=0.1, max_retries=0)
+
+    with pytest.raises(httpx.TimeoutException):
+        await client.get_odds('baseball_mlb')
+    await client.aclose()
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_do_not_block_event_loop(client, odds_stub_server):
+    odds_stub_server.delay = 0.2
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.get_odds('baseball_mlb') for _ in range(5)))
+    elapsed = time.perf_counter() - start
+
+    assert results == [SAMPLE_ODDS] * 5
+    # Five 200ms responses served concurrently, not back to back
+    assert elapsed < 0.8
+    await client.aclose()
+
+def test_get_odds_client_returns_singleton(monkeypatch):
+    monkeypatch.setattr(odds_client, '_odds_client', None)
+
+    assert get_odds_client() is get_odds_client()
+
+@pytest.mark.asyncio
+async def test_call_odds_api_uses_shared_client():
+    mock_client = AsyncMock()
+    mock_client.get_odds.return_value = SAMPLE_ODDS
+
+    with patch('api.src.games.get_odds_client', return_value=mock_client):
+        result = await call_odds_api('basketball_nba')
+
+    assert result == SAMPLE_ODDS
+    mock_client.get_odds.assert_awaited_once_with('basketball_nba')
@@ -0,0 +1,85 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from api.src.games import upsert_odds
+from api.src.login import get_current_user
+from api.src.main import app
+from api.src.models.games import Game
+from api.src.models.odds_history import OddsHistoryResponse, OddsSnapshot
+from api.src.models.tables import OddsHistory
+from api.src.odds_history import get_odds_history
+from api.src.utils import implied_probability, parse_american_odds
+
+@pytest.fixture
+def client():
+    async def override_get_current_user():
+        return MagicMock(username="testuser")
+
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def _game(home_odds, away_odds, game_id='game_1'):
+    return Game(id=game_id, sport='MLB', homeTeam='Home', awayTeam='Away',
+                time='2023-08-18 20:00', homeOdds=home_odds, awayOdds=away_odds)
+
+async def _history(factory):
+    async with factory() as session:
+        result = await session.execute(select(OddsHistory).order_by(OddsHistory.captured_at))
+        return [(row.game_id, row.home_odds, row.away_odds) for row in result.scalars()]
+
+@pytest.mark.asyncio
+async def test_ingest_appends_snapshot_for_new_game(sqlite_async_db):
+    await upsert_odds([_game('-150', '+130')])
+
+    assert await _history(sqlite_async_db) == [('game_1', -150, 130)]
+
+@pytest.mark.asyncio
+async def test_ingest_appends_only_moved_lines(sqlite_async_db):
+    await upsert_odds([_game('-150', '+130'), _game('+110', '-130', game_id='game_2')])
+    await upsert_odds([_game('-150', '+130'), _game('+120', '-140', game_id='game_2')])
+    await upsert_odds([_game('-160', '+140'), _game('+120', '-140', game_id='game_2')])
+
+    history = await _history(sqlite_async_db)
+    assert [row for row in history if row[0] == 'game_1'] == [('game_1', -150, 130), ('game_1', -160, 140)]
+    assert [row for row in history if row[0] == 'game_2'] == [('game_2', 110, -130), ('game_2', 120, -140)]
+
+@pytest.mark.asyncio
+async def test_get_odds_history_returns_line_movement_in_order(sqlite_async_db):
+    async with sqlite_async_db() as session:
+        session.add_all([
+            OddsHistory(game_id='game_1', captured_at=datetime(2023, 8, 18, 12, 0), home_odds=-110, away_odds=-110),
+            OddsHistory(game_id='game_1', captured_at=datetime(2023, 8, 18, 9, 0), home_odds=100, away_odds=-120),
+            OddsHistory(game_id='game_2', captured_at=datetime(2023, 8, 18, 10, 0), home_odds=150, away_odds=-170),
+        ])
+        await session.commit()
+
+    result = await get_odds_history('game_1')
+
+    assert [s.capturedAt for s in result.list] == ['2023-08-18 09:00:00', '2023-08-18 12:00:00']
+    assert result.list[0].homeOdds == 100
+    assert result.list[1].homeProbability == pytest.approx(110 / 210)
+
+def test_odds_history_endpoint(client):
+    history = OddsHistoryResponse(id='game_1', list=[OddsSnapshot(capturedAt='2023-08-18 09:00:00', homeOdds=-110, awayOdds=-110)])
+
+    with patch('api.src.main.get_odds_history', return_value=history) as mock_history:
+        response = client.get("/odds/history?id=game_1")
+
+    assert response.status_code == 200
+    assert response.json()['list'][0]['homeOdds'] == -110
+    mock_history.assert_called_once_with('game_1')
+
+@pytest.mark.parametrize("formatted, expected", [("+150", 150), ("-200", -200), ("None", None), (None, None)])
+def test_parse_american_odds(formatted, expected):
+    assert parse_american_odds(formatted) == expected
+
+@pytest.mark.parametrize("odds, expected", [(100, 0.5), (-200, 2 / 3), (300, 0.25)])
+def test_implied_probability(odds, expected):
+    assert implied_probability(odds) == pytest.approx(expected)
+
+def test_implied_probability_without_line():
+    assert implied_probability(None) is None
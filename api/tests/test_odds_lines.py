@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from api.src.games import get_stored_games, parse_response_and_store_games
+from api.src.odds_lines import Line, best_lines, parse_game_lines
+
+def _bookmaker(key, h2h=None, spreads=None, totals=None):
+    markets = []
+    if h2h:
+        markets.append({'key': 'h2h', 'outcomes': [
+            {'name': 'Home Team', 'price': h2h[0]}, {'name': 'Away Team', 'price': h2h[1]}]})
+    if spreads:
+        markets.append({'key': 'spreads', 'outcomes': [
+            {'name': 'Home Team', 'price': spreads[1], 'point': spreads[0]},
+            {'name': 'Away Team', 'price': spreads[3], 'point': spreads[2]}]})
+    if totals:
+        markets.append({'key': 'totals', 'outcomes': [
+            {'name': 'Over', 'price': totals[1], 'point': totals[0]},
+            {'name': 'Under', 'price': totals[3], 'point': totals[2]}]})
+    return {'key': key, 'markets': markets}
+
+def _game_data(*bookmakers):
+    return {
+        'id': 'test_game_id',
+        'home_team': 'Home Team',
+        'away_team': 'Away Team',
+        'commence_time': '2023-08-18T20:00:00Z',
+        'bookmakers': list(bookmakers)
+    }
+
+GAME = _game_data(
+    _bookmaker('fanduel', h2h=(1.5, 2.5), spreads=(-1.5, 2.1, 1.5, 1.7), totals=(8.5, 1.9, 8.5, 1.9)),
+    _bookmaker('draftkings', h2h=(1.55, 2.4), spreads=(-1.0, 1.8, 1.0, 2.0), totals=(8.0, 1.8, 9.0, 1.8)),
+    _bookmaker('betmgm', h2h=(1.45, 2.6))
+)
+
+def test_parse_game_lines_keeps_configured_books_and_markets():
+    lines = parse_game_lines(GAME, {'fanduel', 'draftkings'}, {'h2h', 'totals'})
+
+    assert set(lines) == {'h2h', 'totals'}
+    assert lines['h2h'] == [Line('fanduel', 1.5, 2.5), Line('draftkings', 1.55, 2.4)]
+    assert lines['totals'][1] == Line('draftkings', 1.8, 1.8, 8.0, 9.0)
+
+def test_best_lines_across_books():
+    best = best_lines(parse_game_lines(GAME, {'fanduel', 'draftkings', 'betmgm'}, {'h2h', 'spreads', 'totals'}))
+
+    assert (best.home.bookmaker, best.home.odds) == ('draftkings', '-182')
+    assert (best.away.bookmaker, best.away.odds) == ('betmgm', '+160')
+    # Most points wins for spreads, lowest total for overs and highest for unders
+    assert (best.homeSpread.bookmaker, best.homeSpread.point) == ('draftkings', -1.0)
+    assert (best.awaySpread.bookmaker, best.awaySpread.point) == ('fanduel', 1.5)
+    assert (best.over.bookmaker, best.over.point) == ('draftkings', 8.0)
+    assert (best.under.bookmaker, best.under.point) == ('draftkings', 9.0)
+
+def test_best_lines_missing_markets_are_none():
+    best = best_lines(parse_game_lines(GAME, {'betmgm'}, {'h2h', 'spreads', 'totals'}))
+
+    assert best.home.bookmaker == 'betmgm'
+    assert best.homeSpread is None
+    assert best.over is None
+
+@pytest.mark.asyncio
+async def test_primary_bookmaker_sets_game_odds():
+    with patch('api.src.games.ODDS_BOOKMAKERS', ['fanduel', 'draftkings', 'betmgm']), \
+         patch('api.src.games.upsert_odds'):
+        games = await parse_response_and_store_games([GAME], 'MLB')
+
+    assert (games[0].homeOdds, games[0].awayOdds) == ('-200', '+150')
+    assert games[0].bestLines.home.bookmaker == 'draftkings'
+
+@pytest.mark.asyncio
+async def test_best_line_used_when_primary_bookmaker_missing():
+    game = _game_data(_bookmaker('draftkings', h2h=(1.55, 2.4)), _bookmaker('betmgm', h2h=(1.45, 2.6)))
+
+    with patch('api.src.games.ODDS_BOOKMAKERS', ['draftkings', 'betmgm']), \
+         patch('api.src.games.upsert_odds'):
+        games = await parse_response_and_store_games([game], 'MLB')
+
+    assert (games[0].homeOdds, games[0].awayOdds) == ('-182', '+160')
+
+@pytest.mark.asyncio
+async def test_games_without_moneyline_are_skipped():
+    game = _game_data(_bookmaker('fanduel', totals=(8.5, 1.9, 8.5, 1.9)))
+
+    with patch('api.src.games.upsert_odds'):
+        games = await parse_response_and_store_games([game], 'MLB')
+
+    assert games == []
+
+@pytest.mark.asyncio
+async def test_best_lines_are_stored_at_ingest(sqlite_async_db):
+    with patch('api.src.games.ODDS_BOOKMAKERS', ['fanduel', 'draftkings', 'betmgm']):
+        await parse_response_and_store_games([GAME], 'MLB')
+
+    stored = await get_stored_games(datetime(2023, 8, 18), 'MLB')
+
+    assert stored.list[0].bestLines.away.bookmaker == 'betmgm'
+    assert stored.list[0].bestLines.over.point == 8.0
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from api.src import odds_refresher
+from api.src.odds_refresher import OddsRefresher, QUOTA_WINDOW
+from api.src.single_flight import SingleFlight
+
+@pytest.fixture
+def refresher(monkeypatch):
+    monkeypatch.setattr(odds_refresher, 'odds_refreshes', SingleFlight('odds-refresh'))
+    monkeypatch.setattr(odds_refresher, 'get_odds_client', lambda: MagicMock(requests_remaining=None))
+    return OddsRefresher(lead=300, min_interval=60, max_interval=3600, jitter=0, max_calls_per_hour=3, min_remaining=10)
+
+@pytest.mark.asyncio
+async def test_refresh_sport_schedules_ahead_of_expiry(refresher):
+    next_expiry = datetime.now() + timedelta(minutes=30)
+
+    with patch('api.src.odds_refresher.refresh_odds', new_callable=AsyncMock) as mock_refresh, \
+         patch('api.src.odds_refresher.get_next_expiry', return_value=next_expiry):
+        await refresher.refresh_sport('MLB')
+
+    mock_refresh.assert_awaited_once_with('MLB', 'baseball_mlb')
+    # Due five minutes (the lead) before the 30 minute expiry
+    assert refresher.next_run['MLB'] - time.monotonic() == pytest.approx(25 * 60, abs=2)
+    assert refresher.refresh_count == 1
+
+@pytest.mark.asyncio
+async def test_schedule_is_clamped_to_interval_bounds(refresher):
+    with patch('api.src.odds_refresher.get_next_expiry', return_value=datetime.now() - timedelta(hours=1)):
+        assert await refresher._seconds_until_due('MLB') == 60
+
+    with patch('api.src.odds_refresher.get_next_expiry', return_value=None):
+        assert await refresher._seconds_until_due('MLB') == 3600
+
+@pytest.mark.asyncio
+async def test_jitter_is_added_to_schedule(refresher):
+    refresher.jitter = 30
+
+    with patch('api.src.odds_refresher.get_next_expiry', return_value=None), \
+         patch('api.src.odds_refresher.random.uniform', return_value=12.5) as mock_uniform:
+        delay = await refresher._seconds_until_due('MLB')
+
+    mock_uniform.assert_called_once_with(0, 30)
+    assert delay == 3600 + 12.5
+
+@pytest.mark.asyncio
+async def test_hourly_budget_skips_refreshes(refresher):
+    with patch('api.src.odds_refresher.refresh_odds', new_callable=AsyncMock) as mock_refresh, \
+         patch('api.src.odds_refresher.get_next_expiry', return_value=None):
+        for sport in ['NBA', 'MLB', 'NFL', 'NHL']:
+            await refresher.refresh_sport(sport)
+
+    assert mock_refresh.await_count == 3
+    assert refresher.skipped_count == 1
+    # Retried once the oldest call leaves the quota window
+    assert refresher.next_run['NHL'] == pytest.approx(refresher._calls[0] + QUOTA_WINDOW)
+
+@pytest.mark.asyncio
+async def test_low_account_quota_skips_refresh(refresher, monkeypatch):
+    monkeypatch.setattr(odds_refresher, 'get_odds_client', lambda: MagicMock(requests_remaining=5))
+
+    with patch('api.src.odds_refresher.refresh_odds', new_callable=AsyncMock) as mock_refresh:
+        await refresher.refresh_sport('MLB')
+
+    mock_refresh.assert_not_awaited()
+    assert refresher.skipped_count == 1
+
+@pytest.mark.asyncio
+async def test_failed_refresh_retries_after_min_interval(refresher):
+    with patch('api.src.odds_refresher.refresh_odds', side_effect=RuntimeError('upstream down')):
+        await refresher.refresh_sport('MLB')
+
+    assert refresher.failure_count == 1
+    assert refresher.next_run['MLB'] - time.monotonic() == pytest.approx(60, abs=2)
+
+@pytest.mark.asyncio
+async def test_failed_expiry_lookup_counts_refresh_and_retries_after_min_interval(refresher):
+    with patch('api.src.odds_refresher.refresh_odds', new_callable=AsyncMock), \
+         patch('api.src.odds_refresher.get_next_expiry', side_effect=RuntimeError('database down')):
+        await refresher.refresh_sport('MLB')
+
+    assert refresher.refresh_count == 1
+    assert refresher.failure_count == 0
+    assert refresher.next_run['MLB'] - time.monotonic() == pytest.approx(60, abs=2)
+
+@pytest.mark.asyncio
+async def test_start_refreshes_all_sports_and_stop_cancels(refresher):
+    with patch('api.src.odds_refresher.refresh_odds', new_callable=AsyncMock) as mock_refresh, \
+         patch('api.src.odds_refresher.get_next_expiry', return_value=None):
+        refresher.max_calls_per_hour = 10
+        refresher.start()
+        for _ in range(200):
+            if refresher.refresh_count == len(odds_refresher.SPORTS):
+                break
+            await asyncio.sleep(0.01)
+        assert refresher.get_stats()['running'] is True
+        await refresher.stop()
+
+    assert {c.args[1] for c in mock_refresh.await_args_list} == set(odds_refresher.SPORTS.values())
+    assert refresher.get_stats()['running'] is False
@@ -0,0 +1,150 @@
+import asyncio
+import gc
+import statistics
+import time
+
+import bcrypt
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+
+from api.src import games
+from api.src.cache import TTLCache
+from api.src.login import get_current_user
+from api.src.main import app
+from api.src.models.auth import AuthenticatedUser
+from api.src.models.games import GamesResponse
+from api.src.passwords import PasswordHasher, PasswordHasherBusy
+from api.tests.helpers import make_async_session
+
+FAST_HASH = bcrypt.hashpw(b'password123', bcrypt.gensalt(rounds=10)).decode('utf-8')
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=2, max_pending=4, retry_after=3)
+    with patch('api.src.login.get_password_hasher', return_value=hasher), \
+         patch('api.src.register.get_password_hasher', return_value=hasher), \
+         patch('api.src.settings.get_password_hasher', return_value=hasher):
+        yield hasher
+    hasher.shutdown()
+
+@pytest.fixture
+def user():
+    return AuthenticatedUser(username='testuser', first_name='Test', last_name='User',
+                             email='test@testing.com', hashed_password=FAST_HASH)
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip(hasher):
+    hashed = await hasher.hash('password123')
+
+    assert await hasher.verify('password123', hashed)
+    assert not await hasher.verify('wrong', hashed)
+    assert hasher.get_stats() == {'pending': 0, 'completed': 3, 'failed': 0, 'rejected': 0}
+
+@pytest.mark.asyncio
+async def test_failed_operations_are_not_counted_as_completed(hasher):
+    with pytest.raises(ValueError):
+        await hasher.verify('password123', 'not a bcrypt hash')
+
+    assert hasher.get_stats() == {'pending': 0, 'completed': 0, 'failed': 1, 'rejected': 0}
+
+@pytest.mark.asyncio
+async def test_verify_runs_off_the_event_loop(hasher):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(hasher.verify('password123', FAST_HASH) for _ in range(4)))
+    task.cancel()
+
+    # The loop kept ticking while four hashes ran
+    assert ticks > 5
+
+@pytest.mark.asyncio
+async def test_rejects_when_pending_limit_reached(hasher):
+    hasher.max_pending = 1
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    blocked = asyncio.create_task(hasher._run(lambda: asyncio.run_coroutine_threadsafe(release.wait(), loop).result()))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(PasswordHasherBusy) as exc_info:
+        await hasher.verify('password123', FAST_HASH)
+
+    release.set()
+    await blocked
+    assert exc_info.value.retry_after == 3
+    assert hasher.get_stats()['rejected'] == 1
+
+@pytest.mark.asyncio
+async def test_login_returns_503_with_retry_after_when_busy(user):
+    busy = MagicMock()
+    busy.verify.side_effect = PasswordHasherBusy(retry_after=3)
+
+    with patch('api.src.login.get_user_by_username', return_value=user), \
+         patch('api.src.login.get_password_hasher', return_value=busy):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.post('/login', data={'username': 'testuser', 'password': 'password123'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+@pytest.mark.asyncio
+async def test_settings_password_change_returns_503_when_busy():
+    busy = MagicMock()
+    busy.hash.side_effect = PasswordHasherBusy(retry_after=3)
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(username='testuser')
+
+    with patch('api.src.settings.get_password_hasher', return_value=busy), \
+         patch('shared.database.connect_to_async_db', return_value=make_async_session()):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.post('/settings', json={'username': 'testuser', 'password': 'new'})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+
+@pytest.mark.asyncio
+async def test_games_stay_responsive_during_login_storm(hasher, user, monkeypatch):
+    """Load test: 16 concurrent logins while games are requested back to back."""
+    hasher.max_pending = 64
+    monkeypatch.setattr(games, 'games_cache', TTLCache('games', default_ttl=0))
+    app.dependency_overrides[get_current_user] = lambda: user
+    # Keep objects left by earlier tests out of collections, so a full GC pass
+    # over them doesn't show up as request latency
+    gc.collect()
+    gc.freeze()
+
+    async def login(client):
+        response = await client.post('/login', data={'username': 'testuser', 'password': 'password123'})
+        assert response.status_code == 200
+
+    with patch('api.src.login.get_user_by_username', return_value=user), \
+         patch('api.src.games.get_games_by_date', return_value=GamesResponse(list=[])), \
+         patch('api.src.games.get_games_cache_ttl', return_value=0):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            storm_start = time.perf_counter()
+            storm = asyncio.gather(*(login(client) for _ in range(16)))
+
+            latencies = []
+            while not storm.done():
+                start = time.perf_counter()
+                response = await client.get('/nba/games?date=2023-08-18')
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+            await storm
+            storm_duration = time.perf_counter() - storm_start
+    app.dependency_overrides.clear()
+    gc.unfreeze()
+
+    # The storm keeps two workers busy for a while; games requests are served throughout it.
+    # Hashing on the event loop would hold each request for about one of the 16 hashes
+    assert storm_duration > 0.2
+    assert len(latencies) > 5
+    assert statistics.median(latencies) < storm_duration / 32
@@ -1,20 +1,24 @@
 from fastapi.testclient import TestClient
 from api.src.main import app
 from unittest.mock import patch, MagicMock
+import pytest
 from api.src.register import register_user
+from api.tests.helpers import make_async_session
 
 client = TestClient(app)
 
-def test_register_user_function():
-    mock_session = MagicMock()
+@pytest.mark.asyncio
+async def test_register_user_function():
+    mock_session = make_async_session()
     mock_user = MagicMock()
     mock_users_constructor = MagicMock(return_value=mock_user)
 
-    with patch('api.src.register.connect_to_db', return_value=mock_session), \
+    with patch('shared.database.connect_to_async_db', return_value=mock_session), \
          patch('api.src.register.Users', mock_users_constructor), \
-         patch('bcrypt.hashpw', return_value=b'hashed_password'):
+         patch('bcrypt.hashpw', return_value=b'hashed_password'), \
+         patch('api.src.register.invalidate_cached_user') as mock_invalidate:
         
-        result = register_user(
+        result = await register_user(
             username="testuser",
             first_name="Test",
             last_name="User",
@@ -31,17 +35,18 @@ def test_register_user_function():
         )
 
         mock_session.add.assert_called_once_with(mock_user)
-        mock_session.commit.assert_called_once()
-        mock_session.close.assert_called_once()
+        mock_session.commit.assert_awaited_once()
+        mock_session.close.assert_awaited_once()
+        mock_invalidate.assert_called_once_with("testuser")
 
         assert result == mock_user
 
 def test_register_endpoint_integration():
-    mock_session = MagicMock()
+    mock_session = make_async_session()
     mock_user = MagicMock()
     mock_users_constructor = MagicMock(return_value=mock_user)
 
-    with patch('api.src.register.connect_to_db', return_value=mock_session), \
+    with patch('shared.database.connect_to_async_db', return_value=mock_session), \
          patch('api.src.register.Users', mock_users_constructor), \
          patch('api.src.main.get_user_by_username', return_value=None), \
          patch('bcrypt.hashpw', return_value=b'hashed_password'):
@@ -68,15 +73,15 @@ def test_register_endpoint_integration():
         )
 
         mock_session.add.assert_called_once_with(mock_user)
-        mock_session.commit.assert_called_once()
-        mock_session.close.assert_called_once()
+        mock_session.commit.assert_awaited_once()
+        mock_session.close.assert_awaited_once()
 
 def test_register_endpoint_integration_user_exists():
-    mock_session = MagicMock()
+    mock_session = make_async_session()
     mock_user = MagicMock()
     mock_users_constructor = MagicMock(return_value=mock_user)
 
-    with patch('api.src.register.connect_to_db', return_value=mock_session), \
+    with patch('shared.database.connect_to_async_db', return_value=mock_session), \
          patch('api.src.register.Users', mock_users_constructor), \
          patch('api.src.main.get_user_by_username', return_value=mock_user), \
          patch('bcrypt.hashpw', return_value=b'hashed_password'):
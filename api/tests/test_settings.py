@@ -1,8 +1,9 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 from api.src.main import app
 from api.src.login import get_current_user
 from api.src.models.tables import Users
+from api.tests.helpers import make_async_session
 import pytest
 
 @pytest.fixture
@@ -26,13 +27,13 @@ def test_client():
 @pytest.fixture
 def mock_db(monkeypatch):
     """Create a mocked database session and user"""
-    mock_session = MagicMock()
+    mock_session = make_async_session()
     mock_user = MagicMock(spec=Users)
     mock_user.username = "testuser"
     mock_user.email = "old@example.com"
     mock_user.email_notifications_enabled = False
-    mock_session.query.return_value.filter_by.return_value.first.return_value = mock_user
-    monkeypatch.setattr("api.src.settings.connect_to_db", lambda: mock_session)
+    mock_session.execute.return_value.scalars.return_value.first.return_value = mock_user
+    monkeypatch.setattr("shared.database.connect_to_async_db", lambda: mock_session)
     return mock_session, mock_user
 
 
@@ -44,7 +45,8 @@ def test_update_settings_success(test_client, mock_db):
         "email": "new@example.com",
         "email_notifications_enabled": True
     }
-    response = test_client.post("/settings", json=settings_data)
+    with patch('api.src.settings.invalidate_cached_user') as mock_invalidate:
+        response = test_client.post("/settings", json=settings_data)
 
     assert response.status_code == 200
     data = response.json()
@@ -53,7 +55,8 @@ def test_update_settings_success(test_client, mock_db):
     assert data["username"] == "updated"
     assert data["email"] == "new@example.com"
     assert data["email_notifications_enabled"] is True
-    mock_session.commit.assert_called_once()
+    mock_session.commit.assert_awaited_once()
+    mock_invalidate.assert_called_once_with("updated")
     assert mock_user.username == "updated"
     assert mock_user.email == "new@example.com"
     assert mock_user.email_notifications_enabled is True
@@ -73,9 +76,9 @@ def test_update_settings_partial(test_client, mock_db):
 
 def test_update_settings_user_not_found(test_client, monkeypatch):
     """Test failed update of settings when the user does not exist"""
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
-    monkeypatch.setattr("api.src.settings.connect_to_db", lambda: mock_session)
+    mock_session = make_async_session()
+    mock_session.execute.return_value.scalars.return_value.first.return_value = None
+    monkeypatch.setattr("shared.database.connect_to_async_db", lambda: mock_session)
 
     settings_data = {
         "username": "nonexistent",
@@ -124,9 +127,9 @@ def test_get_settings_success(test_client, mock_db):
 
 def test_get_settings_user_not_found(test_client, monkeypatch):
     """Test failed retrieval of settings when the user does not exist"""
-    mock_session = MagicMock()
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
-    monkeypatch.setattr("api.src.settings.connect_to_db", lambda: mock_session)
+    mock_session = make_async_session()
+    mock_session.execute.return_value.scalars.return_value.first.return_value = None
+    monkeypatch.setattr("shared.database.connect_to_async_db", lambda: mock_session)
 
     response = test_client.get("/settings")
     assert response.status_code == 200
@@ -140,7 +143,7 @@ def test_get_settings_user_not_found(test_client, monkeypatch):
 def test_get_settings_exception_handling(test_client, mock_db):
     """Test retrieving settings when an exception occurs"""
     mock_session, mock_user = mock_db
-    mock_session.query.side_effect = Exception("Database error")
+    mock_session.execute.side_effect = Exception("Database error")
 
     response = test_client.get("/settings")
     assert response.status_code == 200
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from api.src.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_leader():
+    group = SingleFlight('test')
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    results = await asyncio.gather(*(group.do('key', work) for _ in range(10)))
+
+    assert results == ['result'] * 10
+    assert calls == 1
+    assert group.get_stats() == {'leader': 1, 'coalesced': 9, 'in_flight': 0}
+
+@pytest.mark.asyncio
+async def test_different_keys_run_independently():
+    group = SingleFlight('test')
+
+    async def work(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(group.do('a', lambda: work('a')), group.do('b', lambda: work('b')))
+
+    assert results == ['a', 'b']
+    assert group.get_stats()['leader'] == 2
+
+@pytest.mark.asyncio
+async def test_sequential_calls_each_lead():
+    group = SingleFlight('test')
+
+    async def work():
+        return 'result'
+
+    await group.do('key', work)
+    await group.do('key', work)
+
+    assert group.get_stats() == {'leader': 2, 'coalesced': 0, 'in_flight': 0}
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter_and_is_not_cached():
+    group = SingleFlight('test')
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream down')
+
+    results = await asyncio.gather(*(group.do('key', failing) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not group.in_flight('key')
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_work():
+    group = SingleFlight('test')
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    first = asyncio.create_task(group.do('key', work))
+    second = asyncio.create_task(group.do('key', work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 'result'
@@ -2,7 +2,7 @@ import mlbstatsapi
 import logging
 from datetime import datetime
 from colorlog import ColoredFormatter
-from shared.database import connect_to_db
+from shared.database import session_scope
 from machine_learning.data.models.mlb_models import MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule
 
 def configure_logging():
@@ -214,29 +214,27 @@ def main():
     logging.info('Starting MLB data collection')
 
     mlb = mlbstatsapi.Mlb()
-    session = connect_to_db()
+    with session_scope() as session:
+        season_data = fetch_current_season(mlb)
+        logging.info(f'Current season: {season_data.season_id}')
 
-    season_data = fetch_current_season(mlb)
-    logging.info(f'Current season: {season_data.season_id}')
+        fetch_teams(mlb, session)
+        logging.info('Teams fetched and stored')
 
-    fetch_teams(mlb, session)
-    logging.info('Teams fetched and stored')
+        fetch_team_records(mlb, session, season_data.season_id)
+        logging.info('Team records fetched and stored')
 
-    fetch_team_records(mlb, session, season_data.season_id)
-    logging.info('Team records fetched and stored')
+        start_date = season_data.regular_season_start_date
+        end_date = datetime.now().strftime('%Y-%m-%d')
 
-    start_date = season_data.regular_season_start_date
-    end_date = datetime.now().strftime('%Y-%m-%d')
+        fetch_team_stats(mlb, session, start_date, end_date)
+        logging.info('Team stats fetched and stored')
 
-    fetch_team_stats(mlb, session, start_date, end_date)
-    logging.info('Team stats fetched and stored')
+        fetch_schedule(mlb, session, start_date, end_date)
+        logging.info('Schedule fetched and stored')
 
-    fetch_schedule(mlb, session, start_date, end_date)
-    logging.info('Schedule fetched and stored')
+        logging.info('MLB data collection completed')
 
-    logging.info('MLB data collection completed')
-
-    session.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
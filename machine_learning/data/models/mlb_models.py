@@ -53,5 +53,28 @@ class MLBSchedule(Base):
     away_score = Column(Integer)
     status = Column(String)
 
+class MLBTeamState(Base):
+    """Rolling form of a team after its games on a date (see MLBFeatureStore)."""
+    __tablename__ = 'mlb_team_state'
+
+    team_id = Column(Integer, ForeignKey('mlb_teams.id'), primary_key=True)
+    date = Column(Date, primary_key=True)
+    games_played = Column(Integer)
+    rolling_win_pct = Column(Float)
+    rolling_runs_scored = Column(Float)
+    rolling_runs_allowed = Column(Float)
+    streak = Column(Float)
+
+class MLBHeadToHead(Base):
+    """Recent meetings between two teams after their games on a date; team_a_id < team_b_id."""
+    __tablename__ = 'mlb_head_to_head'
+
+    team_a_id = Column(Integer, ForeignKey('mlb_teams.id'), primary_key=True)
+    team_b_id = Column(Integer, ForeignKey('mlb_teams.id'), primary_key=True)
+    date = Column(Date, primary_key=True)
+    games_played = Column(Integer)
+    team_a_wins = Column(Integer)
+    team_b_wins = Column(Integer)
+
 MLBTeam.offensive_stats = relationship("MLBOffensiveStats", order_by=MLBOffensiveStats.date, back_populates="team")
 MLBTeam.defensive_stats = relationship("MLBDefensiveStats", order_by=MLBDefensiveStats.date, back_populates="team")
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Materialized MLB team-state features for serving predictions.
+
+Rolling team form is computed with the same TeamTimeSeriesAnalyzer used to
+build training data, and head-to-head records with the same rules as
+GameFeatureGenerator, then stored per team (and per pair of teams) per date.
+Serving a game on date D reads the latest row dated before D.
+"""
+from datetime import date, timedelta
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from machine_learning.analysis.mlb_time_series import TeamTimeSeriesAnalyzer
+from machine_learning.data.models.mlb_models import MLBHeadToHead, MLBSchedule, MLBTeamState
+
+# Windows the model is trained with (see train_mlb_model.py)
+ROLLING_WINDOW = 10
+HEAD_TO_HEAD_WINDOW = 5
+
+# Stored dates re-derived on each refresh to pick up late score corrections
+REFRESH_LOOKBACK_DAYS = 3
+
+STATE_COLUMNS = ['team_id', 'date', 'games_played', 'rolling_win_pct',
+                 'rolling_runs_scored', 'rolling_runs_allowed', 'streak']
+HEAD_TO_HEAD_COLUMNS = ['team_a_id', 'team_b_id', 'date', 'games_played', 'team_a_wins', 'team_b_wins']
+
+
+class MLBFeatureStore:
+    """
+    Builds and incrementally refreshes the mlb_team_state and mlb_head_to_head tables.
+    """
+    def __init__(
+        self,
+        rolling_window: int = ROLLING_WINDOW,
+        head_to_head_window: int = HEAD_TO_HEAD_WINDOW
+    ):
+        """
+        Initialize the feature store builder.
+
+        Args:
+            rolling_window: Number of games to include in rolling calculations
+            head_to_head_window: Number of recent matchups to consider for head-to-head features
+        """
+        self.head_to_head_window = head_to_head_window
+        self.time_series_analyzer = TeamTimeSeriesAnalyzer(window_size=rolling_window)
+
+    def compute_team_states(self, schedule_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute each team's rolling form after every date it played.
+
+        Args:
+            schedule_df: DataFrame containing game schedule and results
+
+        Returns:
+            DataFrame with STATE_COLUMNS, one row per team per game date
+        """
+        completed = schedule_df[schedule_df['status'] == 'Final']
+        team_ids = pd.unique(pd.concat([completed['home_team_id'], completed['away_team_id']]))
+        if len(team_ids) == 0:
+            return pd.DataFrame(columns=STATE_COLUMNS)
+
+        rolling_stats = self.time_series_analyzer.calculate_rolling_stats(
+            schedule_df, pd.DataFrame({'id': team_ids})
+        )
+        # After a doubleheader the state is the one following the second game
+        states = rolling_stats.groupby(['team_id', 'date']).tail(1).copy()
+        states['date'] = states['date'].dt.date
+        return states[STATE_COLUMNS].reset_index(drop=True)
+
+    def compute_head_to_head(self, schedule_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute each pair's record over their most recent meetings after every date they met.
+
+        Args:
+            schedule_df: DataFrame containing game schedule and results
+
+        Returns:
+            DataFrame with HEAD_TO_HEAD_COLUMNS, one row per pair per meeting date
+        """
+        games = schedule_df[schedule_df['status'] == 'Final'].copy()
+        if games.empty:
+            return pd.DataFrame(columns=HEAD_TO_HEAD_COLUMNS)
+
+        games['date'] = pd.to_datetime(games['date'])
+        games = games.sort_values('date', kind='stable')
+
+        home_won = games['home_score'] > games['away_score']
+        away_won = games['away_score'] > games['home_score']
+        home_is_a = games['home_team_id'] < games['away_team_id']
+        games['team_a_id'] = np.where(home_is_a, games['home_team_id'], games['away_team_id'])
+        games['team_b_id'] = np.where(home_is_a, games['away_team_id'], games['home_team_id'])
+        games['team_a_won'] = np.where(home_is_a, home_won, away_won).astype(int)
+        games['team_b_won'] = np.where(home_is_a, away_won, home_won).astype(int)
+
+        pairs = games.groupby(['team_a_id', 'team_b_id'])
+        window = self.head_to_head_window
+        games['games_played'] = (pairs.cumcount() + 1).clip(upper=window)
+        for wins, won in [('team_a_wins', 'team_a_won'), ('team_b_wins', 'team_b_won')]:
+            games[wins] = pairs[won].transform(
+                lambda results: results.rolling(window, min_periods=1).sum()
+            ).astype(int)
+
+        head_to_head = games.groupby(['team_a_id', 'team_b_id', 'date']).tail(1).copy()
+        head_to_head['date'] = head_to_head['date'].dt.date
+        return head_to_head[HEAD_TO_HEAD_COLUMNS].reset_index(drop=True)
+
+    def refresh(self, session: Session, since: Optional[date] = None) -> Dict[str, int]:
+        """
+        Recompute the store from the schedule and rewrite rows dated on or after `since`.
+
+        Rolling windows need each team's earlier games, so the whole schedule is
+        read, but only rows from `since` onwards are replaced.
+
+        Args:
+            session: Database session
+            since: First date to rewrite. Defaults to REFRESH_LOOKBACK_DAYS before
+                the latest stored date, or everything if the store is empty.
+
+        Returns:
+            Number of team-state and head-to-head rows written
+        """
+        if since is None:
+            latest = session.query(func.max(MLBTeamState.date)).scalar()
+            since = latest - timedelta(days=REFRESH_LOOKBACK_DAYS) if latest else date.min
+
+        rows = session.query(
+            MLBSchedule.date,
+            MLBSchedule.home_team_id,
+            MLBSchedule.away_team_id,
+            MLBSchedule.home_score,
+            MLBSchedule.away_score,
+            MLBSchedule.status
+        ).filter(MLBSchedule.status == 'Final').all()
+        schedule_df = pd.DataFrame(
+            [tuple(row) for row in rows],
+            columns=['date', 'home_team_id', 'away_team_id', 'home_score', 'away_score', 'status']
+        )
+
+        states = self.compute_team_states(schedule_df)
+        head_to_head = self.compute_head_to_head(schedule_df)
+        states = states[states['date'] >= since]
+        head_to_head = head_to_head[head_to_head['date'] >= since]
+
+        session.query(MLBTeamState).filter(MLBTeamState.date >= since).delete(synchronize_session=False)
+        session.query(MLBHeadToHead).filter(MLBHeadToHead.date >= since).delete(synchronize_session=False)
+        if not states.empty:
+            session.execute(insert(MLBTeamState), _records(states))
+        if not head_to_head.empty:
+            session.execute(insert(MLBHeadToHead), _records(head_to_head))
+        session.commit()
+
+        return {'team_states': len(states), 'head_to_head': len(head_to_head)}
+
+
+def _records(df: pd.DataFrame):
+    """Convert a DataFrame to insert parameters, with NaN as NULL and numpy scalars as Python values."""
+    return [
+        {key: (None if pd.isna(value) else value.item() if isinstance(value, np.generic) else value)
+         for key, value in record.items()}
+        for record in df.to_dict('records')
+    ]
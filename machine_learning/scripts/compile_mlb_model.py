@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+MLB Model Compile Script
+
+Compiles saved tree-ensemble models (random forest or XGBoost pipelines) into
+numpy arrays for fast scoring by the API, saved next to each joblib file as
+.compiled.npz. Models trained with train_mlb_model.py are compiled when saved;
+this script covers models saved before that, or recompiles after an upgrade.
+
+Usage:
+    python compile_mlb_model.py MODEL_PATH [MODEL_PATH ...]
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import joblib
+
+from api.src.compiled_model import export_compiled_model
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Compile saved MLB tree-ensemble models for fast scoring",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python compile_mlb_model.py machine_learning/models/mlb/mlb_predictor_v1.0.joblib
+    python compile_mlb_model.py machine_learning/models/mlb/*.joblib
+        """
+    )
+
+    parser.add_argument(
+        'model_paths',
+        nargs='+',
+        type=Path,
+        metavar='MODEL_PATH',
+        help='Saved .joblib model pipeline to compile'
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    failed = False
+    for model_path in args.model_paths:
+        try:
+            compiled_path = export_compiled_model(joblib.load(model_path), model_path)
+            print(f"✅ {model_path.name} -> {compiled_path.name}")
+        except (OSError, ValueError) as e:
+            print(f"❌ {model_path.name} not compiled: {e}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
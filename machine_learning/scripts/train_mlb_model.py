@@ -49,6 +49,7 @@ import joblib
 from shared.database import connect_to_db
 from machine_learning.data.models.mlb_models import MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule
 from machine_learning.data.processing.mlb_data_pipeline import MLBDataPipeline
+from api.src.compiled_model import export_compiled_model
 from api.src.ml_config import MLB_MODELS_DIR, MLB_REQUIRED_FEATURES
 
 # Suppress sklearn warnings for cleaner output
@@ -624,6 +625,15 @@ class MLBModelTrainer:
         joblib.dump(self.pipeline, model_path)
         self.logger.info(f"Model saved to: {model_path}")
 
+        # Tree ensembles also get compiled arrays for fast scoring; other models are served as is
+        compiled_filename = None
+        if self.model_type in ('random_forest', 'xgboost'):
+            try:
+                compiled_filename = export_compiled_model(self.pipeline, model_path).name
+                self.logger.info(f"Compiled model saved to: {MLB_MODELS_DIR / compiled_filename}")
+            except ValueError as e:
+                self.logger.warning(f"Model not compiled: {e}")
+
         # Save metadata — coerce numpy scalar types to Python float for JSON compatibility
         # (XGBoost feature_importances_ returns float32; json.dump rejects non-native types)
         safe_importances = (
@@ -638,6 +648,7 @@ class MLBModelTrainer:
             'metrics': self.metrics,
             'feature_importances': safe_importances,
             'model_filename': model_filename,
+            'compiled_filename': compiled_filename,
             'sklearn_version': __import__('sklearn').__version__
         }
 
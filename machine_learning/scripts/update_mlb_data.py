@@ -34,8 +34,12 @@ from machine_learning.data.collection.mlb import (
     fetch_schedule
 )
 from machine_learning.data.collection.mlb_direct_api import fetch_team_stats_direct
+from machine_learning.data.processing.mlb_feature_store import MLBFeatureStore
+from api.src.league_index import bump_data_version
 from shared.database import connect_to_db
-from machine_learning.data.models.mlb_models import MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule
+from machine_learning.data.models.mlb_models import (
+    MLBTeam, MLBOffensiveStats, MLBDefensiveStats, MLBSchedule, MLBTeamState
+)
 
 # Load environment variables
 load_dotenv(project_root / 'api' / '.env')
@@ -119,12 +123,14 @@ class MLBDataUpdater:
         offensive_count = self.session.query(MLBOffensiveStats).count()
         defensive_count = self.session.query(MLBDefensiveStats).count()
         schedule_count = self.session.query(MLBSchedule).count()
+        team_state_count = self.session.query(MLBTeamState).count()
         
         self.logger.info(f"Existing data counts:")
         self.logger.info(f"  Teams: {team_count}")
         self.logger.info(f"  Offensive stats: {offensive_count}")
         self.logger.info(f"  Defensive stats: {defensive_count}")
         self.logger.info(f"  Schedule entries: {schedule_count}")
+        self.logger.info(f"  Feature store team states: {team_state_count}")
         
     def update_teams(self, season_data):
         """Update team information."""
@@ -199,6 +205,33 @@ class MLBDataUpdater:
             self.logger.error(f"Failed to update team stats: {e}")
             raise
             
+    def update_feature_store(self):
+        """Refresh the precomputed team-state and head-to-head features from the schedule."""
+        self.logger.info("Updating feature store...")
+
+        if self.dry_run:
+            self.logger.info("DRY RUN: Would refresh team-state and head-to-head features")
+            return
+
+        try:
+            counts = MLBFeatureStore().refresh(self.session)
+            self.logger.info(
+                f"Successfully updated feature store: {counts['team_states']} team states, "
+                f"{counts['head_to_head']} head-to-head records"
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to update feature store: {e}")
+            raise
+
+    def update_data_version(self):
+        """Bump the MLB data version so running APIs reload their league index."""
+        if self.dry_run:
+            self.logger.info("DRY RUN: Would bump the MLB data version")
+            return
+
+        version = bump_data_version(self.session)
+        self.logger.info(f"MLB data version is now {version}")
+
     def run_update(self):
         """Run the complete data update process."""
         start_time = datetime.now()
@@ -222,11 +255,14 @@ class MLBDataUpdater:
             self.update_teams(season_data)
             self.update_team_records(season_data)
             self.update_schedule(season_data)
+            self.update_feature_store()
             
             if not self.skip_stats:
                 self.update_team_stats(season_data)
             else:
                 self.logger.info("Skipping team statistics update as requested")
+
+            self.update_data_version()
             
             # Calculate runtime
             end_time = datetime.now()